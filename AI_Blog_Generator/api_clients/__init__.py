@@ -10,17 +10,71 @@ Usage:
     from api_clients.gemini_client import GeminiClient
     from api_clients.perplexity_client import PerplexityClient
     from api_clients.chatgpt_client import ChatGPTClient
+    from api_clients.content_parser import parse_generated_content
+
+Every client is a BaseProvider (api_clients.base): a shared prompt template,
+retry, rate-limit and parsing pipeline over a pluggable Transport
+(api_clients.transports). Additional providers register themselves with
+@register_provider and are picked up by BlogGenerator without code changes.
+
+Names are loaded on first access, so importing the package does not pull in
+every provider SDK; `from api_clients import ChatGPTClient` only imports the
+OpenAI client module.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "AI Blog Generator"
 
-from .gemini_client import GeminiClient
-from .perplexity_client import PerplexityClient  
-from .chatgpt_client import ChatGPTClient
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    'GeminiClient': '.gemini_client',
+    'PerplexityClient': '.perplexity_client',
+    'ChatGPTClient': '.chatgpt_client',
+    'BaseProvider': '.base',
+    'Transport': '.transports',
+    'OpenAITransport': '.transports',
+    'HTTPXChatTransport': '.transports',
+    'GeminiTransport': '.transports',
+    'PromptTemplate': '.prompts',
+    'register_provider': '.registry',
+    'get_provider_class': '.registry',
+    'provider_names': '.registry',
+    'load_plugins': '.registry',
+    'StreamingContentParser': '.content_parser',
+    'parse_generated_content': '.content_parser',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     'GeminiClient',
     'PerplexityClient', 
-    'ChatGPTClient'
+    'ChatGPTClient',
+    'BaseProvider',
+    'Transport',
+    'OpenAITransport',
+    'HTTPXChatTransport',
+    'GeminiTransport',
+    'PromptTemplate',
+    'register_provider',
+    'get_provider_class',
+    'provider_names',
+    'load_plugins',
+    'StreamingContentParser',
+    'parse_generated_content'
 ]
\ No newline at end of file
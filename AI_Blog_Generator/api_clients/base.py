@@ -0,0 +1,222 @@
+import time
+from contextlib import ExitStack
+from typing import Dict, Iterator, Optional, Tuple
+import logging
+
+from .content_parser import parse_generated_content
+from .errors import status_code_of
+from .prompts import DEFAULT_ARTICLE_PROMPT, PromptTemplate
+from .rate_limiter import estimate_tokens, get_rate_limiter, quota_headers
+from .retry import RetryPolicy
+from .transports import Transport
+
+class BaseProvider:
+    """
+    A content-generation provider: a prompt template plus a transport.
+    
+    Prompt rendering, rate limiting, retries, usage reporting, streaming and
+    parsing live here, so they behave the same for every provider; a
+    provider only chooses its prompt, model and transport. Register a
+    subclass with @register_provider to make it available to BlogGenerator.
+    """
+    
+    # Registry name and display name (set by @register_provider)
+    name = 'provider'
+    label = 'Provider'
+    
+    PROMPT: PromptTemplate = DEFAULT_ARTICLE_PROMPT
+    SYSTEM_PROMPT: Optional[str] = None
+    
+    # Generation parameters used unless a call overrides them
+    DEFAULT_PARAMS = {'temperature': 0.7, 'top_p': 0.9, 'max_tokens': 4000}
+    # Timeout for test_connection / atest_connection
+    TEST_TIMEOUT = 10.0
+    
+    def __init__(self, transport: Transport, model: str):
+        self.transport = transport
+        self.model = model
+        
+        # Shared per-provider request/token budget and adaptive concurrency
+        self.rate_limiter = get_rate_limiter(self.name)
+        self.retry_policy = RetryPolicy()
+        
+        logging.info(f"✅ {self.label} client initialized successfully")
+    
+    def build_prompt(self, title: str, description: str = "") -> str:
+        """The article prompt for a title (the template's default requirements when description is empty)."""
+        return self.PROMPT.render(title, description or "")
+    
+    def build_request(self, prompt: str, **kwargs) -> Dict:
+        """Transport-neutral request for a prompt; kwargs override model and generation parameters."""
+        request = {'model': kwargs.get('model', self.model), 'prompt': prompt}
+        if self.SYSTEM_PROMPT:
+            request['system'] = self.SYSTEM_PROMPT
+        for name, default in self.DEFAULT_PARAMS.items():
+            request[name] = kwargs.get(name, default)
+        return request
+    
+    def request_fingerprint(self, title: str, description: str = "", **kwargs) -> Dict:
+        """Everything that determines the generated article, used as a cache key."""
+        return dict(self.build_request(self.build_prompt(title, description), **kwargs), provider=self.name)
+    
+    def complete(self, prompt: str, **kwargs) -> Tuple[str, Dict]:
+        """
+        Send a prompt, retrying transient failures with backoff.
+        
+        Args:
+            prompt: User prompt
+            **kwargs: Generation parameters (model, temperature, max_tokens, top_p)
+        
+        Returns:
+            (generated text, usage) where usage holds model, prompt/completion
+            tokens, retries and, when the transport measures it, ttfb
+        """
+        request = self.build_request(prompt, **kwargs)
+        tokens = estimate_tokens(prompt, request['max_tokens'])
+        usage = {'model': request['model'], 'retries': 0}
+        
+        def attempt():
+            with self.rate_limiter.request(tokens):
+                return self.transport.send(request, usage)
+        
+        return self.retry_policy.call(self.name, attempt, usage), usage
+    
+    async def acomplete(self, prompt: str, **kwargs) -> Tuple[str, Dict]:
+        """Async variant of complete."""
+        request = self.build_request(prompt, **kwargs)
+        tokens = estimate_tokens(prompt, request['max_tokens'])
+        usage = {'model': request['model'], 'retries': 0}
+        
+        async def attempt():
+            async with self.rate_limiter.arequest(tokens):
+                return await self.transport.asend(request, usage)
+        
+        return await self.retry_policy.acall(self.name, attempt, usage), usage
+    
+    def generate_article(self, title: str, description: str = "", **kwargs) -> Dict[str, str]:
+        """
+        Generate a programming article.
+        
+        Transient failures are retried with backoff; a request that still
+        fails raises ProviderError instead of returning a placeholder article.
+        
+        Args:
+            title: Article title
+            description: Optional description or requirements
+            **kwargs: Additional parameters (temperature, max_tokens, etc.)
+        
+        Returns:
+            Dict with 'content', 'title', 'summary' keys, plus 'usage' (model,
+            prompt/completion tokens, retries) for the caller's metrics
+        """
+        content, usage = self.complete(self.build_prompt(title, description), **kwargs)
+        article = self.build_article(title, content)
+        article['usage'] = usage
+        return article
+    
+    async def agenerate_article(self, title: str, description: str = "", **kwargs) -> Dict[str, str]:
+        """Async variant of generate_article."""
+        content, usage = await self.acomplete(self.build_prompt(title, description), **kwargs)
+        article = self.build_article(title, content)
+        article['usage'] = usage
+        return article
+    
+    def stream_article(self, title: str, description: str = "", **kwargs) -> Iterator[str]:
+        """
+        Generate an article, yielding text chunks as they arrive.
+        
+        Opening the stream is retried like a normal request: every attempt
+        takes its own rate-limiter slot and reports its outcome (so a 429
+        backs the concurrency limit off), and the successful attempt keeps its
+        slot until the stream ends. Closing the generator early closes the
+        stream, so an aborted generation stops consuming tokens.
+        """
+        prompt = self.build_prompt(title, description)
+        request = self.build_request(prompt, **kwargs)
+        tokens = estimate_tokens(prompt, request['max_tokens'])
+        
+        def attempt():
+            with ExitStack() as stack:
+                stack.enter_context(self.rate_limiter.request(tokens))
+                chunks = self.transport.open_stream(request)
+                return stack.pop_all(), chunks
+        
+        slot, chunks = self.retry_policy.call(self.name, attempt)
+        with slot:
+            try:
+                yield from chunks
+            finally:
+                close = getattr(chunks, 'close', None)
+                if close:
+                    close()
+    
+    def build_article(self, title: str, content: str, sections: Optional[Dict] = None) -> Dict[str, str]:
+        """Turn raw generated text (and already-parsed sections, if any) into the article dict."""
+        # Extract sections from generated content
+        if sections is None:
+            sections = parse_generated_content(content)
+        
+        return {
+            'title': title,
+            'content': sections.get('content', content),
+            'summary': sections.get('summary', ''),
+            'tags': sections.get('tags', []),
+            'meta_description': sections.get('meta_description', ''),
+            'provider': self.name
+        }
+    
+    def test_request(self, **kwargs) -> Dict:
+        """Minimal request used by the connection tests."""
+        return dict({'model': self.model, 'prompt': "Test connection - respond with 'OK'", 'max_tokens': 10}, **kwargs)
+    
+    def test_connection(self) -> bool:
+        """Test if the API connection works."""
+        result = self.probe(timeout=self.TEST_TIMEOUT)
+        if not result['ok']:
+            logging.error(f"❌ {self.label} connection test failed: {result['error']}")
+        return result['ok']
+    
+    async def atest_connection(self) -> bool:
+        """Async variant of test_connection."""
+        try:
+            return bool(await self.transport.asend(self.test_request(), {}, timeout=self.TEST_TIMEOUT))
+        except Exception as e:
+            logging.error(f"❌ {self.label} connection test failed: {e}")
+            return False
+    
+    def probe(self, timeout: float = 10.0) -> Dict:
+        """
+        Cheap health check without retries (see Transport.PROBE for what it sends).
+        
+        Returns:
+            Dict with 'ok', 'probe', 'latency', 'ttfb', 'status', 'quota'
+            (rate-limit headers) and 'error'
+        """
+        result = {'probe': self.transport.PROBE, 'ttfb': None, 'status': None, 'quota': {}, 'error': None}
+        started = time.monotonic()
+        try:
+            self.transport.probe(self.test_request(max_tokens=1), timeout, result)
+            result['ok'] = True
+        except Exception as e:
+            result.update(ok=False, error=str(e), status=status_code_of(e))
+            result['quota'] = result['quota'] or quota_headers(getattr(getattr(e, 'response', None), 'headers', None))
+        result['latency'] = time.monotonic() - started
+        return result
+    
+    @property
+    def connection_stats(self) -> Optional[Dict]:
+        """Requests and new TCP connections, for transports that pool connections."""
+        return getattr(self.transport, 'connection_stats', None)
+    
+    @property
+    def connection_reuse_ratio(self) -> float:
+        """Fraction of requests served over an already-open connection."""
+        return getattr(self.transport, 'connection_reuse_ratio', 0.0)
+    
+    def close(self):
+        """Close the underlying HTTP connections."""
+        self.transport.close()
+    
+    async def aclose(self):
+        """Close async connections from inside their event loop."""
+        await self.transport.aclose()
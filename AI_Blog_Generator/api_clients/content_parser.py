@@ -0,0 +1,213 @@
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Section markers the prompts ask for, e.g. "---SUMMARY---". Models sometimes
+# vary them, so case, inner whitespace, "META DESCRIPTION" spellings and a
+# Markdown heading or bold wrapper ("## ---TAGS---", "**---CONTENT---**") are
+# all accepted. The pattern is only tried where str.find() has already located
+# a "--", and since only the first marker of each section counts, the sweep
+# stops once all four are found: markers come first in a response, so the
+# article body is normally never scanned at all.
+_MARKER_RE = re.compile(
+    r'-{2,}[ \t]*(SUMMARY|META[ _-]?DESCRIPTION|TAGS|CONTENT)[ \t]*-{2,}(?:\*\*)?',
+    re.IGNORECASE
+)
+_PREFIX_RE = re.compile(r'[ \t]*(?:#{1,6}[ \t]*)?(?:\*\*)?[ \t]*')
+
+_SECTION_NAMES = {
+    'SUMMARY': 'summary',
+    'METADESCRIPTION': 'meta_description',
+    'TAGS': 'tags',
+    'CONTENT': 'content',
+}
+
+# Marker spelling -> section name, filled on first use
+_NAME_CACHE: Dict[str, str] = {}
+
+# Longest marker variant the streaming parser must be able to see whole
+_MAX_MARKER_LEN = 64
+
+Markers = Dict[str, Tuple[int, int]]
+
+
+def _iter_markers(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[str, int, int]]:
+    """Yield (section name, marker start, marker end) for each marker in text[start:end]."""
+    end = len(text) if end is None else end
+    pos = text.find('--', start, end)
+    
+    while pos != -1:
+        match = _MARKER_RE.match(text, pos, end)
+        if match:
+            name = _section_name(match.group(1))
+            yield name, _marker_start(text, pos), match.end()
+            pos = match.end()
+        else:
+            # Skip the whole run of dashes (e.g. a "-----" rule) in one step
+            pos += 2
+            while pos < end and text[pos] == '-':
+                pos += 1
+        pos = text.find('--', pos, end)
+
+
+def _section_name(spelling: str) -> str:
+    """Section name for a marker spelling such as 'META DESCRIPTION' or 'tags'."""
+    name = _NAME_CACHE.get(spelling)
+    if name is None:
+        name = _NAME_CACHE[spelling] = _SECTION_NAMES[re.sub(r'[ _-]', '', spelling.upper())]
+    return name
+
+
+def _marker_start(text: str, pos: int) -> int:
+    """Extend a marker start back over a heading/bold prefix on the same line."""
+    if pos == 0 or text[pos - 1] == '\n':
+        return pos
+    line_start = text.rfind('\n', 0, pos) + 1
+    if _PREFIX_RE.fullmatch(text, line_start, pos):
+        return line_start
+    return pos
+
+
+def find_section_markers(text: str, start: int = 0, end: Optional[int] = None,
+                         offset: int = 0, markers: Optional[Markers] = None) -> Markers:
+    """
+    Locate section markers in a single sweep over text[start:end].
+    
+    Args:
+        text: Text to scan
+        start, end: Slice of text to scan
+        offset: Added to every position recorded (for scanning a window of a stream)
+        markers: Already-found markers; only the first occurrence of a section counts
+    
+    Returns:
+        Section name -> (marker start, section body start)
+    """
+    markers = {} if markers is None else markers
+    if len(markers) == len(_SECTION_NAMES):
+        return markers
+    
+    for name, marker_start, marker_end in _iter_markers(text, start, end):
+        if name not in markers:
+            markers[name] = (offset + marker_start, offset + marker_end)
+            if len(markers) == len(_SECTION_NAMES):
+                break
+    
+    return markers
+
+
+def _build_sections(text: str, markers: Markers) -> Dict:
+    """Slice each section body out of text, from its marker to the next one."""
+    sections = {}
+    # Markers never overlap, so each body ends where the next marker starts
+    ordered = sorted(markers.items(), key=lambda item: item[1][0])
+    
+    for index, (name, (_, body_start)) in enumerate(ordered):
+        body_end = ordered[index + 1][1][0] if index + 1 < len(ordered) else len(text)
+        body = text[body_start:body_end].strip()
+        if name == 'tags':
+            sections['tags'] = [tag.strip() for tag in body.split(',') if tag.strip()]
+        else:
+            sections[name] = body
+    
+    # If no structured format, use entire content
+    if not sections.get('content'):
+        sections['content'] = text
+    
+    return sections
+
+
+def parse_generated_content(content: str) -> Dict:
+    """
+    Parse a generated response into 'summary', 'meta_description', 'tags' and
+    'content' sections.
+    
+    All markers are found in one pass; only the final fields are sliced out.
+    """
+    return _build_sections(content, find_section_markers(content))
+
+
+class StreamingContentParser:
+    """Incrementally locate section markers in a streamed response.
+    
+    Chunks are fed as they arrive; markers split across chunk boundaries are
+    still found because the last few characters of the previous chunk are
+    rescanned together with the next one. A marker touching the end of the
+    received text is only accepted once the following character arrives,
+    so a half-received "---SUMMARY--" is never mistaken for the full marker.
+    """
+    
+    def __init__(self):
+        self._parts: List[str] = []
+        self._length = 0
+        self._tail = ""
+        self._text: Optional[str] = None
+        # section name -> (marker start, section body start)
+        self._markers: Markers = {}
+        self.current_section: Optional[str] = None
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """Add a chunk; returns the name of a section entered by this chunk, if any."""
+        if not chunk:
+            return None
+        
+        if len(self._markers) == len(_SECTION_NAMES):
+            # Every section has started; later markers cannot change anything
+            self._parts.append(chunk)
+            self._length += len(chunk)
+            self._text = None
+            return None
+        
+        window = self._tail + chunk
+        offset = self._length - len(self._tail)
+        
+        self._parts.append(chunk)
+        self._length += len(chunk)
+        self._text = None
+        
+        entered = None
+        for name, marker_start, marker_end in _iter_markers(window):
+            if name in self._markers:
+                continue
+            # Wait for more input if the marker could still be growing
+            if window[marker_end:marker_end + 2] in ('', '*'):
+                break
+            self._markers[name] = (offset + marker_start, offset + marker_end)
+            entered = name
+        
+        if entered:
+            self.current_section = entered
+        
+        self._tail = window[-_MAX_MARKER_LEN:]
+        return entered
+    
+    def close(self) -> Optional[str]:
+        """Finish the stream, accepting a marker at the very end of the text."""
+        entered = None
+        before = set(self._markers)
+        find_section_markers(self._tail, offset=self._length - len(self._tail), markers=self._markers)
+        for name in self._markers.keys() - before:
+            entered = name
+        if entered:
+            self.current_section = entered
+        return entered
+    
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        if self._text is None:
+            self._text = "".join(self._parts)
+            self._parts = [self._text]
+        return self._text
+    
+    def section_text(self, name: str) -> str:
+        """Body of a section received so far (up to the next marker)."""
+        if name not in self._markers:
+            return ""
+        
+        body_start = self._markers[name][1]
+        following = [start for start, _ in self._markers.values() if start >= body_start]
+        body_end = min(following) if following else self._length
+        return self.text[body_start:body_end].strip()
+    
+    def sections(self) -> Dict:
+        """Parsed sections in the same shape as parse_generated_content."""
+        return _build_sections(self.text, self._markers)
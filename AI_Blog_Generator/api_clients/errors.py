@@ -0,0 +1,74 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class ProviderError(Exception):
+    """A provider request failed; carries the HTTP status when one is known."""
+    
+    def __init__(self, provider: str, message: str, status_code: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class RateLimitError(ProviderError):
+    """The provider rejected a request with HTTP 429."""
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """
+    Best-effort HTTP status of an exception raised by any of the SDKs.
+    
+    openai and ProviderError expose `status_code`, httpx exposes it on
+    `response`, and google.api_core exceptions use an integer `code`.
+    """
+    status = getattr(error, 'status_code', None)
+    if isinstance(status, int):
+        return status
+    
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if isinstance(status, int):
+        return status
+    
+    code = getattr(error, 'code', None)
+    if isinstance(code, int) and 100 <= code < 600:
+        return code
+    
+    return None
+
+
+def retry_after_of(error: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header on the error's response, if any."""
+    retry_after = getattr(error, 'retry_after', None)
+    if isinstance(retry_after, (int, float)):
+        return float(retry_after)
+    
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    
+    value = headers.get('retry-after')
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    # HTTP-date form
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_throttle_status(status: Optional[int]) -> bool:
+    """True for responses that mean the provider is overloaded (429 or 5xx)."""
+    return status is not None and (status == 429 or status >= 500)
+
@@ -0,0 +1,363 @@
+import string
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+class PromptTemplate:
+    """A prompt with {title}, {description} (and optionally other) fields, parsed once.
+    
+    The template is split into literal text and field names when it is
+    created, so rendering is a join instead of re-formatting the whole
+    template, and recent renders are memoized: the cache key and the
+    request for one article render the same prompt.
+    """
+    
+    def __init__(self, template: str, default_description: str = "", extra_fields: Tuple[str, ...] = (),
+                 cache_size: int = 256):
+        self.template = template
+        self.default_description = default_description
+        self.fields = ('title', 'description') + tuple(extra_fields)
+        self._parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(template):
+            if field is not None and (field not in self.fields or format_spec or conversion):
+                raise ValueError(f"Unsupported prompt field {{{field}}}; use one of {', '.join(self.fields)}")
+            self._parts.append((literal, field))
+        self.render = lru_cache(maxsize=cache_size)(self._render)
+    
+    def _render(self, title: str, description: str = "", **extra: str) -> str:
+        values: Dict[str, str] = dict(extra, title=title, description=description or self.default_description)
+        return "".join(literal + values[field] if field else literal for literal, field in self._parts)
+
+
+# System messages for chat-style APIs
+CHATGPT_SYSTEM_PROMPT = "You are an expert technical writer and senior software developer with extensive experience in creating engaging, comprehensive programming tutorials and articles. You excel at explaining complex concepts clearly and providing practical, real-world examples."
+
+PERPLEXITY_SYSTEM_PROMPT = "You are an expert technical writer and software developer with deep knowledge of programming concepts, best practices, and real-world applications. You write engaging, comprehensive, and practical blog articles for developers."
+
+CHATGPT_ARTICLE_PROMPT = PromptTemplate("""
+Create a comprehensive, engaging technical blog article with the title: "{title}"
+
+**ADDITIONAL REQUIREMENTS:** {description}
+
+**OUTPUT FORMAT:**
+Please structure your response in the following EXACT format:
+
+---SUMMARY---
+[Write a compelling 2-3 sentence summary highlighting the key value and learning outcomes]
+
+---META_DESCRIPTION---
+[Create an SEO-optimized meta description (150-160 characters) that would attract developers to click]
+
+---TAGS---
+[List 6-8 relevant programming tags, separated by commas - e.g., javascript, react, nodejs, api, tutorial]
+
+---CONTENT---
+[Write the complete article content following the structure below]
+
+**ARTICLE STRUCTURE:**
+
+# {title}
+
+## Introduction
+- Start with an engaging hook that relates to common developer challenges
+- Clearly state what readers will learn and achieve
+- Explain the practical value and relevance of this topic
+- Provide a brief roadmap of the article
+
+## Prerequisites & Setup
+- List any required knowledge or tools
+- Include setup instructions if needed
+- Link to relevant resources
+
+## Core Concepts Explained
+- Break down the fundamental concepts step-by-step
+- Use analogies and real-world comparisons when helpful
+- Define technical terms clearly
+- Build complexity gradually
+
+## Hands-On Implementation
+- Provide multiple practical code examples
+- Start with basic examples and progress to advanced
+- Include complete, runnable code snippets
+- Explain each code block thoroughly
+- Show different approaches or variations
+
+## Best Practices & Patterns
+- Share industry-standard practices
+- Explain why certain approaches are preferred
+- Include performance considerations
+- Discuss maintainability and scalability
+
+## Common Pitfalls & Troubleshooting
+- Highlight frequent mistakes developers make
+- Provide solutions and debugging strategies
+- Include error handling examples
+- Share tips for avoiding issues
+
+## Real-World Applications
+- Present actual use cases and scenarios
+- Include industry examples or case studies
+- Discuss when to use vs. when not to use this approach
+- Show integration with popular frameworks/tools
+
+## Advanced Techniques (Optional)
+- Cover more sophisticated implementations
+- Discuss optimization strategies
+- Show integration with other technologies
+- Include performance benchmarks if relevant
+
+## Conclusion & Next Steps
+- Summarize key takeaways and benefits
+- Suggest logical next learning steps
+- Recommend additional resources
+- Encourage readers to experiment and practice
+
+**WRITING GUIDELINES:**
+- Target audience: Intermediate developers (2-5 years experience)
+- Article length: 2000-2500 words
+- Tone: Professional but conversational and engaging
+- Include 5-7 practical code examples with detailed explanations
+- Use proper markdown formatting throughout
+- Include inline code with `backticks` for short snippets
+- Use code blocks with ```language syntax for longer examples
+- Add comments to all code examples
+- Ensure all examples are functional and tested
+- Include tips, warnings, or notes where appropriate
+- Make content actionable and immediately useful
+
+**CODE REQUIREMENTS:**
+- Show complete, working examples (not just fragments)
+- Include all necessary imports and dependencies
+- Use meaningful variable and function names
+- Add comprehensive comments explaining the logic
+- Include error handling where appropriate
+- Demonstrate both basic and advanced usage patterns
+- Show realistic, practical scenarios
+
+Please generate the complete article following this exact structure and format.
+""", default_description=(
+    "Create a detailed guide suitable for intermediate-level developers with practical examples and real-world applications."
+))
+
+GEMINI_ARTICLE_PROMPT = PromptTemplate("""
+You are an expert technical writer specializing in programming and software development. 
+Write a comprehensive, engaging blog article with the following specifications:
+
+**ARTICLE TITLE:** {title}
+
+**ADDITIONAL REQUIREMENTS:** {description}
+
+**STRUCTURE REQUIREMENTS:**
+Please structure your response EXACTLY as follows:
+
+---SUMMARY---
+[Write a compelling 2-3 sentence summary of what readers will learn]
+
+---META_DESCRIPTION---
+[Write a 150-160 character SEO meta description]
+
+---TAGS---
+[List 5-8 relevant tags separated by commas: programming, python, javascript, etc.]
+
+---CONTENT---
+[Write the main article content here following these guidelines:]
+
+# {title}
+
+## Introduction
+- Hook the reader with an interesting opening
+- Explain why this topic matters
+- Preview what they'll learn
+
+## Main Content Sections
+- Use clear headings (##, ###)
+- Include practical code examples with syntax highlighting
+- Add real-world use cases
+- Explain complex concepts step-by-step
+- Include best practices and common pitfalls
+
+## Code Examples
+- Provide working, well-commented code
+- Use realistic examples
+- Show both basic and advanced implementations
+- Include error handling where appropriate
+
+## Practical Applications
+- Real-world scenarios where this is useful
+- Industry use cases
+- Performance considerations
+
+## Conclusion
+- Summarize key takeaways
+- Suggest next steps for learning
+- Encourage experimentation
+
+**CONTENT GUIDELINES:**
+- Write in a conversational, engaging tone
+- Target intermediate-level developers
+- Include 3-5 practical code examples
+- Make it actionable and informative
+- Length: 1500-2500 words
+- Use markdown formatting for code blocks
+- Include inline code snippets where relevant
+- Add tips, warnings, or notes in callout format
+
+**CODE FORMATTING:**
+- Use ```language syntax for code blocks
+- Include comments in code examples
+- Show imports and complete examples
+- Use realistic variable names
+
+Generate the article now:
+""", default_description=(
+    "Write a comprehensive guide suitable for intermediate developers."
+))
+
+PERPLEXITY_ARTICLE_PROMPT = PromptTemplate("""
+Write a comprehensive, engaging technical blog article about: "{title}"
+
+**ADDITIONAL CONTEXT:** {description}
+
+**RESPONSE FORMAT:**
+Structure your response EXACTLY as follows:
+
+---SUMMARY---
+[2-3 sentence compelling summary of what readers will learn]
+
+---META_DESCRIPTION---
+[SEO-optimized meta description, 150-160 characters]
+
+---TAGS---
+[5-8 relevant programming tags, comma-separated]
+
+---CONTENT---
+[Main article content following the structure below]
+
+**ARTICLE STRUCTURE:**
+
+# {title}
+
+## Introduction
+- Engaging hook that captures attention
+- Clear explanation of why this topic is important
+- Brief overview of what readers will accomplish
+
+## Background & Context
+- Relevant background information
+- When and why this technology/concept is used
+- Prerequisites or assumed knowledge
+
+## Core Concepts
+- Detailed explanation of key concepts
+- Step-by-step breakdowns of complex ideas
+- Clear definitions of technical terms
+
+## Practical Implementation
+- Multiple working code examples with explanations
+- Real-world scenarios and use cases
+- Best practices and common patterns
+
+## Advanced Techniques
+- More sophisticated implementations
+- Performance optimizations
+- Integration with other technologies
+
+## Common Pitfalls & Solutions
+- Frequent mistakes developers make
+- How to avoid or fix these issues
+- Debugging tips and strategies
+
+## Real-World Applications
+- Industry use cases and examples
+- Success stories or case studies
+- Scalability considerations
+
+## Conclusion & Next Steps
+- Key takeaways summary
+- Recommended learning path
+- Additional resources for further exploration
+
+**CONTENT REQUIREMENTS:**
+- Target audience: Intermediate developers
+- Length: 1800-2500 words
+- Include 4-6 practical code examples with comments
+- Use proper markdown formatting
+- Include inline code snippets with `backticks`
+- Add code blocks with ```language syntax
+- Write in conversational, engaging tone
+- Include actionable advice and tips
+- Ensure all code examples are functional and well-explained
+
+**CODE EXAMPLE GUIDELINES:**
+- Show complete, runnable examples
+- Include necessary imports and setup
+- Add comprehensive comments
+- Use meaningful variable names
+- Demonstrate both basic and advanced usage
+- Include error handling where appropriate
+
+Generate the complete article now with the exact format specified above.
+""", default_description=(
+    "Write a comprehensive guide suitable for intermediate developers with practical examples."
+))
+
+# Used by providers that do not define their own prompt
+DEFAULT_ARTICLE_PROMPT = CHATGPT_ARTICLE_PROMPT
+
+
+# Long-form mode: an outline request, then one request per section
+LONG_FORM_OUTLINE_PROMPT = PromptTemplate("""
+You are planning a comprehensive technical blog article titled: "{title}"
+
+**ADDITIONAL REQUIREMENTS:** {description}
+
+Do not write the article yet. Return its outline in EXACTLY this format:
+
+---SUMMARY---
+[Write a compelling 2-3 sentence summary of what readers will learn]
+
+---META_DESCRIPTION---
+[Write a 150-160 character SEO meta description]
+
+---TAGS---
+[List 5-8 relevant programming tags, separated by commas]
+
+---CONTENT---
+## [Section heading]
+- [Key point this section must cover]
+- [Key point this section must cover]
+
+**OUTLINE GUIDELINES:**
+- Use one "## " line per section and 2-5 "- " key points under each
+- Target audience: intermediate developers
+- Base the outline on this proven structure, adapting the headings to the topic:
+{structure}
+- Keep the introduction first and the conclusion last
+- Do not number the headings or add a table of contents
+""", default_description=(
+    "Write a comprehensive guide suitable for intermediate developers with practical examples."
+), extra_fields=('structure',))
+
+LONG_FORM_SECTION_PROMPT = PromptTemplate("""
+You are writing ONE section of a technical blog article titled: "{title}"
+
+**ADDITIONAL REQUIREMENTS:** {description}
+
+**ARTICLE OUTLINE** (other sections are being written separately):
+{outline}
+
+**YOUR SECTION:** {section}
+Cover these points:
+{points}
+
+**WRITING GUIDELINES:**
+- Start with the heading "## {section}" and write only this section
+- Use ### for sub-headings
+- Length: about {words} words
+- Include practical, complete code examples with comments where they help, in ```language blocks
+- Do not repeat material that belongs to another section of the outline
+- Do not add a summary, tags, a table of contents or an article title
+- Write in a conversational, engaging tone for intermediate developers
+""", default_description=(
+    "Write a comprehensive guide suitable for intermediate developers with practical examples."
+), extra_fields=('outline', 'section', 'points', 'words'), cache_size=0)
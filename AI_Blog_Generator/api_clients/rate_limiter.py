@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Deque, Dict, Optional, Tuple
+
+from .errors import is_throttle_status, retry_after_of, status_code_of
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate_per_minute`.
+    
+    Reservations are granted immediately and may drive the bucket negative;
+    the caller then sleeps for the returned time. This queues concurrent
+    callers fairly without holding a lock while waiting.
+    """
+    
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take `amount` tokens; returns the seconds to wait before using them."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight requests.
+    
+    Every success raises the limit by 1/limit (about +1 per round of
+    requests); a 429/5xx halves it, at most once per `cooldown` seconds so
+    one burst of rejections does not collapse the limit to the minimum.
+    
+    Threads block on a condition variable. Coroutines wait on futures in a
+    FIFO queue and are handed a slot directly by release() or by a limit
+    increase, so they are served in arrival order without polling, from
+    whichever event loop (or thread) they belong to.
+    """
+    
+    def __init__(self, initial: int = 8, minimum: int = 1, maximum: int = 64,
+                 decrease_factor: float = 0.5, cooldown: float = 1.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self._async_waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+    
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight < int(self.limit) and not self._async_waiters:
+                self.in_flight += 1
+                return True
+            return False
+    
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+    
+    async def aacquire(self):
+        with self._condition:
+            if self.in_flight < int(self.limit) and not self._async_waiters:
+                self.in_flight += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            self._async_waiters.append((loop, waiter))
+        
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._condition:
+                if (loop, waiter) in self._async_waiters:
+                    self._async_waiters.remove((loop, waiter))
+                    raise
+            # A slot was handed over before the cancellation landed; give it back.
+            # (If the hand-over had not run yet, _grant returns the slot itself.)
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+    
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._wake_locked()
+    
+    def seed(self, limit: int) -> int:
+        """
+        Raise the starting limit to `limit` (capped at maximum), so a batch run
+        with more workers does not begin below the concurrency it asked for.
+        A limit already lowered by throttling is left alone.
+        
+        Returns:
+            The limit in force afterwards
+        """
+        with self._condition:
+            if not self._last_decrease and limit > self.limit:
+                self.limit = float(min(limit, self.maximum))
+                self._wake_locked()
+            return int(self.limit)
+    
+    def on_success(self):
+        with self._condition:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._wake_locked()
+    
+    def _wake_locked(self):
+        """Hand free slots to waiting coroutines first (FIFO), then wake blocked threads."""
+        while self._async_waiters and self.in_flight < int(self.limit):
+            loop, waiter = self._async_waiters.popleft()
+            self.in_flight += 1
+            try:
+                loop.call_soon_threadsafe(self._grant, waiter)
+            except RuntimeError:
+                # The waiter's loop is closed; nobody will take this slot
+                self.in_flight -= 1
+        self._condition.notify_all()
+    
+    def _grant(self, waiter: asyncio.Future):
+        if waiter.cancelled():
+            self.release()
+        else:
+            waiter.set_result(None)
+    
+    def on_throttle(self):
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.limit = max(self.minimum, self.limit * self.decrease_factor)
+
+
+class ProviderRateLimiter:
+    """Requests/min and tokens/min buckets plus adaptive concurrency for one provider."""
+    
+    def __init__(self, provider: str, requests_per_minute: float = 0, tokens_per_minute: float = 0,
+                 initial_concurrency: int = 8, min_concurrency: int = 1, max_concurrency: int = 64):
+        self.provider = provider
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, min_concurrency, max_concurrency)
+        self.stats = {'requests': 0, 'throttled': 0, 'waited_seconds': 0.0}
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_env(cls, provider: str) -> "ProviderRateLimiter":
+        """Build a limiter from <PROVIDER>_RPM, _TPM and _*_CONCURRENCY settings (0 = unlimited)."""
+        prefix = provider.upper()
+        return cls(
+            provider,
+            requests_per_minute=float(os.getenv(f'{prefix}_RPM', 0)),
+            tokens_per_minute=float(os.getenv(f'{prefix}_TPM', 0)),
+            initial_concurrency=int(os.getenv(f'{prefix}_INITIAL_CONCURRENCY', 8)),
+            min_concurrency=int(os.getenv(f'{prefix}_MIN_CONCURRENCY', 1)),
+            max_concurrency=int(os.getenv(f'{prefix}_MAX_CONCURRENCY', 64))
+        )
+    
+    def _reserve(self, tokens: int) -> float:
+        """Reserve budget for one request; returns how long to wait before sending it."""
+        wait = max(0.0, self._blocked_until - time.monotonic())
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket and tokens:
+            wait = max(wait, self.token_bucket.reserve(tokens))
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['waited_seconds'] += wait
+        return wait
+    
+    def record(self, error: Optional[BaseException] = None):
+        """Feed a request outcome back into the concurrency controller."""
+        status = status_code_of(error) if error is not None else None
+        if error is None:
+            self.concurrency.on_success()
+        elif is_throttle_status(status):
+            with self._lock:
+                self.stats['throttled'] += 1
+            self.concurrency.on_throttle()
+            
+            retry_after = retry_after_of(error)
+            if retry_after:
+                # Hold every request to this provider until the server says it is ready
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            
+            logging.warning(
+                f"⚠️ {self.provider} throttled (HTTP {status}); "
+                f"concurrency limit now {int(self.concurrency.limit)}"
+            )
+    
+    @contextmanager
+    def request(self, tokens: int = 0):
+        """Wrap one blocking provider call."""
+        self.concurrency.acquire()
+        try:
+            wait = self._reserve(tokens)
+            if wait:
+                time.sleep(wait)
+            try:
+                yield
+            except BaseException as e:
+                self.record(e)
+                raise
+            self.record()
+        finally:
+            self.concurrency.release()
+    
+    @asynccontextmanager
+    async def arequest(self, tokens: int = 0):
+        """Wrap one async provider call."""
+        await self.concurrency.aacquire()
+        try:
+            wait = self._reserve(tokens)
+            if wait:
+                await asyncio.sleep(wait)
+            try:
+                yield
+            except BaseException as e:
+                self.record(e)
+                raise
+            self.record()
+        finally:
+            self.concurrency.release()
+
+
+_limiters: Dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> ProviderRateLimiter:
+    """Shared limiter for a provider, created from the environment on first use."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = ProviderRateLimiter.from_env(provider)
+        return _limiters[provider]
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough token cost of a request (about 4 characters per prompt token)."""
+    return len(prompt) // 4 + max_tokens
+
+
+# Response headers that describe the remaining provider quota
+QUOTA_HEADER_PREFIXES = ('x-ratelimit-', 'ratelimit-', 'retry-after')
+
+
+def quota_headers(headers) -> Dict[str, str]:
+    """Rate-limit headers (remaining requests/tokens, reset times) from an HTTP response."""
+    if not headers:
+        return {}
+    return {
+        name.lower(): value for name, value in headers.items()
+        if name.lower().startswith(QUOTA_HEADER_PREFIXES)
+    }
@@ -0,0 +1,72 @@
+import importlib
+import os
+from typing import Callable, Dict, List, Optional, Tuple, Type
+import logging
+
+# Built-in providers: name -> (module, class), imported on first use so that
+# listing providers does not load any SDK. Initialized in this order.
+BUILTIN_PROVIDERS: Dict[str, Tuple[str, str]] = {
+    'gemini': ('.gemini_client', 'GeminiClient'),
+    'perplexity': ('.perplexity_client', 'PerplexityClient'),
+    'chatgpt': ('.chatgpt_client', 'ChatGPTClient'),
+}
+
+_providers: Dict[str, Type] = {}
+_loaded_plugins = set()
+
+
+def register_provider(name: str, label: Optional[str] = None) -> Callable[[Type], Type]:
+    """
+    Class decorator that makes a BaseProvider subclass available under `name`.
+    
+    Args:
+        name: Provider name used by --provider, metrics and the cache key
+        label: Display name (defaults to name.title())
+    """
+    def decorator(cls: Type) -> Type:
+        cls.name = name
+        cls.label = label or name.title()
+        _providers[name] = cls
+        return cls
+    return decorator
+
+
+def load_plugins(modules: Optional[List[str]] = None) -> List[str]:
+    """
+    Import provider plugin modules, which register themselves on import.
+    
+    Args:
+        modules: Module names; defaults to the comma-separated PROVIDER_PLUGINS variable
+    
+    Returns:
+        Modules that failed to import
+    """
+    if modules is None:
+        modules = [module.strip() for module in os.getenv('PROVIDER_PLUGINS', '').split(',') if module.strip()]
+    
+    failed = []
+    for module in modules:
+        if module in _loaded_plugins:
+            continue
+        try:
+            importlib.import_module(module)
+            _loaded_plugins.add(module)
+        except Exception as e:
+            logging.error(f"❌ Could not load provider plugin '{module}': {e}")
+            failed.append(module)
+    return failed
+
+
+def provider_names() -> List[str]:
+    """Built-in providers first, then plugins in registration order."""
+    return list(BUILTIN_PROVIDERS) + [name for name in _providers if name not in BUILTIN_PROVIDERS]
+
+
+def get_provider_class(name: str) -> Type:
+    """The provider class registered under `name`; raises KeyError for unknown names."""
+    if name not in _providers and name in BUILTIN_PROVIDERS:
+        module, class_name = BUILTIN_PROVIDERS[name]
+        getattr(importlib.import_module(module, __package__), class_name)
+    if name not in _providers:
+        raise KeyError(f"Unknown provider '{name}' (available: {', '.join(provider_names())})")
+    return _providers[name]
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from .errors import ProviderError, RateLimitError, retry_after_of, status_code_of
+
+T = TypeVar('T')
+
+# HTTP statuses worth another attempt
+RETRYABLE_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Transport-level failures from httpx, openai and google.api_core, matched by
+# class name so this module does not need to import every SDK
+RETRYABLE_ERROR_NAMES = {
+    'TimeoutException', 'NetworkError', 'RemoteProtocolError',  # httpx
+    'APIConnectionError', 'APITimeoutError',                    # openai
+    'DeadlineExceeded', 'ServiceUnavailable', 'InternalServerError',  # google.api_core
+}
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, capped by attempts and total elapsed time."""
+    
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, max_elapsed: Optional[float] = None):
+        self.max_attempts = max_attempts or int(os.getenv('RETRY_MAX_ATTEMPTS', 4))
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv('RETRY_BASE_DELAY', 1.0))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv('RETRY_MAX_DELAY', 30.0))
+        self.max_elapsed = max_elapsed if max_elapsed is not None else float(os.getenv('RETRY_MAX_ELAPSED', 180.0))
+    
+    def is_retryable(self, error: BaseException) -> bool:
+        """Transient failures: throttling, 5xx, timeouts and dropped connections."""
+        status = status_code_of(error)
+        if status is not None:
+            return status in RETRYABLE_STATUSES
+        if isinstance(error, (TimeoutError, ConnectionError)):
+            return True
+        return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+    
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Seconds to wait before retry number `attempt` (1-based)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        retry_after = retry_after_of(error)
+        if retry_after is not None:
+            # Never retry sooner than the server asked
+            delay = max(delay, min(retry_after, self.max_elapsed))
+        return delay
+    
+    def _next_delay(self, provider: str, attempt: int, started: float, error: Exception) -> float:
+        """Delay before the next attempt; raises ProviderError when giving up."""
+        if attempt < self.max_attempts and self.is_retryable(error):
+            delay = self.backoff(attempt, error)
+            if time.monotonic() - started + delay <= self.max_elapsed:
+                logging.warning(
+                    f"⚠️ {provider} attempt {attempt}/{self.max_attempts} failed ({error}); "
+                    f"retrying in {delay:.1f}s"
+                )
+                return delay
+        
+        raise self._as_provider_error(provider, attempt, error) from error
+    
+    @staticmethod
+    def _as_provider_error(provider: str, attempts: int, error: Exception) -> ProviderError:
+        if isinstance(error, ProviderError):
+            return error
+        
+        status = status_code_of(error)
+        error_class = RateLimitError if status == 429 else ProviderError
+        suffix = f" after {attempts} attempts" if attempts > 1 else ""
+        return error_class(provider, f"{provider} request failed{suffix}: {error}", status, retry_after_of(error))
+    
+    def call(self, provider: str, fn: Callable[[], T], stats: Optional[Dict] = None) -> T:
+        """
+        Run fn, retrying transient failures; raises ProviderError once retries are exhausted.
+        
+        When given, stats['retries'] is incremented for every retried attempt.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._next_delay(provider, attempt, started, e)
+                self._count_retry(stats)
+                time.sleep(delay)
+    
+    async def acall(self, provider: str, fn: Callable[[], Awaitable[T]], stats: Optional[Dict] = None) -> T:
+        """Async variant of call; fn must return a fresh awaitable per attempt."""
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self._next_delay(provider, attempt, started, e)
+                self._count_retry(stats)
+                await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _count_retry(stats: Optional[Dict]):
+        if stats is not None:
+            stats['retries'] = stats.get('retries', 0) + 1
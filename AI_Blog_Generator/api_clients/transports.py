@@ -0,0 +1,398 @@
+import asyncio
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+import logging
+
+from .rate_limiter import quota_headers
+
+if TYPE_CHECKING:
+    import httpx
+    import openai
+
+# A provider request is transport-neutral:
+#   {'model', 'prompt', 'system' (optional), 'temperature', 'top_p', 'max_tokens'}
+# Generation parameters that are absent are left to the API's defaults.
+GENERATION_PARAMS = ('temperature', 'max_tokens', 'top_p')
+
+
+def chat_body(request: Dict) -> Dict:
+    """Chat-completions request body (OpenAI wire format) for a provider request."""
+    messages: List[Dict] = []
+    if request.get('system'):
+        messages.append({"role": "system", "content": request['system']})
+    messages.append({"role": "user", "content": request['prompt']})
+    
+    body = {'model': request['model'], 'messages': messages}
+    body.update((name, request[name]) for name in GENERATION_PARAMS if name in request)
+    return body
+
+
+class Transport:
+    """
+    How a provider's requests reach its API.
+    
+    A transport makes exactly one attempt per call; rate limiting, retries
+    and parsing stay in BaseProvider, so every provider gets them the same
+    way. `send` fills usage['prompt_tokens'] / usage['completion_tokens']
+    (and usage['ttfb'] when the transport can time the response headers).
+    """
+    
+    # Shown by --test for what probe() costs
+    PROBE = 'completion, max_tokens=1'
+    
+    def send(self, request: Dict, usage: Dict, timeout: Optional[float] = None) -> str:
+        """Send one request and return the generated text."""
+        raise NotImplementedError
+    
+    async def asend(self, request: Dict, usage: Dict, timeout: Optional[float] = None) -> str:
+        """Async variant of send."""
+        raise NotImplementedError
+    
+    def open_stream(self, request: Dict) -> Iterator[str]:
+        """
+        Open a streaming request and return an iterator of text chunks.
+        
+        The request is sent before this returns, so a retry around it covers
+        connection and HTTP errors; closing the iterator closes the stream.
+        """
+        raise NotImplementedError
+    
+    def probe(self, request: Dict, timeout: float, result: Dict):
+        """Cheapest request that proves the API is reachable; fills result's 'status', 'ttfb' and 'quota'."""
+        self.send(request, {}, timeout=timeout)
+        result['status'] = 200
+    
+    def close(self):
+        """Close the underlying connections."""
+    
+    async def aclose(self):
+        """Close async connections from inside their event loop."""
+
+
+class OpenAITransport(Transport):
+    """Chat completions through the official openai SDK (sync and async clients)."""
+    
+    def __init__(self, api_key: str, base_url: Optional[str] = None):
+        # The SDK is imported with the first client rather than with this module
+        import openai
+        
+        openai.api_key = api_key
+        self.api_key = api_key
+        self.base_url = base_url
+        # SDK retries are off: RetryPolicy is the single place transient errors are retried
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        
+        # Async client is created lazily, bound to the event loop that uses it
+        self._async_client = None
+        self._async_loop = None
+    
+    @staticmethod
+    def _usage(response, usage: Dict) -> str:
+        """Token counts from a completion's usage block; returns the completion text."""
+        if response.usage is not None:
+            usage['prompt_tokens'] = response.usage.prompt_tokens
+            usage['completion_tokens'] = response.usage.completion_tokens
+        return response.choices[0].message.content
+    
+    def send(self, request: Dict, usage: Dict, timeout: Optional[float] = None) -> str:
+        client = self.client.with_options(timeout=timeout) if timeout else self.client
+        return self._usage(client.chat.completions.create(**chat_body(request)), usage)
+    
+    async def asend(self, request: Dict, usage: Dict, timeout: Optional[float] = None) -> str:
+        client = self._get_async_client()
+        if timeout:
+            client = client.with_options(timeout=timeout)
+        return self._usage(await client.chat.completions.create(**chat_body(request)), usage)
+    
+    def open_stream(self, request: Dict) -> Iterator[str]:
+        stream = self.client.chat.completions.create(**chat_body(request), stream=True)
+        return self._iter_stream(stream)
+    
+    @staticmethod
+    def _iter_stream(stream) -> Iterator[str]:
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            stream.close()
+    
+    def probe(self, request: Dict, timeout: float, result: Dict):
+        # Streamed, so the time to the response headers (TTFB) can be told apart from the round-trip
+        started = time.monotonic()
+        completions = self.client.with_options(timeout=timeout).chat.completions
+        with completions.with_streaming_response.create(**chat_body(request)) as response:
+            result['ttfb'] = time.monotonic() - started
+            result['status'] = response.status_code
+            result['quota'] = quota_headers(response.headers)
+            response.parse()
+    
+    def _get_async_client(self) -> "openai.AsyncOpenAI":
+        """Return an AsyncOpenAI client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            import openai
+            self._async_client = openai.AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+            self._async_loop = loop
+        return self._async_client
+    
+    def close(self):
+        self.client.close()
+        self._async_client = None
+        self._async_loop = None
+    
+    async def aclose(self):
+        if self._async_client is not None and self._async_loop is asyncio.get_running_loop():
+            await self._async_client.close()
+        self._async_client = None
+        self._async_loop = None
+
+
+class HTTPXChatTransport(Transport):
+    """
+    Any OpenAI-compatible chat completions endpoint over a pooled httpx client.
+    
+    Every request of a provider shares one keep-alive pool (one per event
+    loop for async requests); an httpcore trace hook counts new TCP
+    connections and times the response headers.
+    """
+    
+    def __init__(self, url: str, headers: Dict[str, str], max_connections: int = 20,
+                 max_keepalive_connections: int = 10, keepalive_expiry: float = 30.0,
+                 http2: bool = False, timeout: float = 60.0):
+        # Imported with the first client so loading this module stays cheap
+        import httpx
+        
+        self.url = url
+        self.headers = headers
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logging.warning("⚠️ HTTP/2 requested but 'h2' is not installed (pip install httpx[http2]); using HTTP/1.1")
+                http2 = False
+        self.http2 = http2
+        
+        self.client = httpx.Client(headers=self.headers, limits=self.limits, http2=self.http2, timeout=self.timeout)
+        
+        # Async pool is created lazily, bound to the event loop that uses it
+        self._async_client = None
+        self._async_loop = None
+        
+        # Connection reuse metrics: a request that did not open a TCP connection reused one
+        self.connection_stats = {'requests': 0, 'new_connections': 0}
+        self._stats_lock = threading.Lock()
+    
+    @staticmethod
+    def _usage(data: Dict, usage: Dict) -> str:
+        """Token counts from a response body; returns the completion text."""
+        reported = data.get('usage') or {}
+        usage['prompt_tokens'] = reported.get('prompt_tokens')
+        usage['completion_tokens'] = reported.get('completion_tokens')
+        return data['choices'][0]['message']['content']
+    
+    def send(self, request: Dict, usage: Dict, timeout: Optional[float] = None) -> str:
+        response = self._post(dict(chat_body(request), stream=False), timeout or self.timeout, timing=usage)
+        return self._usage(response.json(), usage)
+    
+    async def asend(self, request: Dict, usage: Dict, timeout: Optional[float] = None) -> str:
+        response = await self._apost(dict(chat_body(request), stream=False), timeout or self.timeout, timing=usage)
+        return self._usage(response.json(), usage)
+    
+    def open_stream(self, request: Dict) -> Iterator[str]:
+        """Send a streaming request; the iterator is returned once the response headers arrive."""
+        self._count_request()
+        http_request = self.client.build_request(
+            'POST', self.url, json=dict(chat_body(request), stream=True), timeout=self.timeout,
+            extensions={'trace': self._trace}
+        )
+        response = self.client.send(http_request, stream=True)
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return self._iter_stream(response)
+    
+    @staticmethod
+    def _iter_stream(response: "httpx.Response") -> Iterator[str]:
+        try:
+            # Server-sent events: one "data: {...}" line per chunk
+            for line in response.iter_lines():
+                if not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                
+                delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+                if delta:
+                    yield delta
+        finally:
+            response.close()
+    
+    def probe(self, request: Dict, timeout: float, result: Dict):
+        timing = {}
+        try:
+            response = self._post(chat_body(request), timeout=timeout, timing=timing)
+            result.update(status=response.status_code, quota=quota_headers(response.headers))
+        finally:
+            result['ttfb'] = timing.get('ttfb')
+    
+    def _post(self, payload: Dict, timeout: float, timing: Optional[Dict] = None) -> "httpx.Response":
+        """POST a payload through the pooled sync client; timing['ttfb'] gets the time to response headers."""
+        self._count_request()
+        started = time.monotonic()
+        
+        def trace(event_name: str, info: Dict):
+            self._trace(event_name, info)
+            self._record_ttfb(event_name, started, timing)
+        
+        response = self.client.post(
+            self.url, json=payload, timeout=timeout,
+            extensions={'trace': trace}
+        )
+        response.raise_for_status()
+        return response
+    
+    async def _apost(self, payload: Dict, timeout: float, timing: Optional[Dict] = None) -> "httpx.Response":
+        """POST a payload through the pooled async client."""
+        self._count_request()
+        started = time.monotonic()
+        
+        async def trace(event_name: str, info: Dict):
+            self._trace(event_name, info)
+            self._record_ttfb(event_name, started, timing)
+        
+        response = await self._get_async_client().post(
+            self.url, json=payload, timeout=timeout,
+            extensions={'trace': trace}
+        )
+        response.raise_for_status()
+        return response
+    
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """Return the async pool bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            import httpx
+            self._async_client = httpx.AsyncClient(
+                headers=self.headers, limits=self.limits, http2=self.http2, timeout=self.timeout
+            )
+            self._async_loop = loop
+        return self._async_client
+    
+    def _count_request(self):
+        with self._stats_lock:
+            self.connection_stats['requests'] += 1
+    
+    def _trace(self, event_name: str, info: Dict):
+        """httpcore trace hook; a TCP connect means the pool had nothing to reuse."""
+        if event_name == 'connection.connect_tcp.started':
+            with self._stats_lock:
+                self.connection_stats['new_connections'] += 1
+    
+    @staticmethod
+    def _record_ttfb(event_name: str, started: float, timing: Optional[Dict]):
+        """Time from sending a request to its response headers, from the httpcore trace."""
+        if timing is not None and event_name.endswith('receive_response_headers.complete'):
+            timing['ttfb'] = time.monotonic() - started
+    
+    @property
+    def connection_reuse_ratio(self) -> float:
+        """Fraction of requests served over an already-open connection."""
+        requests = self.connection_stats['requests']
+        if not requests:
+            return 0.0
+        return max(0, requests - self.connection_stats['new_connections']) / requests
+    
+    def close(self):
+        self.client.close()
+        # An async pool whose loop has finished cannot be awaited any more
+        self._async_client = None
+        self._async_loop = None
+    
+    async def aclose(self):
+        if self._async_client is not None and self._async_loop is asyncio.get_running_loop():
+            await self._async_client.aclose()
+        self._async_client = None
+        self._async_loop = None
+
+
+class GeminiTransport(Transport):
+    """Google Gemini through the google-generativeai SDK."""
+    
+    # The models endpoint costs no tokens
+    PROBE = 'models.get'
+    
+    def __init__(self, api_key: str):
+        # The SDK takes about a second to import, so it is loaded with the first client
+        import google.generativeai as genai
+        
+        genai.configure(api_key=api_key)
+        self.genai = genai
+        # One GenerativeModel per model name, reused across requests
+        self._models: Dict[str, object] = {}
+    
+    def model(self, name: str):
+        """The SDK model object for a model name (e.g. 'gemini-2.5-flash')."""
+        model = self._models.get(name)
+        if model is None:
+            model = self._models[name] = self.genai.GenerativeModel(name)
+        return model
+    
+    def _generation_config(self, request: Dict):
+        names = {'temperature': 'temperature', 'max_tokens': 'max_output_tokens', 'top_p': 'top_p'}
+        return self.genai.types.GenerationConfig(
+            **{names[name]: request[name] for name in GENERATION_PARAMS if name in request}
+        )
+    
+    @staticmethod
+    def _usage(response, usage: Dict) -> str:
+        """Token counts from the response's usage_metadata; returns the generated text."""
+        metadata = getattr(response, 'usage_metadata', None)
+        if metadata is not None:
+            usage['prompt_tokens'] = metadata.prompt_token_count
+            usage['completion_tokens'] = metadata.candidates_token_count
+        return response.text
+    
+    def _options(self, timeout: Optional[float]) -> Dict:
+        return {'request_options': {'timeout': timeout}} if timeout else {}
+    
+    def send(self, request: Dict, usage: Dict, timeout: Optional[float] = None) -> str:
+        response = self.model(request['model']).generate_content(
+            request['prompt'], generation_config=self._generation_config(request), **self._options(timeout)
+        )
+        return self._usage(response, usage)
+    
+    async def asend(self, request: Dict, usage: Dict, timeout: Optional[float] = None) -> str:
+        response = await self.model(request['model']).generate_content_async(
+            request['prompt'], generation_config=self._generation_config(request), **self._options(timeout)
+        )
+        return self._usage(response, usage)
+    
+    def open_stream(self, request: Dict) -> Iterator[str]:
+        response = self.model(request['model']).generate_content(
+            request['prompt'], generation_config=self._generation_config(request), stream=True
+        )
+        return self._iter_stream(response)
+    
+    @staticmethod
+    def _iter_stream(response) -> Iterator[str]:
+        for chunk in response:
+            # Safety/finish chunks carry no parts, and .text raises on those
+            if chunk.parts and chunk.text:
+                yield chunk.text
+    
+    def probe(self, request: Dict, timeout: float, result: Dict):
+        # The SDK exposes neither response headers nor timing, so 'ttfb' and 'quota' stay empty
+        self.genai.get_model(request['model'], request_options={'timeout': timeout})
+        result['status'] = 200
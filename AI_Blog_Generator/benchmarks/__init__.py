@@ -0,0 +1 @@
+"""Performance benchmarks and the local mock LLM server they run against."""
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: shared single-pass section parser vs. the original
+per-client str.split implementation, on synthetic responses from 1 KB up.
+
+Usage:
+    python benchmarks/bench_parser.py
+    python benchmarks/bench_parser.py --sizes 10 100 1000 --repeat 20
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api_clients.content_parser import StreamingContentParser, parse_generated_content
+
+
+def legacy_parse(content: str) -> dict:
+    """The _parse_generated_content implementation previously copied into each client."""
+    sections = {}
+    
+    if "---SUMMARY---" in content:
+        parts = content.split("---SUMMARY---")
+        if len(parts) > 1:
+            sections['summary'] = parts[1].split("---META_DESCRIPTION---")[0].strip()
+    
+    if "---META_DESCRIPTION---" in content:
+        parts = content.split("---META_DESCRIPTION---")
+        if len(parts) > 1:
+            sections['meta_description'] = parts[1].split("---TAGS---")[0].strip()
+    
+    if "---TAGS---" in content:
+        parts = content.split("---TAGS---")
+        if len(parts) > 1:
+            tags_part = parts[1].split("---CONTENT---")[0].strip()
+            sections['tags'] = [tag.strip() for tag in tags_part.split(',')]
+    
+    if "---CONTENT---" in content:
+        parts = content.split("---CONTENT---")
+        if len(parts) > 1:
+            sections['content'] = parts[1].strip()
+    
+    if not sections.get('content'):
+        sections['content'] = content
+    
+    return sections
+
+
+def synthetic_response(size_kb: int) -> str:
+    """Build a well-formed response whose article body is roughly size_kb kilobytes."""
+    paragraph = (
+        "Connection pooling keeps sockets open between requests, so later calls skip "
+        "the TCP and TLS handshakes.\n\n```python\nclient = httpx.Client()\n```\n\n"
+    )
+    body = paragraph * max(1, (size_kb * 1024) // len(paragraph))
+    return (
+        "---SUMMARY---\nA short summary of the article.\n\n"
+        "---META_DESCRIPTION---\nAn SEO description for the article.\n\n"
+        "---TAGS---\npython, httpx, performance, networking, tutorial\n\n"
+        f"---CONTENT---\n# Benchmark Article\n\n{body}"
+    )
+
+
+def stream_parse(content: str, chunk_size: int = 64) -> dict:
+    parser = StreamingContentParser()
+    for i in range(0, len(content), chunk_size):
+        parser.feed(content[i:i + chunk_size])
+    parser.close()
+    return parser.sections()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 100, 1000], help='Response sizes in KB')
+    arg_parser.add_argument('--repeat', type=int, default=50, help='Parses per measurement')
+    args = arg_parser.parse_args()
+    
+    print(f"{'size':>8} {'legacy ms':>10} {'single-pass ms':>15} {'speedup':>8} {'streaming ms':>13}")
+    for size_kb in args.sizes:
+        content = synthetic_response(size_kb)
+        
+        expected = legacy_parse(content)
+        if parse_generated_content(content) != expected or stream_parse(content) != expected:
+            sys.exit(f"Parsers disagree on the {size_kb} KB response")
+        
+        legacy = min(timeit.repeat(lambda: legacy_parse(content), number=args.repeat, repeat=3)) / args.repeat
+        single = min(timeit.repeat(lambda: parse_generated_content(content), number=args.repeat, repeat=3)) / args.repeat
+        streaming = min(timeit.repeat(lambda: stream_parse(content), number=1, repeat=3))
+        
+        print(f"{size_kb:>6}KB {legacy * 1000:>10.3f} {single * 1000:>15.3f} {legacy / single:>7.1f}x {streaming * 1000:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
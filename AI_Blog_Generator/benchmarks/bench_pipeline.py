@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark: drives BlogGenerator against the local mock
+LLM server and reports articles/sec, request latency percentiles, CPU and RSS.
+
+Runs offline. The mock server runs in a child process, so the CPU and memory
+figures belong to the pipeline (generation, parsing, rendering, writing)
+alone. Request latency is measured the way the metrics report it: from the
+first attempt, including rate-limiter queueing and retries, so it rises when
+--concurrency exceeds the provider's adaptive limit
+(<PROVIDER>_MAX_CONCURRENCY, or after 429s). Work happens in a temporary directory; API keys and base URLs point at
+the mock, so no real provider is contacted. Exits non-zero when a gate
+(--min-rate, --max-p95) fails, so it can run in CI.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --articles 200 --concurrency 32 --async
+    python benchmarks/bench_pipeline.py --provider perplexity --latency-dist lognormal --jitter 0.6 --rate-429 0.05
+    python benchmarks/bench_pipeline.py --tokens-per-second 200 --response-tokens 2500 --json bench.json
+    python benchmarks/bench_pipeline.py --min-rate 20 --max-p95 1.0   # CI gate
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from pipeline.metrics import Histogram
+
+# Providers the mock server can stand in for, and the variables that point them at it
+PROVIDER_ENV = {
+    'chatgpt': lambda url: {'OPENAI_API_KEY': 'bench', 'OPENAI_BASE_URL': f"{url}/v1"},
+    'perplexity': lambda url: {'PERPLEXITY_API_KEY': 'bench', 'PERPLEXITY_BASE_URL': f"{url}/chat/completions"},
+}
+
+TOPICS = ('Python decorators', 'Rust ownership', 'Kubernetes operators', 'SQL window functions',
+          'React hooks', 'Go channels', 'TLS handshakes', 'Bloom filters')
+
+
+def start_mock_server(args) -> subprocess.Popen:
+    """Start benchmarks/mock_llm_server.py on a free port; the URL is read from its first line."""
+    command = [
+        sys.executable, str(ROOT / 'benchmarks' / 'mock_llm_server.py'), '--port', '0',
+        '--latency', str(args.latency), '--latency-dist', args.latency_dist, '--jitter', str(args.jitter),
+        '--tokens-per-second', str(args.tokens_per_second), '--response-tokens', str(args.response_tokens),
+        '--rate-429', str(args.rate_429), '--rate-5xx', str(args.rate_5xx), '--retry-after', str(args.retry_after),
+        '--capacity', str(args.capacity), '--seed', str(args.seed)
+    ]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = server.stdout.readline()
+    if 'listening on' not in line:
+        server.kill()
+        raise SystemExit(f"Mock server did not start: {line!r}")
+    server.url = line.split('listening on ')[1].split()[0]
+    return server
+
+
+def stop_mock_server(server: subprocess.Popen) -> Dict:
+    """Stop the server and return its request counters."""
+    # On Ctrl-C the server prints its counters and exits
+    server.send_signal(signal.SIGINT)
+    output, _ = server.communicate(timeout=10)
+    for line in output.splitlines():
+        if line.startswith('Served: '):
+            return json.loads(line[len('Served: '):])
+    return {}
+
+
+def articles(count: int, offset: int = 0) -> List[Dict]:
+    """Distinct titles, so neither the response cache nor dedup short-circuits a request."""
+    return [
+        {'title': f"{TOPICS[i % len(TOPICS)]} in practice, part {i + 1}", 'description': ''}
+        for i in range(offset, offset + count)
+    ]
+
+
+def rss_mb() -> Optional[float]:
+    """Current resident set size (Linux /proc), in MB."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def rounded(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
+
+
+def run(args, url: str) -> Dict:
+    """Generate the articles through BlogGenerator and measure the run."""
+    os.environ.update(PROVIDER_ENV[args.provider](url))
+    # Only the mock-backed provider is initialized; a real key in the environment is never used
+    os.environ.update(GEMINI_API_KEY='', CACHE_DIR='.cache/responses', RUNS_DIR='.cache/runs',
+                      CATALOG_DB='generated_articles/catalog.db')
+    os.environ.setdefault('RETRY_BASE_DELAY', str(args.retry_base_delay))
+    
+    # Templates are read from ./templates, so the scratch directory links to the repository's
+    os.symlink(ROOT / 'templates', 'templates')
+    
+    import blog_generator
+    if not args.verbose:
+        blog_generator.console.quiet = True
+        # Per-request log lines (httpx, retries) would dominate the output; the summary counts retries
+        logging.disable(logging.WARNING)
+    
+    generator = blog_generator.BlogGenerator(
+        use_cache=False, dedup='off', providers=[args.provider], render_processes=args.render_processes
+    )
+    
+    def generate(batch: List[Dict]) -> List[Dict]:
+        if args.use_async:
+            return generator.run_async(generator.agenerate_batch_articles(batch, args.provider, args.concurrency))
+        return generator.generate_batch_articles(batch, args.provider, args.concurrency)
+    
+    try:
+        # Warm-up: connection pools, template compilation and render workers
+        if args.warmup:
+            generate(articles(args.warmup, offset=args.articles))
+        
+        usage_before = resource.getrusage(resource.RUSAGE_SELF)
+        started = time.perf_counter()
+        results = generate(articles(args.articles))
+        wall = time.perf_counter() - started
+        rss_now = rss_mb()
+        usage_after = resource.getrusage(resource.RUSAGE_SELF)
+        limiter = generator.clients[args.provider].rate_limiter
+    finally:
+        generator.close()
+    
+    latency = Histogram()
+    ttfb = Histogram()
+    retries = 0
+    for article in results:
+        metrics = article.get('metrics') or {}
+        if metrics.get('latency_s') is not None:
+            latency.observe(metrics['latency_s'])
+        if metrics.get('ttfb_s') is not None:
+            ttfb.observe(metrics['ttfb_s'])
+        retries += metrics.get('retries') or 0
+    
+    cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    return {
+        'provider': args.provider,
+        'mode': 'async' if args.use_async else 'threads',
+        'concurrency': args.concurrency,
+        'articles': args.articles,
+        'succeeded': len(results),
+        'wall_seconds': round(wall, 3),
+        'articles_per_second': round(len(results) / wall, 2) if wall else 0.0,
+        'latency_seconds': {'p50': rounded(latency.percentile(50)), 'p95': rounded(latency.percentile(95)),
+                            'p99': rounded(latency.percentile(99))},
+        'ttfb_p50_seconds': rounded(ttfb.percentile(50)),
+        'retries': retries,
+        # Where the adaptive concurrency limit ended up (it starts at --concurrency, capped at _MAX_CONCURRENCY)
+        'concurrency_limit': int(limiter.concurrency.limit),
+        'rate_limiter_wait_seconds': round(limiter.stats['waited_seconds'], 3),
+        'cpu_seconds': round(cpu, 3),
+        'cpu_percent': round(100 * cpu / wall, 1) if wall else 0.0,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': round(usage_after.ru_maxrss / 1024, 1),
+        'rss_mb': round(rss_now, 1) if rss_now is not None else None,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--provider', choices=sorted(PROVIDER_ENV), default='chatgpt')
+    arg_parser.add_argument('--articles', type=int, default=50, help='Articles in the measured batch')
+    arg_parser.add_argument('--warmup', type=int, default=4, help='Articles generated before measuring')
+    arg_parser.add_argument('--concurrency', type=int, default=16)
+    arg_parser.add_argument('--async', dest='use_async', action='store_true', help='Use the asyncio batch path')
+    arg_parser.add_argument('--render-processes', type=int, help='Markdown render worker processes')
+    arg_parser.add_argument('--retry-base-delay', type=float, default=0.1,
+                            help='RETRY_BASE_DELAY for the run, unless already set in the environment')
+    
+    mock = arg_parser.add_argument_group('mock server')
+    mock.add_argument('--latency', type=float, default=0.2, help='Seconds to the first token')
+    mock.add_argument('--latency-dist', default='lognormal',
+                      choices=('fixed', 'uniform', 'normal', 'lognormal', 'exponential'))
+    mock.add_argument('--jitter', type=float, default=0.3, help='Spread of the latency distribution')
+    mock.add_argument('--tokens-per-second', type=float, default=0.0, help='Generation speed (0 = instant)')
+    mock.add_argument('--response-tokens', type=int, default=1500, help='Approximate completion size')
+    mock.add_argument('--rate-429', type=float, default=0.0, help='Fraction of requests rejected with 429')
+    mock.add_argument('--rate-5xx', type=float, default=0.0, help='Fraction of requests failing with 503')
+    mock.add_argument('--retry-after', type=float, default=0.1, help='Retry-After seconds sent with 429s')
+    mock.add_argument('--capacity', type=int, default=0, help='Max in-flight requests before 429 (0 = unlimited)')
+    mock.add_argument('--seed', type=int, default=1, help='Random seed for latency and error injection')
+    
+    output = arg_parser.add_argument_group('output and gates')
+    output.add_argument('--json', dest='json_out', metavar='FILE', help='Write the results as JSON')
+    output.add_argument('--min-rate', type=float, help='Fail below this many articles/sec')
+    output.add_argument('--max-p95', type=float, help='Fail when p95 request latency exceeds this many seconds')
+    output.add_argument('--verbose', action='store_true', help='Show the generator console and log output')
+    args = arg_parser.parse_args()
+    
+    server = start_mock_server(args)
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory(prefix='bench_pipeline_') as scratch:
+            os.chdir(scratch)
+            try:
+                results = run(args, server.url)
+            finally:
+                os.chdir(cwd)
+    finally:
+        results_server = stop_mock_server(server)
+    results['server'] = results_server
+    
+    def seconds(value: Optional[float]) -> str:
+        return f"{value * 1000:.0f} ms" if value is not None else "-"
+    
+    latency = results['latency_seconds']
+    print(f"{results['provider']} ({results['mode']}, concurrency {results['concurrency']}): "
+          f"{results['succeeded']}/{results['articles']} articles in {results['wall_seconds']:.2f}s "
+          f"= {results['articles_per_second']:.2f} articles/s")
+    print(f"  request latency  p50 {seconds(latency['p50'])}  p95 {seconds(latency['p95'])}  "
+          f"p99 {seconds(latency['p99'])}  (TTFB p50 {seconds(results['ttfb_p50_seconds'])})")
+    print(f"  CPU {results['cpu_seconds']:.2f}s ({results['cpu_percent']:.0f}% of one core), "
+          f"RSS {results['rss_mb']} MB (peak {results['peak_rss_mb']} MB)")
+    print(f"  server: {results_server.get('requests', 0)} requests, {results_server.get('429', 0)} x 429, "
+          f"{results_server.get('5xx', 0)} x 5xx; client retries {results['retries']}, "
+          f"adaptive concurrency limit {results['concurrency_limit']}")
+    
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    
+    failed = False
+    if results['succeeded'] < results['articles']:
+        print(f"FAIL: {results['articles'] - results['succeeded']} articles were not generated")
+        failed = True
+    if args.min_rate is not None and results['articles_per_second'] < args.min_rate:
+        print(f"FAIL: {results['articles_per_second']:.2f} articles/s is below --min-rate {args.min_rate}")
+        failed = True
+    if args.max_p95 is not None and (latency['p95'] or 0) > args.max_p95:
+        print(f"FAIL: p95 latency {latency['p95']:.3f}s is over --max-p95 {args.max_p95}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
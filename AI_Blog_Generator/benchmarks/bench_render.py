@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-article markdown.markdown() + get_template() vs. the
+cached ArticleRenderer, as used when rendering many articles in a row.
+
+Full-page rendering is dominated by Pygments highlighting, so the cached
+renderer's saving (converter construction, template lookup) is small next
+to it; the fixed per-article overhead and the template load are measured
+separately. Every figure is the median of --rounds runs, legacy and cached
+interleaved, with the min-max spread.
+
+Usage:
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --articles 500 --rounds 15
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import markdown
+from jinja2 import Environment, FileSystemLoader
+
+from pipeline.renderer import ArticleRenderer
+
+
+def synthetic_article(index: int) -> dict:
+    sections = []
+    for section in range(6):
+        sections.append(
+            f"## Section {section}\n\nSome *explanatory* text with `inline code` and a [link](https://example.com).\n\n"
+            f"| Option | Value |\n|--------|-------|\n| a | {index} |\n| b | {section} |\n\n"
+            f"```python\ndef handler_{section}(event):\n    return event['value'] * {index}\n```\n"
+        )
+    return {
+        'title': f"Article {index}",
+        'content': f"# Article {index}\n\n" + "\n".join(sections),
+        'summary': 'Summary', 'tags': ['python', 'web'], 'meta_description': 'Meta',
+        'provider': 'gemini', 'generated_at': datetime.now().isoformat()
+    }
+
+
+def legacy_render(env: Environment, article: dict) -> str:
+    """What BlogGenerator did per article before ArticleRenderer."""
+    content_html = markdown.markdown(article['content'], extensions=ArticleRenderer.MARKDOWN_EXTENSIONS)
+    template = env.get_template('blog_template.html')
+    return template.render(title=article['title'], content_html=content_html, summary=article['summary'],
+                           tags=article['tags'], meta_description=article['meta_description'],
+                           author='AI Blog Generator', provider=article['provider'],
+                           date=datetime.now().strftime("%B %d, %Y"), current_year=datetime.now().year, url='#')
+
+
+def cached_render(renderer: ArticleRenderer, article: dict) -> str:
+    article = dict(article, content_html=renderer.markdown_to_html(article['content']))
+    return renderer.html_page(article, 'slug')
+
+
+def timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - started
+
+
+def summary(samples) -> str:
+    return f"{statistics.median(samples) * 1000:8.2f} ms  ({min(samples) * 1000:.2f}-{max(samples) * 1000:.2f})"
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--articles', type=int, default=200, help='Articles rendered per measurement')
+    arg_parser.add_argument('--rounds', type=int, default=9, help='Measurements per variant (median reported)')
+    args = arg_parser.parse_args()
+    
+    articles = [synthetic_article(index) for index in range(args.articles)]
+    templates_dir = ROOT / 'templates'
+    empty = dict(articles[0], content='')
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Cold: compiles the template and stores its bytecode; warm: a new renderer loads it
+        cold = [timed(lambda: ArticleRenderer(templates_dir, bytecode_cache_dir=tempfile.mkdtemp(dir=cache_dir)).template)
+                for _ in range(args.rounds)]
+        warm = [timed(lambda: ArticleRenderer(templates_dir, bytecode_cache_dir=cache_dir).template)
+                for _ in range(args.rounds)]
+        
+        env = Environment(loader=FileSystemLoader(templates_dir))
+        renderer = ArticleRenderer(templates_dir, bytecode_cache_dir=cache_dir)
+        results = {'legacy': [], 'cached': [], 'legacy overhead': [], 'cached overhead': []}
+        for _ in range(args.rounds):
+            results['legacy'].append(timed(lambda: [legacy_render(env, article) for article in articles]))
+            results['cached'].append(timed(lambda: [cached_render(renderer, article) for article in articles]))
+            # Same calls on an empty article: only the per-article setup remains
+            results['legacy overhead'].append(timed(lambda: [legacy_render(env, empty) for _ in articles]))
+            results['cached overhead'].append(timed(lambda: [cached_render(renderer, empty) for _ in articles]))
+    
+    print(f"template load, cold:             {summary(cold)}")
+    print(f"template load, bytecode cache:   {summary(warm)}")
+    for name, samples in results.items():
+        print(f"{args.articles} articles, {name + ':':17}{summary(samples)}")
+    for name in ('', ' overhead'):
+        ratio = statistics.median(results['legacy' + name]) / statistics.median(results['cached' + name])
+        print(f"median speedup{name or ' (full pages)'}: {ratio:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: import cost of `blog_generator.py --help`, measured with
+`python -X importtime`, checked against a budget.
+
+Exits non-zero when the imports exceed the budget or when a module that
+should only load on first use (provider SDKs, Markdown, Jinja, NumPy) is
+imported, so it can gate CI against cold-start regressions.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-ms 300 --runs 5
+    python benchmarks/bench_startup.py -- --list   # any blog_generator.py arguments
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Top-level packages that must not be imported just to start the CLI
+LAZY_MODULES = ('google.generativeai', 'openai', 'httpx', 'markdown', 'jinja2', 'pygments', 'numpy')
+
+
+def measure(args: List[str]) -> Tuple[float, int, List[Tuple[str, int]], List[str]]:
+    """
+    Run the CLI once under -X importtime.
+    
+    Returns:
+        (wall seconds, top-level import µs, slowest top-level imports, lazy modules that were imported)
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', 'blog_generator.py'] + args,
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise SystemExit(f"blog_generator.py {' '.join(args)} failed:\n{result.stderr[-2000:]}")
+    
+    top_level = []
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        module = name.strip()
+        imported.add(module)
+        if not name.startswith('  '):
+            top_level.append((module, int(cumulative_us)))
+    
+    total = sum(cumulative for _, cumulative in top_level)
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    lazy = sorted(module for module in LAZY_MODULES if module in imported)
+    return wall, total, top_level, lazy
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--budget-ms', type=float, default=250.0,
+                            help='Maximum import time (best of --runs), excluding interpreter startup')
+    arg_parser.add_argument('--runs', type=int, default=3, help='Runs; the fastest one is checked')
+    arg_parser.add_argument('--top', type=int, default=10, help='Slowest top-level imports to list')
+    arg_parser.add_argument('cli_args', nargs='*', help='Arguments for blog_generator.py (default: --help)')
+    args = arg_parser.parse_args()
+    cli_args = args.cli_args or ['--help']
+    
+    # Interpreter startup (site, encodings, ...) is not ours to budget
+    baseline = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'pass'], capture_output=True, text=True)
+    baseline_us = sum(
+        int(line.split('|')[1]) for line in baseline.stderr.splitlines()
+        if line.startswith('import time:') and 'self [us]' not in line and not line.split('|')[2].startswith('  ')
+    )
+    
+    runs = [measure(cli_args) for _ in range(max(1, args.runs))]
+    wall, total, top_level, lazy = min(runs, key=lambda run: run[1])
+    imports_ms = max(0, total - baseline_us) / 1000
+    
+    print(f"blog_generator.py {' '.join(cli_args)}: {wall * 1000:.0f} ms wall, "
+          f"{imports_ms:.0f} ms imports (budget {args.budget_ms:.0f} ms, best of {len(runs)})")
+    for module, cumulative in top_level[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+    
+    failed = False
+    if lazy:
+        print(f"FAIL: imported at startup, should load on first use: {', '.join(lazy)}")
+        failed = True
+    if imports_ms > args.budget_ms:
+        print(f"FAIL: imports took {imports_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
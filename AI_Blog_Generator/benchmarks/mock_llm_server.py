@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Local mock LLM server speaking the OpenAI/Perplexity chat-completions wire format
+(plain and streamed as server-sent events), plus the OpenAI Files and Batch
+endpoints used by --batch-api.
+
+Lets the rate limiter, adaptive concurrency and the rest of the pipeline be
+exercised offline without spending API money. Time to first token follows a
+configurable distribution, generation runs at a configurable token rate, and
+429s, 503s and over-capacity rejections can be injected.
+
+Usage:
+    python benchmarks/mock_llm_server.py --port 8100 --capacity 4 --latency 0.5
+    python benchmarks/mock_llm_server.py --latency 0.4 --latency-dist lognormal --jitter 0.5 \\
+        --tokens-per-second 80 --response-tokens 2500 --rate-429 0.05
+    
+    PERPLEXITY_BASE_URL=http://127.0.0.1:8100/chat/completions PERPLEXITY_API_KEY=test \\
+        python blog_generator.py --sample --provider perplexity --concurrency 16 --no-cache
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=test \\
+        python blog_generator.py --sample --provider chatgpt --concurrency 16 --no-cache
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 OPENAI_API_KEY=test BATCH_POLL_SECONDS=1 \\
+        python blog_generator.py --sample --batch-api --no-cache
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+import threading
+import time
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional
+
+# How --latency/--jitter are turned into a time to first token:
+#   fixed       - always `latency`
+#   uniform     - latency ± jitter
+#   normal      - mean latency, standard deviation jitter
+#   lognormal   - median latency, log-space sigma jitter (long right tail, like real APIs)
+#   exponential - mean latency
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal', 'exponential')
+
+
+class MockSettings:
+    """Behaviour knobs shared by every request handler."""
+    
+    def __init__(self, latency: float = 0.2, capacity: int = 0, rate_429: float = 0.0,
+                 rate_5xx: float = 0.0, retry_after: Optional[float] = 1.0, seed: Optional[int] = None,
+                 batch_delay: float = 1.0, requests_per_minute: int = 600, latency_dist: str = 'fixed',
+                 jitter: float = 0.0, tokens_per_second: float = 0.0, response_tokens: int = 0,
+                 chunk_tokens: int = 8):
+        if latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{latency_dist}'")
+        self.latency = latency
+        self.latency_dist = latency_dist
+        self.jitter = jitter
+        # Generation speed after the first token (0 = the whole response at once)
+        self.tokens_per_second = tokens_per_second
+        # Approximate completion size; 0 keeps the short default article
+        self.response_tokens = response_tokens
+        # Tokens per streamed chunk
+        self.chunk_tokens = max(1, chunk_tokens)
+        # Requests beyond this many in flight get a 429 (0 = unlimited)
+        self.capacity = capacity
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.in_flight = 0
+        self.stats = {'requests': 0, 'ok': 0, '429': 0, '5xx': 0, 'streams': 0, 'aborted': 0}
+        self.lock = threading.Lock()
+        
+        # Advertised in x-ratelimit-* headers like the real APIs (reported, not enforced)
+        self.requests_per_minute = requests_per_minute
+        self.window_started = time.monotonic()
+        self.window_requests = 0
+        
+        # Files and Batch API state; a batch completes `batch_delay` seconds after creation
+        self.batch_delay = batch_delay
+        self.files: Dict[str, Dict] = {}
+        self.batches: Dict[str, Dict] = {}
+        self.ids = itertools.count(1)
+    
+    def sample_latency(self) -> float:
+        """Seconds to the first token, drawn from the configured distribution."""
+        with self.lock:
+            if self.latency_dist == 'uniform':
+                value = self.random.uniform(self.latency - self.jitter, self.latency + self.jitter)
+            elif self.latency_dist == 'normal':
+                value = self.random.gauss(self.latency, self.jitter)
+            elif self.latency_dist == 'lognormal':
+                value = self.latency * math.exp(self.random.gauss(0.0, self.jitter))
+            elif self.latency_dist == 'exponential':
+                value = self.random.expovariate(1.0 / self.latency) if self.latency > 0 else 0.0
+            else:
+                value = self.latency
+        return max(0.0, value)
+    
+    def generation_seconds(self, tokens: int) -> float:
+        """Time to produce `tokens` completion tokens at the configured rate."""
+        return tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+# Perplexity adds the sources it searched to every response
+MOCK_CITATIONS = ['https://example.com/docs', 'https://example.com/blog']
+
+
+def is_perplexity(request: Dict) -> bool:
+    """Perplexity's models are the Sonar family; their responses carry citations."""
+    return 'sonar' in str(request.get('model', ''))
+
+
+def mock_article(prompt: str, tokens: int = 0) -> str:
+    """
+    A well-formed response in the section-marker format the prompts ask for.
+    
+    Args:
+        prompt: The user prompt (its "# Title" line names the article)
+        tokens: Pad the body with sections until it is about this many tokens (4 characters each)
+    """
+    title = next((line.strip('# ').strip() for line in prompt.splitlines() if line.startswith('# ')), "Mock Article")
+    sections = []
+    size = 0
+    # Five short sections, then longer ones until the requested size is reached
+    while len(sections) < 5 or size < tokens * 4:
+        i = len(sections) + 1
+        filler = " Benchmark filler text." * 8 if i > 5 else ""
+        sections.append(f"## Section {i}\n\nMock paragraph {i} about {title}.{filler}\n\n```python\nprint({i})\n```")
+        size += len(sections[-1])
+    body = "\n\n".join(sections)
+    return (
+        f"---SUMMARY---\nA mock summary of {title}.\n\n"
+        f"---META_DESCRIPTION---\nMock meta description for {title}.\n\n"
+        f"---TAGS---\nmock, testing, benchmark\n\n"
+        f"---CONTENT---\n# {title}\n\n{body}\n"
+    )
+
+
+def completion_body(request: Dict, tokens: int = 0) -> Dict:
+    """Chat completion response for a chat completion request."""
+    prompt = request.get('messages', [{}])[-1].get('content', '')
+    content = mock_article(prompt, tokens)
+    body = {
+        'id': 'chatcmpl-mock',
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': request.get('model', 'mock'),
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': content},
+            'finish_reason': 'stop'
+        }],
+        'usage': {
+            'prompt_tokens': len(prompt) // 4,
+            'completion_tokens': len(content) // 4,
+            'total_tokens': (len(prompt) + len(content)) // 4
+        }
+    }
+    if is_perplexity(request):
+        body['citations'] = MOCK_CITATIONS
+    return body
+
+
+def completion_chunks(request: Dict, content: str, chunk_tokens: int) -> Iterator[Dict]:
+    """Streamed chat.completion.chunk events for a response, `chunk_tokens` tokens each."""
+    prompt = request.get('messages', [{}])[-1].get('content', '')
+    base = {
+        'id': 'chatcmpl-mock',
+        'object': 'chat.completion.chunk',
+        'created': int(time.time()),
+        'model': request.get('model', 'mock')
+    }
+    if is_perplexity(request):
+        base['citations'] = MOCK_CITATIONS
+    
+    step = chunk_tokens * 4
+    for start in range(0, len(content), step):
+        delta = {'content': content[start:start + step]}
+        if start == 0:
+            delta['role'] = 'assistant'
+        yield dict(base, choices=[{'index': 0, 'delta': delta, 'finish_reason': None}])
+    
+    yield dict(base, choices=[{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+    
+    # OpenAI sends token counts in a final choice-less chunk when asked to
+    if (request.get('stream_options') or {}).get('include_usage'):
+        usage = {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(content) // 4,
+                 'total_tokens': (len(prompt) + len(content)) // 4}
+        yield dict(base, choices=[], usage=usage)
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    settings: MockSettings = MockSettings()
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        path = self.path.split('?')[0].rstrip('/')
+        parts = path.split('/')
+        
+        if len(parts) >= 2 and parts[-2] == 'batches':
+            batch = self.settings.batches.get(parts[-1])
+            if batch:
+                self._send_json(200, batch)
+                return
+        elif len(parts) >= 3 and parts[-3] == 'files' and parts[-1] == 'content':
+            stored = self.settings.files.get(parts[-2])
+            if stored:
+                self._send_bytes(200, stored['data'], 'application/octet-stream')
+                return
+        elif len(parts) >= 2 and parts[-2] == 'files':
+            stored = self.settings.files.get(parts[-1])
+            if stored:
+                self._send_json(200, stored['object'])
+                return
+        
+        self._send_json(404, {'error': {'message': f'Unknown path {self.path}'}})
+    
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        path = self.path.split('?')[0].rstrip('/')
+        
+        if path.endswith('/files'):
+            self._create_file(body)
+            return
+        if path.endswith('/batches'):
+            self._create_batch(json.loads(body or b'{}'))
+            return
+        if not path.endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': f'Unknown path {self.path}'}})
+            return
+        
+        request = json.loads(body or b'{}')
+        settings = self.settings
+        with settings.lock:
+            settings.stats['requests'] += 1
+            if time.monotonic() - settings.window_started >= 60:
+                settings.window_started = time.monotonic()
+                settings.window_requests = 0
+            settings.window_requests += 1
+            over_capacity = settings.capacity and settings.in_flight >= settings.capacity
+            roll = settings.random.random()
+            if not over_capacity:
+                settings.in_flight += 1
+        
+        if over_capacity or roll < settings.rate_429:
+            self._count('429')
+            headers = {'Retry-After': str(settings.retry_after)} if settings.retry_after is not None else {}
+            self._send_json(429, {'error': {'message': 'Rate limit exceeded', 'type': 'rate_limit'}}, headers)
+            if not over_capacity:
+                self._release()
+            return
+        
+        try:
+            time.sleep(settings.sample_latency())
+            
+            if roll < settings.rate_429 + settings.rate_5xx:
+                self._count('5xx')
+                self._send_json(503, {'error': {'message': 'Service unavailable'}})
+                return
+            
+            if request.get('stream'):
+                self._stream_completion(request)
+            else:
+                self._send_completion(request)
+        finally:
+            self._release()
+    
+    def _send_completion(self, request: Dict):
+        body = completion_body(request, self.settings.response_tokens)
+        # Without streaming, the client sees nothing until the last token is generated
+        time.sleep(self.settings.generation_seconds(body['usage']['completion_tokens']))
+        self._count('ok')
+        self._send_json(200, body, self._quota_headers())
+    
+    def _stream_completion(self, request: Dict):
+        """Server-sent events over a chunked response, paced at the configured token rate."""
+        settings = self.settings
+        prompt = request.get('messages', [{}])[-1].get('content', '')
+        content = mock_article(prompt, settings.response_tokens)
+        self._count('streams')
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        for name, value in self._quota_headers().items():
+            self.send_header(name, value)
+        self.end_headers()
+        
+        try:
+            for chunk in completion_chunks(request, content, settings.chunk_tokens):
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                time.sleep(settings.generation_seconds(settings.chunk_tokens) if chunk['choices'] else 0)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            self._count('ok')
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closed the stream early (e.g. an aborted generation)
+            self._count('aborted')
+            self.close_connection = True
+    
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+    
+    def _quota_headers(self) -> Dict:
+        settings = self.settings
+        with settings.lock:
+            remaining = max(0, settings.requests_per_minute - settings.window_requests)
+            reset = max(0.0, 60 - (time.monotonic() - settings.window_started))
+        return {
+            'x-ratelimit-limit-requests': str(settings.requests_per_minute),
+            'x-ratelimit-remaining-requests': str(remaining),
+            'x-ratelimit-reset-requests': f"{reset:.0f}s"
+        }
+    
+    def _create_file(self, body: bytes):
+        """Multipart upload, as sent by client.files.create."""
+        message = BytesParser().parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode('utf-8') + body
+        )
+        fields = {}
+        for part in message.get_payload():
+            name = part.get_param('name', header='content-disposition')
+            fields[name] = (part.get_filename(), part.get_payload(decode=True))
+        
+        filename, data = fields.get('file', ('upload.jsonl', b''))
+        purpose = fields.get('purpose', (None, b'batch'))[1].decode('utf-8')
+        file_object = self._store_file(filename, data, purpose)
+        self._send_json(200, file_object)
+    
+    def _store_file(self, filename: str, data: bytes, purpose: str) -> Dict:
+        settings = self.settings
+        with settings.lock:
+            file_id = f"file-mock{next(settings.ids)}"
+            file_object = {
+                'id': file_id, 'object': 'file', 'bytes': len(data), 'created_at': int(time.time()),
+                'filename': filename, 'purpose': purpose, 'status': 'processed'
+            }
+            settings.files[file_id] = {'object': file_object, 'data': data}
+        return file_object
+    
+    def _create_batch(self, request: Dict):
+        settings = self.settings
+        if request.get('input_file_id') not in settings.files:
+            self._send_json(400, {'error': {'message': 'Unknown input_file_id'}})
+            return
+        
+        now = int(time.time())
+        with settings.lock:
+            batch = {
+                'id': f"batch_mock{next(settings.ids)}", 'object': 'batch',
+                'endpoint': request.get('endpoint'), 'errors': None,
+                'input_file_id': request['input_file_id'],
+                'completion_window': request.get('completion_window', '24h'),
+                'status': 'validating', 'output_file_id': None, 'error_file_id': None,
+                'created_at': now, 'in_progress_at': None, 'expires_at': now + 86400,
+                'finalizing_at': None, 'completed_at': None, 'failed_at': None, 'expired_at': None,
+                'cancelling_at': None, 'cancelled_at': None,
+                'request_counts': {'total': 0, 'completed': 0, 'failed': 0},
+                'metadata': request.get('metadata')
+            }
+            settings.batches[batch['id']] = batch
+        
+        threading.Thread(target=self._run_batch, args=(batch['id'],), daemon=True).start()
+        self._send_json(200, batch)
+    
+    def _run_batch(self, batch_id: str):
+        """Work through a batch's input file in the background, like the real service."""
+        settings = self.settings
+        batch = settings.batches[batch_id]
+        data = settings.files[batch['input_file_id']]['data']
+        lines = [json.loads(line) for line in data.splitlines() if line.strip()]
+        with settings.lock:
+            batch.update(status='in_progress', in_progress_at=int(time.time()))
+            batch['request_counts']['total'] = len(lines)
+        
+        outputs, errors = [], []
+        for index, line in enumerate(lines):
+            time.sleep(settings.batch_delay / max(1, len(lines)))
+            with settings.lock:
+                failed = settings.random.random() < settings.rate_5xx
+            if failed:
+                errors.append({
+                    'id': f"batch_req_{index}", 'custom_id': line.get('custom_id'),
+                    'response': {'status_code': 500, 'body': {'error': {'message': 'Mock batch item failure'}}},
+                    'error': None
+                })
+            else:
+                outputs.append({
+                    'id': f"batch_req_{index}", 'custom_id': line.get('custom_id'),
+                    'response': {'status_code': 200, 'request_id': f"req_{index}",
+                                 'body': completion_body(line.get('body', {}), settings.response_tokens)},
+                    'error': None
+                })
+            with settings.lock:
+                batch['request_counts']['failed' if failed else 'completed'] += 1
+        
+        def jsonl(rows):
+            return "".join(json.dumps(row) + "\n" for row in rows).encode('utf-8')
+        
+        output_file = self._store_file('batch_output.jsonl', jsonl(outputs), 'batch_output')
+        error_file = self._store_file('batch_errors.jsonl', jsonl(errors), 'batch_output') if errors else None
+        with settings.lock:
+            batch.update(status='completed', completed_at=int(time.time()), output_file_id=output_file['id'],
+                         error_file_id=error_file['id'] if error_file else None)
+    
+    def _send_bytes(self, status: int, data: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
+    def _send_json(self, status: int, body: Dict, headers: Optional[Dict] = None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on the request (e.g. a cancelled hedge)
+            pass
+    
+    def _count(self, outcome: str):
+        with self.settings.lock:
+            self.settings.stats[outcome] += 1
+    
+    def _release(self):
+        with self.settings.lock:
+            self.settings.in_flight -= 1
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 resets connections under a high-concurrency benchmark
+    request_queue_size = 1024
+    daemon_threads = True
+    
+    def handle_error(self, request, client_address):
+        # A client dropping a keep-alive connection (e.g. an aborted stream) is not a server error
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class MockLLMServer:
+    """Run the mock server on a background thread (port 0 picks a free port)."""
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, settings: Optional[MockSettings] = None):
+        self.settings = settings or MockSettings()
+        handler = type('BoundMockLLMHandler', (MockLLMHandler,), {'settings': self.settings})
+        self.httpd = MockHTTPServer((host, port), handler)
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock LLM server (OpenAI/Perplexity chat completions)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100, help='Port to listen on (0 picks a free one)')
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds to the first token')
+    parser.add_argument('--latency-dist', choices=LATENCY_DISTRIBUTIONS, default='fixed',
+                        help='Distribution of the time to first token')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='Spread of --latency-dist (± for uniform, stddev for normal, sigma for lognormal)')
+    parser.add_argument('--tokens-per-second', type=float, default=0.0,
+                        help='Generation speed after the first token (0 = instant)')
+    parser.add_argument('--response-tokens', type=int, default=0,
+                        help='Approximate completion size in tokens (0 = short default article)')
+    parser.add_argument('--chunk-tokens', type=int, default=8, help='Tokens per streamed chunk')
+    parser.add_argument('--capacity', type=int, default=0, help='Max in-flight requests before 429 (0 = unlimited)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='Fraction of requests rejected with 429')
+    parser.add_argument('--rate-5xx', type=float, default=0.0, help='Fraction of requests failing with 503')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--seed', type=int, help='Random seed for error injection')
+    parser.add_argument('--batch-delay', type=float, default=1.0, help='Seconds a Batch API job takes to complete')
+    parser.add_argument('--rpm', type=int, default=600, help='Requests/min advertised in x-ratelimit-* headers')
+    args = parser.parse_args()
+    
+    settings = MockSettings(args.latency, args.capacity, args.rate_429, args.rate_5xx, args.retry_after, args.seed,
+                            args.batch_delay, args.rpm, args.latency_dist, args.jitter, args.tokens_per_second,
+                            args.response_tokens, args.chunk_tokens)
+    server = MockLLMServer(args.host, args.port, settings)
+    # Flushed so a parent process (e.g. bench_pipeline.py) can read the URL from a pipe
+    print(f"Mock LLM server listening on {server.url} (Ctrl-C to stop)", flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Served: {json.dumps(settings.stats)}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
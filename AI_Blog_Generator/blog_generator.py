@@ -6,27 +6,46 @@ Supports Gemini, Perplexity Pro, and ChatGPT APIs
 
 import os
 import sys
+import asyncio
 import json
 import logging
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
-import markdown
-from jinja2 import Environment, FileSystemLoader
+from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 import click
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.text import Text
 from rich.prompt import Prompt, Confirm
 
 # Add current directory to path for imports
 sys.path.append(str(Path(__file__).parent))
 
-# Import API clients
-from api_clients.gemini_client import GeminiClient
-from api_clients.perplexity_client import PerplexityClient
-from api_clients.chatgpt_client import ChatGPTClient
+# API clients are looked up in the provider registry; each module (and its
+# SDK) is imported only when that provider is initialized
+from api_clients.registry import get_provider_class, load_plugins, provider_names
+from api_clients.content_parser import StreamingContentParser
+from api_clients.errors import ProviderError
+
+# Import pipeline components
+from pipeline.response_cache import ResponseCache
+from pipeline.provider_stats import LatencyTracker
+from pipeline.scheduler import ProviderScheduler
+from pipeline.article_writer import ArticleWriter, atomic_write
+from pipeline.renderer import ArticleRenderer
+from pipeline.build_manifest import BuildManifest
+from pipeline.catalog import ArticleCatalog
+from pipeline.run_journal import RunJournal
+from pipeline.input_reader import SUPPORTED_SUFFIXES, chunked, read_articles
+from pipeline.metrics import MetricsCollector
+from pipeline.long_form import LongFormWriter
 
 # Initialize rich console
 console = Console()
@@ -34,7 +53,18 @@ console = Console()
 class BlogGenerator:
     """Main blog generation class."""
     
-    def __init__(self, config_dir: str = "config"):
+    # How each article is dispatched to providers:
+    #   single - one provider per article
+    #   hedge  - a second provider is started if the first is slower than its p95
+    #   race   - every available provider at once; the first answer wins
+    DISPATCH_MODES = ('single', 'hedge', 'race')
+    DEDUP_MODES = ('skip', 'flag', 'off')
+    
+    def __init__(self, config_dir: str = "config", use_cache: bool = True, refresh_cache: bool = False,
+                 dispatch: str = 'single', schedule: Optional[str] = None,
+                 render_processes: Optional[int] = None, dedup: Optional[str] = None,
+                 dedup_threshold: Optional[float] = None, metrics_out: Optional[str] = None,
+                 providers: Optional[List[str]] = None, long_form: bool = False):
         self.config_dir = Path(config_dir)
         self.output_dir = Path("generated_articles")
         self.templates_dir = Path("templates")
@@ -51,12 +81,65 @@ class BlogGenerator:
         # Setup logging
         self._setup_logging()
         
-        # Initialize clients
+        # Initialize clients (all of them unless the command names its providers)
         self.clients = {}
-        self._initialize_clients()
+        self._initialize_clients(providers)
+        
+        # Response cache so identical requests are not regenerated and re-billed
+        self.cache = ResponseCache(
+            cache_dir=os.getenv('CACHE_DIR', '.cache/responses'),
+            enabled=use_cache,
+            refresh=refresh_cache
+        )
+        
+        # Per-provider latency history, used to derive hedging deadlines
+        if dispatch not in self.DISPATCH_MODES:
+            raise ValueError(f"Unknown dispatch mode '{dispatch}'")
+        self.dispatch = dispatch
+        self.latency = LatencyTracker()
+        
+        # Tokens, retries, cache hits, cost and latency histograms per provider
+        self.metrics = MetricsCollector()
+        self.metrics_out = metrics_out or os.getenv('METRICS_OUT') or None
+        
+        # Optional load balancing of every article across all initialized clients
+        self.scheduler = None
+        if schedule:
+            self.scheduler = ProviderScheduler(
+                list(self.clients), self.latency, schedule,
+                quotas={name: self._provider_quota(client) for name, client in self.clients.items()}
+            )
+        
+        # Template and Markdown setup happens once, not per article
+        self.renderer = ArticleRenderer(self.templates_dir, processes=render_processes)
+        
+        # Articles are written to disk off the generation path; pending saves
+        # are keyed by JSON path until the batch checks them
+        self.writer = ArticleWriter()
+        self._saves: Dict[str, Future] = {}
+        self._saves_lock = threading.Lock()
         
-        # Setup Jinja2 for templates
-        self.jinja_env = Environment(loader=FileSystemLoader(self.templates_dir))
+        # Providers whose in-flight cap was reported lower than --concurrency
+        self._concurrency_capped = set()
+        
+        # Set by start_run/resume_run to make batches resumable
+        self.journal = None
+        
+        # Near-duplicate topics are skipped (or flagged) before any API call
+        self.dedup_mode = dedup or os.getenv('DEDUP_MODE', 'skip')
+        self.dedup_threshold = dedup_threshold
+        # Signatures of every catalogued title, built on the first batch and kept
+        # up to date as articles are saved (see _dedupe_batch)
+        self._title_index = None
+        self._title_index_lock = threading.Lock()
+        
+        # Long-form mode: an outline first, then every section generated at once
+        self.long_form = LongFormWriter() if long_form else None
+        
+        # Searchable index of everything in the output directory
+        self.catalog = ArticleCatalog(os.getenv('CATALOG_DB', str(self.output_dir / "catalog.db")))
+        if self.catalog.created:
+            self.catalog.sync(self.output_dir, self._safe_title)
         
         console.print("🤖 AI Blog Generator initialized!", style="green bold")
     
@@ -73,174 +156,1280 @@ class BlogGenerator:
         )
         self.logger = logging.getLogger(__name__)
     
-    def _initialize_clients(self):
-        """Initialize available AI clients."""
+    @property
+    def jinja_env(self):
+        """The page template's Jinja environment (created on first use)."""
+        return self.renderer.env
+    
+    def _initialize_clients(self, providers: Optional[List[str]] = None):
+        """
+        Initialize available AI clients.
+        
+        Providers come from the registry: the built-in ones plus any plugin
+        module listed in PROVIDER_PLUGINS that registers with @register_provider.
+        
+        Args:
+            providers: Only initialize these (an empty list initializes none);
+                if none of them is available, the others are tried as a fallback
+        """
+        if providers is not None and not providers:
+            return
+        
+        load_plugins()
+        names = provider_names() if providers is None else list(providers)
+        
         console.print("🔧 Initializing AI clients...", style="yellow")
         
         # Try to initialize each client
-        try:
-            self.clients['gemini'] = GeminiClient()
-            console.print("✅ Gemini client ready", style="green")
-        except Exception as e:
-            console.print(f"❌ Gemini client failed: {e}", style="red")
+        for name in names:
+            self._initialize_client(name)
+        
+        if not self.clients and providers:
+            console.print("⚠️ Requested provider unavailable, trying the others", style="yellow")
+            for name in provider_names():
+                if name not in names:
+                    self._initialize_client(name)
         
+        if not self.clients:
+            console.print("❌ No AI clients available! Please check your API keys.", style="red bold")
+            sys.exit(1)
+    
+    def _initialize_client(self, name: str):
         try:
-            self.clients['perplexity'] = PerplexityClient()
-            console.print("✅ Perplexity client ready", style="green")
-        except Exception as e:
-            console.print(f"❌ Perplexity client failed: {e}", style="red")
+            client_class = get_provider_class(name)
+        except KeyError as e:
+            console.print(f"❌ {e.args[0]}", style="red")
+            return
         
         try:
-            self.clients['chatgpt'] = ChatGPTClient()
-            console.print("✅ ChatGPT client ready", style="green")
+            self.clients[name] = client_class()
+            console.print(f"✅ {client_class.label} client ready", style="green")
         except Exception as e:
-            console.print(f"❌ ChatGPT client failed: {e}", style="red")
+            console.print(f"❌ {client_class.label} client failed: {e}", style="red")
+    
+    def close(self):
+        """Flush pending article writes and release client resources such as pooled HTTP connections."""
+        self.writer.close()
+        self.renderer.close()
+        self.catalog.close()
+        self._export_metrics()
         
-        if not self.clients:
-            console.print("❌ No AI clients available! Please check your API keys.", style="red bold")
-            sys.exit(1)
+        if self.journal:
+            counts = self.journal.counts()
+            unfinished = counts['failed'] + counts['pending'] + counts['in_flight']
+            summary = (f"📒 Run {self.journal.run_id}: {counts['done']} done, "
+                       f"{counts['skipped']} skipped, {unfinished} unfinished")
+            if unfinished:
+                summary += f" (retry with --resume {self.journal.run_id})"
+            console.print(summary, style="cyan")
+            self.journal.close()
+        
+        for name, client in self.clients.items():
+            stats = getattr(client, 'connection_stats', None)
+            if stats and stats['requests']:
+                self.logger.info(
+                    f"{name.title()} connection pool: {stats['requests']} requests over "
+                    f"{stats['new_connections']} connections ({client.connection_reuse_ratio:.0%} reused)"
+                )
+            
+            if hasattr(client, 'close'):
+                try:
+                    client.close()
+                except Exception as e:
+                    self.logger.warning(f"Error closing {name} client: {e}")
+    
+    async def aclose(self):
+        """Release async client resources; call from the loop that used them."""
+        for name, client in self.clients.items():
+            if hasattr(client, 'aclose'):
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    self.logger.warning(f"Error closing {name} async client: {e}")
     
-    def test_connections(self):
-        """Test all AI client connections."""
+    def run_async(self, coro):
+        """Run a coroutine on a fresh event loop, closing async clients inside that loop."""
+        async def runner():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+        
+        return asyncio.run(runner())
+    
+    def test_connections(self, timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Probe every client at once and print latency, TTFB and quota headers.
+        
+        Each probe is the cheapest request the provider allows (a models
+        lookup or a one-token completion) and is not retried, so the whole
+        check takes about as long as the slowest provider, at most `timeout`.
+        
+        Args:
+            timeout: Seconds per probe (default: HEALTH_CHECK_TIMEOUT or 10)
+        
+        Returns:
+            Provider -> probe result ('ok', 'latency', 'ttfb', 'status', 'quota', 'error')
+        """
+        timeout = timeout or float(os.getenv('HEALTH_CHECK_TIMEOUT', 10.0))
         console.print("\n🧪 Testing AI client connections...", style="yellow bold")
         
-        results = {}
-        for name, client in self.clients.items():
+        finished = {}
+        
+        def run_probe(name: str, client):
             try:
-                with console.status(f"Testing {name}..."):
-                    result = client.test_connection()
-                    results[name] = result
-                    status = "✅ Working" if result else "❌ Failed"
-                    console.print(f"{name.title()}: {status}")
+                finished[name] = client.probe(timeout)
             except Exception as e:
-                results[name] = False
-                console.print(f"{name.title()}: ❌ Error - {e}")
+                finished[name] = {'ok': False, 'error': str(e)}
         
+        # Daemon threads rather than an executor: pool workers are joined at
+        # interpreter exit, so a probe that hangs past its timeout would block
+        # the process from exiting
+        threads = [
+            threading.Thread(target=run_probe, args=(name, client), name=f"probe-{name}", daemon=True)
+            for name, client in self.clients.items()
+        ]
+        for thread in threads:
+            thread.start()
+        
+        with console.status(f"Probing {', '.join(self.clients)}..."):
+            # The SDK timeouts should fire first; this bounds a probe that ignores them
+            deadline = time.monotonic() + timeout + 1.0
+            for thread in threads:
+                thread.join(max(0.0, deadline - time.monotonic()))
+        
+        results = {}
+        for name in self.clients:
+            result = finished.get(name)
+            if result is None:
+                result = {'ok': False, 'error': f"timed out after {timeout:.0f}s", 'latency': timeout}
+            results[name] = result
+        
+        self._report_probes(results)
         return results
     
+    def _report_probes(self, results: Dict[str, Dict]):
+        """Print the connection test results as a table."""
+        def seconds(value: Optional[float]) -> str:
+            return f"{value * 1000:.0f} ms" if value is not None else "-"
+        
+        table = Table(title="🧪 Provider health")
+        table.add_column("Provider", style="bold")
+        table.add_column("Status")
+        table.add_column("Latency", justify="right")
+        table.add_column("TTFB", justify="right")
+        table.add_column("Probe", style="dim")
+        table.add_column("Quota / error")
+        
+        for name, result in results.items():
+            status = "✅ OK" if result['ok'] else "❌ Failed"
+            if result.get('status'):
+                status += f" ({result['status']})"
+            
+            if result['ok']:
+                quota = result.get('quota') or {}
+                detail = "\n".join(f"{header}: {value}" for header, value in quota.items()) or "-"
+            else:
+                detail = Text(result.get('error') or "unknown error", style="red")
+            
+            table.add_row(name, status, seconds(result.get('latency')), seconds(result.get('ttfb')),
+                          result.get('probe', '-'), detail)
+        console.print(table)
+    
     def generate_single_article(self, title: str, description: str = "", provider: str = None) -> Dict:
         """Generate a single article."""
-        # Choose provider
-        if not provider:
-            provider = os.getenv('DEFAULT_AI_PROVIDER', 'gemini')
+        if self.dispatch != 'single':
+            # Hedging and racing need cancellable requests, so they run on the async clients
+            result = self.run_async(self._agenerate_article(title, description, provider))
+        else:
+            result = self._generate_article(title, description, provider, show_status=True)
+        return self._settle_save(result)
+    
+    def _generate_article(self, title: str, description: str = "", provider: str = None,
+                          show_status: bool = False, journal_key: Optional[str] = None) -> Optional[Dict]:
+        """Generate, render and save one article; returns None on failure."""
+        self._journal_record(journal_key, 'in_flight')
+        try:
+            with self._assign_provider(provider) as provider:
+                if show_status:
+                    console.print(f"📝 Generating article with {provider.title()}...", style="blue")
+                
+                # Generate article
+                if show_status:
+                    with console.status(f"Generating '{title}'..."):
+                        article_data = self._fetch_article(provider, title, description)
+                else:
+                    article_data = self._fetch_article(provider, title, description)
+            
+            return self._finalize_article(article_data, provider, journal_key=journal_key)
         
-        if provider not in self.clients:
-            available = list(self.clients.keys())
-            console.print(f"❌ Provider '{provider}' not available. Using '{available[0]}'", style="yellow")
-            provider = available[0]
+        except Exception as e:
+            self.logger.error(f"Error generating article '{title}': {e}")
+            console.print(f"❌ Failed to generate '{title}': {e}", style="red")
+            self._journal_record(journal_key, 'failed', error=str(e))
+            return None
+    
+    def _fetch_article(self, provider: str, title: str, description: str) -> Dict:
+        """Client response for one article, from the cache or the provider."""
+        client = self.clients[provider]
+        cache_key = self._cache_key(client, title, description)
+        article_data = self.cache.get(cache_key)
+        if article_data is not None:
+            article_data['metrics'] = self.metrics.record_cache_hit(provider)
+            return article_data
+        
+        started = time.monotonic()
+        try:
+            if self.long_form:
+                article_data = self.long_form.write(client, title, description)
+            else:
+                article_data = client.generate_article(title, description)
+        except Exception:
+            self._record_request(provider, started, success=False)
+            raise
+        usage = article_data.pop('usage', None)
         
+        self._cache_store(cache_key, article_data)
+        article_data['metrics'] = self._record_request(provider, started, usage)
+        return article_data
+    
+    async def _afetch_article(self, provider: str, title: str, description: str) -> Dict:
+        """Async variant of _fetch_article."""
         client = self.clients[provider]
+        cache_key = self._cache_key(client, title, description)
+        # The cache reads, writes and evicts on disk; keep that off the event loop
+        article_data = await asyncio.to_thread(self.cache.get, cache_key)
+        if article_data is not None:
+            article_data['metrics'] = self.metrics.record_cache_hit(provider)
+            return article_data
         
-        console.print(f"📝 Generating article with {provider.title()}...", style="blue")
+        started = time.monotonic()
+        try:
+            if self.long_form:
+                article_data = await self.long_form.awrite(client, title, description)
+            else:
+                article_data = await client.agenerate_article(title, description)
+        except asyncio.CancelledError:
+            self._record_cancelled(provider, started, client, title, description)
+            raise
+        except Exception:
+            self._record_request(provider, started, success=False)
+            raise
+        usage = article_data.pop('usage', None)
+        
+        # Recorded before the cache write, so a hedge loser cancelled during it still counts
+        metrics = self._record_request(provider, started, usage)
+        await asyncio.to_thread(self._cache_store, cache_key, article_data)
+        article_data['metrics'] = metrics
+        return article_data
+    
+    def _record_request(self, provider: str, started: float, usage: Optional[Dict] = None,
+                        success: bool = True, ttfb: Optional[float] = None) -> Dict:
+        """Feed one finished request into the latency tracker and metrics; returns its metrics."""
+        latency = time.monotonic() - started
+        self.latency.record(provider, latency, success=success)
+        if ttfb is None and usage:
+            ttfb = usage.get('ttfb')
+        return self.metrics.record(provider, latency, ttfb, usage, success)
+    
+    def _record_cancelled(self, provider: str, started: float, client, title: str, description: str):
+        """
+        Account for a request abandoned after another provider won.
+        
+        Its elapsed time is a lower bound on the provider's latency and is kept
+        as a censored sample; dropping it would hide the slow tail and pull the
+        hedge deadline down. The prompt has already been sent and is billed, so
+        its tokens are estimated and counted too.
+        """
+        self.latency.record(provider, time.monotonic() - started, censored=True)
+        fingerprint = client.request_fingerprint(title, description)
+        usage = {
+            'model': fingerprint.get('model'),
+            'prompt_tokens': len(fingerprint.get('prompt', '')) // 4,
+            'estimated': True
+        }
+        self.metrics.record(provider, usage=usage, cancelled=True)
+    
+    async def _afetch_first(self, title: str, description: str, providers: List[str],
+                            delay: float) -> Tuple[str, Dict]:
+        """
+        Send the article to providers in turn, starting the next one whenever
+        nothing has succeeded within `delay` seconds (0 starts them all at once).
+        
+        The first successful response wins and the remaining requests are
+        cancelled, which closes their connections. The cancelled requests are
+        awaited so their elapsed time and usage are recorded before returning.
+        
+        Returns:
+            (winning provider, client response)
+        """
+        tasks = {}
+        errors = []
+        
+        def first_success(done) -> Optional[Tuple[str, Dict]]:
+            for task in done:
+                if task.exception() is None:
+                    return tasks[task], task.result()
+                errors.append(f"{tasks[task]}: {task.exception()}")
+            return None
+        
+        if delay <= 0 and len(providers) > 1:
+            self.logger.info(f"Racing '{title}' across {', '.join(providers)}")
         
         try:
-            # Generate article
-            with console.status(f"Generating '{title}'..."):
-                article_data = client.generate_article(title, description)
-            
-            # Add metadata
-            article_data.update({
-                'generated_at': datetime.now().isoformat(),
-                'provider': provider,
-                'author': os.getenv('BLOG_AUTHOR', 'AI Blog Generator'),
-                'website': os.getenv('BLOG_WEBSITE', 'https://yourblog.com')
-            })
-            
-            # Convert markdown to HTML
-            article_data['content_html'] = markdown.markdown(
-                article_data['content'],
-                extensions=['codehilite', 'fenced_code', 'tables', 'toc']
-            )
+            pending = set()
+            for index, provider in enumerate(providers):
+                task = asyncio.ensure_future(self._afetch_article(provider, title, description))
+                tasks[task] = provider
+                pending.add(task)
+                
+                if index == len(providers) - 1:
+                    break
+                
+                done, pending = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                winner = first_success(done)
+                if winner:
+                    return winner
+                if pending and delay > 0:
+                    self.logger.info(f"Hedging '{title}' to {providers[index + 1]} after {delay:.1f}s")
             
-            # Save article
-            self._save_article(article_data)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = first_success(done)
+                if winner:
+                    return winner
             
-            console.print(f"✅ Generated: {title}", style="green")
-            return article_data
+            raise ProviderError('hedge', "All providers failed: " + "; ".join(errors))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _hedge_delay(self, provider: str) -> float:
+        """Deadline before hedging: the provider's observed p95 latency once known."""
+        min_samples = max(1, int(os.getenv('HEDGE_MIN_SAMPLES', 5)))
+        if self.latency.count(provider) >= min_samples:
+            observed = self.latency.percentile(provider, float(os.getenv('HEDGE_PERCENTILE', 95)))
+            if observed is not None:
+                return observed
+        return float(os.getenv('HEDGE_DELAY', 30.0))
+    
+    def _dispatch_order(self, provider: str) -> List[str]:
+        """Primary provider first, then the rest fastest-first by median latency."""
+        others = [name for name in self.clients if name != provider]
+        others.sort(key=lambda name: self.latency.percentile(name, 50) or float('inf'))
+        if self.dispatch == 'hedge':
+            others = others[:1]
+        return [provider] + others
+    
+    def stream_single_article(self, title: str, description: str = "", provider: str = None) -> Optional[Dict]:
+        """
+        Generate a single article, rendering the Markdown live as it streams in.
+        
+        Press Ctrl-C to abort a bad generation early; the stream is closed so no
+        further tokens are consumed, and nothing is saved.
+        """
+        provider = self._resolve_provider(provider)
+        client = self.clients[provider]
+        
+        cache_key = self._cache_key(client, title, description)
+        article_data = self.cache.get(cache_key)
+        if article_data is not None:
+            console.print("♻️ Using cached response", style="cyan")
+            article_data['metrics'] = self.metrics.record_cache_hit(provider)
+            return self._settle_save(self._finalize_article(article_data, provider))
+        
+        console.print(f"📝 Streaming article from {provider.title()} (Ctrl-C to abort)...", style="blue")
+        
+        # Only streaming needs the live view, and rich.markdown is slow to import
+        from rich.live import Live
+        
+        parser = StreamingContentParser()
+        started = time.monotonic()
+        ttfb = None
+        stream = client.stream_article(title, description)
+        
+        try:
+            with Live(Text("Waiting for first token..."), console=console, refresh_per_second=8) as live:
+                for chunk in stream:
+                    if ttfb is None:
+                        ttfb = time.monotonic() - started
+                    parser.feed(chunk)
+                    live.update(self._stream_view(parser))
+                parser.close()
+        except KeyboardInterrupt:
+            console.print(f"⏹️ Aborted '{title}' after {len(parser.text)} characters; nothing saved", style="yellow")
+            return None
+        except Exception as e:
+            self._record_request(provider, started, success=False)
+            self.logger.error(f"Error streaming article '{title}': {e}")
+            console.print(f"❌ Failed to generate '{title}': {e}", style="red")
+            return None
+        finally:
+            stream.close()
+        
+        if not parser.text.strip():
+            console.print(f"❌ Failed to generate '{title}': empty response", style="red")
+            return None
+        
+        article_data = client.build_article(title, parser.text, parser.sections())
+        self._cache_store(cache_key, article_data)
+        
+        # Streams carry no usage block, so token counts are estimated from the text
+        fingerprint = client.request_fingerprint(title, description)
+        usage = {
+            'model': fingerprint.get('model'),
+            'prompt_tokens': len(fingerprint.get('prompt', '')) // 4,
+            'completion_tokens': len(parser.text) // 4,
+            'estimated': True
+        }
+        article_data['metrics'] = self._record_request(provider, started, usage, ttfb=ttfb)
+        return self._settle_save(self._finalize_article(article_data, provider))
+    
+    def _stream_view(self, parser: StreamingContentParser):
+        """Renderable for the live view: the tail of the article body once it starts."""
+        if parser.current_section != 'content':
+            section = (parser.current_section or 'preamble').replace('_', ' ')
+            return Text(f"Receiving {section}... ({len(parser.text)} characters)", style="cyan")
+        
+        from rich.markdown import Markdown
+        
+        # Only the last screenful is shown so the live region never overflows
+        lines = parser.section_text('content').splitlines()
+        visible = max(5, console.height - 4)
+        return Markdown("\n".join(lines[-visible:]))
+    
+    async def _agenerate_article(self, title: str, description: str = "", provider: str = None,
+                                 journal_key: Optional[str] = None) -> Optional[Dict]:
+        """Async variant of _generate_article; also handles hedged and raced dispatch."""
+        self._journal_record(journal_key, 'in_flight')
+        try:
+            with self._assign_provider(provider) as provider:
+                if self.dispatch == 'single' or len(self.clients) == 1:
+                    article_data = await self._afetch_article(provider, title, description)
+                else:
+                    delay = self._hedge_delay(provider) if self.dispatch == 'hedge' else 0.0
+                    provider, article_data = await self._afetch_first(
+                        title, description, self._dispatch_order(provider), delay
+                    )
             
+            # Render and queue the files off the event loop so other requests keep
+            # flowing (submit blocks while the writer queue is full)
+            content_html = await asyncio.wrap_future(self.renderer.submit_markdown(article_data['content']))
+            return await asyncio.to_thread(self._finalize_article, article_data, provider, content_html, journal_key)
+        
         except Exception as e:
             self.logger.error(f"Error generating article '{title}': {e}")
             console.print(f"❌ Failed to generate '{title}': {e}", style="red")
+            self._journal_record(journal_key, 'failed', error=str(e))
             return None
     
-    def generate_batch_articles(self, article_list: List[Dict], provider: str = None) -> List[Dict]:
-        """Generate multiple articles from a list."""
-        console.print(f"\n🚀 Generating {len(article_list)} articles...", style="blue bold")
+    def _cache_key(self, client, title: str, description: str) -> str:
+        """Cache key covering provider, model, full prompt and generation parameters."""
+        fingerprint = client.request_fingerprint(title, description)
+        if self.long_form:
+            fingerprint['long_form'] = self.long_form.settings()
+        return ResponseCache.make_key(fingerprint)
+    
+    def _cache_store(self, cache_key: str, article_data: Dict):
+        """Cache a client response."""
+        self.cache.put(cache_key, dict(article_data))
+    
+    def generate_offline_batch(self, article_list: List[Dict], wait: bool = True) -> List[Dict]:
+        """
+        Generate articles through the OpenAI Batch API instead of one request per article.
+        
+        Batch jobs finish within 24 hours at a lower price per token and
+        outside the per-minute rate limits, which suits large, non-urgent
+        backlogs. Results go through the normal parse/render/save pipeline.
+        
+        Args:
+            article_list: Dicts with 'title' and optional 'description'
+            wait: Poll until the batch finishes; otherwise return after submitting
+        
+        Returns:
+            Successfully generated articles (empty when not waiting)
+        """
+        client = self.clients.get('chatgpt')
+        if client is None or not hasattr(client, 'submit_batch'):
+            console.print("❌ Batch mode needs the ChatGPT client (set OPENAI_API_KEY)", style="red")
+            return []
+        
+        article_list = self._dedupe_batch(self._journal_batch(article_list))
+        if not article_list:
+            return []
+        
+        batch_ids = []
+        for start in range(0, len(article_list), client.BATCH_MAX_REQUESTS):
+            chunk = article_list[start:start + client.BATCH_MAX_REQUESTS]
+            items = {f"article-{start + i}": article for i, article in enumerate(chunk)}
+            batch_id = client.submit_batch([
+                (custom_id, article.get('title', ''), article.get('description', ''))
+                for custom_id, article in items.items()
+            ])
+            atomic_write(self._batch_state_path(batch_id), json.dumps({
+                'batch_id': batch_id,
+                'submitted_at': datetime.now().isoformat(),
+                'run_id': self.journal.run_id if self.journal else None,
+                'items': items
+            }, ensure_ascii=False))
+            for article in chunk:
+                self._journal_record(self._journal_key(article), 'in_flight', batch_id=batch_id)
+            
+            console.print(f"📦 Submitted batch {batch_id} with {len(chunk)} articles "
+                          f"(collect later with --collect-batch {batch_id})", style="blue")
+            batch_ids.append(batch_id)
+        
+        if not wait:
+            return []
         
         results = []
+        for batch_id in batch_ids:
+            results.extend(self.collect_offline_batch(batch_id))
+        return results
+    
+    def collect_offline_batch(self, batch_id: str) -> List[Dict]:
+        """Wait for a submitted batch to finish, then render and save its articles."""
+        client = self.clients.get('chatgpt')
+        state_path = self._batch_state_path(batch_id)
+        if client is None or not state_path.exists():
+            console.print(f"❌ Unknown batch '{batch_id}' or ChatGPT client unavailable", style="red")
+            return []
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('run_id') and not self.journal:
+            try:
+                self.journal = RunJournal.open(state['run_id'])
+            except FileNotFoundError:
+                pass
+        
+        poll_seconds = float(os.getenv('BATCH_POLL_SECONDS', 30))
+        try:
+            with console.status(f"Waiting for batch {batch_id}...") as status_display:
+                while True:
+                    status = client.batch_status(batch_id)
+                    if status['status'] in ('completed', 'failed', 'expired', 'cancelled'):
+                        break
+                    status_display.update(
+                        f"Batch {batch_id}: {status['status']}, "
+                        f"{status['completed'] + status['failed']}/{status['total']} done"
+                    )
+                    time.sleep(poll_seconds)
+        except KeyboardInterrupt:
+            console.print(f"\n⏸️ Batch {batch_id} keeps running remotely; collect it with --collect-batch {batch_id}",
+                          style="yellow")
+            raise
+        
+        items = state['items']
+        # Cancelled and expired batches keep whatever finished before they stopped in a
+        # partial output file; batch_results skips the file ids a batch does not have
+        outputs = client.batch_results(status)
+        if status['status'] != 'completed':
+            console.print(f"⚠️ Batch {batch_id} ended as '{status['status']}' "
+                          f"({len(outputs)}/{len(state['items'])} results returned)", style="yellow")
+        
+        console.print(f"\n🚀 Saving {len(items)} batch articles...", style="blue bold")
+        results = []
+        for custom_id, article_info in items.items():
+            title = article_info.get('title', '')
+            description = article_info.get('description', '')
+            journal_key = self._journal_key(article_info)
+            output = outputs.get(custom_id, {'error': f"no result (batch {status['status']})"})
+            
+            if 'error' in output:
+                console.print(f"❌ Failed to generate '{title}': {output['error']}", style="red")
+                self._journal_record(journal_key, 'failed', error=output['error'])
+                self.metrics.record('chatgpt', success=False)
+                continue
+            
+            try:
+                article_data = client.build_article(title, output['content'])
+                self._cache_store(self._cache_key(client, title, description), article_data)
+                article_data['metrics'] = self.metrics.record(
+                    'chatgpt', usage=output.get('usage'), discount=client.BATCH_PRICE_DISCOUNT
+                )
+                article_data = self._finalize_article(article_data, 'chatgpt', journal_key=journal_key)
+            except Exception as e:
+                self.logger.error(f"Error saving batch article '{title}': {e}")
+                self._journal_record(journal_key, 'failed', error=str(e))
+                continue
+            results.append(article_data)
+        
+        results = self._settle_saves(results)
+        console.print(f"\n✅ Successfully generated {len(results)}/{len(items)} articles!", style="green bold")
+        self._report_metrics()
+        # Every result has been consumed; failures are in the run journal for --resume
+        state_path.unlink()
+        return results
+    
+    @staticmethod
+    def _batch_state_path(batch_id: str) -> Path:
+        batch_dir = Path(os.getenv('BATCH_DIR', '.cache/batches'))
+        batch_dir.mkdir(parents=True, exist_ok=True)
+        return batch_dir / f"{batch_id}.json"
+    
+    def start_run(self, meta: Dict) -> RunJournal:
+        """Journal the following batches so the run can be resumed with --resume."""
+        self.journal = RunJournal.create(meta)
+        console.print(f"📒 Run {self.journal.run_id} (resume with --resume {self.journal.run_id})", style="cyan")
+        return self.journal
+    
+    def resume_run(self, run_id: str, provider: str = None, concurrency: int = 1, use_async: bool = False) -> int:
+        """
+        Continue a journaled run: completed items are skipped, failed and unfinished ones retried.
+        
+        Returns:
+            Number of articles generated
+        """
+        try:
+            self.journal = RunJournal.open(run_id)
+        except FileNotFoundError:
+            console.print(f"❌ Unknown run '{run_id}'", style="red")
+            return 0
+        
+        meta = self.journal.meta
+        provider = provider or meta.get('provider')
+        counts = self.journal.counts()
+        console.print(
+            f"📒 Resuming run {run_id}: {counts['done']} done, {counts['failed']} failed, "
+            f"{counts['pending'] + counts['in_flight']} unfinished", style="cyan"
+        )
+        
+        if meta.get('input'):
+            # Completed items are skipped by the journal while the file is streamed again
+            try:
+                return self.generate_from_file(meta['input'], provider, concurrency, meta.get('offset', 0), use_async)
+            except (OSError, ValueError) as e:
+                console.print(f"❌ Cannot resume run '{run_id}' from its input {meta['input']}: {e}", style="red")
+                return 0
+        
+        article_list = self.journal.unfinished()
+        if use_async or self.dispatch != 'single':
+            return len(self.run_async(self.agenerate_batch_articles(article_list, provider, concurrency)))
+        return len(self.generate_batch_articles(article_list, provider, concurrency))
+    
+    def _journal_key(self, article: Dict) -> Optional[str]:
+        return self.journal.item_key(article) if self.journal else None
+    
+    def _journal_record(self, key: Optional[str], state: str, **fields):
+        if self.journal and key:
+            self.journal.record(key, state, **fields)
+    
+    def _journal_batch(self, article_list: List[Dict]) -> List[Dict]:
+        """Register a batch with the run journal, dropping items a previous attempt completed."""
+        if not self.journal:
+            return article_list
+        
+        remaining = []
+        for article in article_list:
+            key = self.journal.add(article)
+            if self.journal.state(key) not in ('done', 'skipped'):
+                remaining.append(article)
+        
+        if len(remaining) < len(article_list):
+            console.print(f"⏭️ {len(article_list) - len(remaining)} article(s) already completed in this run",
+                          style="cyan")
+        return remaining
+    
+    def _dedupe_batch(self, article_list: List[Dict]) -> List[Dict]:
+        """Drop (or just flag) titles that duplicate the archive or an earlier batch entry."""
+        if self.dedup_mode == 'off' or not article_list:
+            return article_list
+        
+        with self._title_index_lock:
+            if self._title_index is None:
+                # Imported here because it loads NumPy, which only batches need
+                from pipeline.dedup import TitleDeduplicator
+                
+                # Signed once per session: later batches (e.g. every --input chunk) reuse it,
+                # and saved articles are added as they land, so duplicates across chunks are caught
+                self._title_index = TitleDeduplicator(self.dedup_threshold)
+                self._title_index.add_many((title, Path(json_path).stem) for title, json_path in self.catalog.titles())
+            # Batch entries are indexed in a copy, so a title that fails to generate can be retried
+            deduplicator = self._title_index.copy()
+        unique, duplicates = deduplicator.partition(article_list)
+        if not duplicates:
+            return article_list
+        
+        table = Table(title=f"🔁 {len(duplicates)} duplicate topic(s) (similarity ≥ {deduplicator.threshold:.2f})")
+        table.add_column("Title", style="bold")
+        table.add_column("Duplicates")
+        table.add_column("Similarity", justify="right")
+        for article, ref, similarity in duplicates:
+            table.add_row(article.get('title', ''), ref, f"{similarity:.2f}")
+        console.print(table)
+        
+        if self.dedup_mode == 'flag':
+            console.print("⚠️ Generating them anyway (--dedup flag)", style="yellow")
+            return article_list
+        
+        console.print(f"⏭️ Skipping {len(duplicates)} duplicate(s); use --dedup off to generate them", style="yellow")
+        for article, ref, similarity in duplicates:
+            self._journal_record(self._journal_key(article), 'skipped', duplicate_of=ref)
+        return unique
+    
+    def _report_cache_stats(self, before: Dict):
+        """Print cache hits/misses accumulated since the `before` snapshot."""
+        if not self.cache.enabled:
+            return
+        hits = self.cache.stats['hits'] - before['hits']
+        misses = self.cache.stats['misses'] - before['misses']
+        console.print(f"♻️ Response cache: {hits} hits, {misses} misses", style="cyan")
+    
+    def _report_metrics(self):
+        """Print per-provider request, token, latency and cost totals for this session."""
+        if self.metrics.empty:
+            return
+        
+        def seconds(value: Optional[float]) -> str:
+            return f"{value:.2f}s" if value is not None else "-"
+        
+        table = Table(title="📊 Provider metrics (this session)")
+        table.add_column("Provider", style="bold")
+        for column in ("Requests", "Failed", "Retries", "Cached", "Tokens in/out",
+                       "Latency p50/p95", "TTFB p50", "Est. cost"):
+            table.add_column(column, justify="right")
+        
+        for row in self.metrics.summary():
+            table.add_row(
+                row['provider'], str(row['requests']), str(row['failures']), str(row['retries']),
+                str(row['cache_hits']), f"{row['tokens_in']:,}/{row['tokens_out']:,}",
+                f"{seconds(row['latency_p50'])}/{seconds(row['latency_p95'])}", seconds(row['ttfb_p50']),
+                f"${row['cost_usd']:.4f}"
+            )
+        console.print(table)
+    
+    def _export_metrics(self):
+        """Write the session's metrics to --metrics-out: JSON for *.json, Prometheus text otherwise."""
+        if not self.metrics_out or self.metrics.empty:
+            return
+        path = Path(self.metrics_out)
+        text = self.metrics.to_json() if path.suffix == '.json' else self.metrics.to_prometheus()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, text)
+            console.print(f"📊 Metrics written to {path}", style="cyan")
+        except OSError as e:
+            self.logger.warning(f"Could not write metrics to {path}: {e}")
+    
+    def _assign_provider(self, provider: Optional[str]):
+        """Context manager yielding the provider for one article (scheduled or requested)."""
+        if self.scheduler:
+            return self.scheduler.assign()
+        return nullcontext(self._resolve_provider(provider))
+    
+    @staticmethod
+    def _provider_quota(client) -> Optional[float]:
+        """Configured requests/min for a client, if it has a rate limit."""
+        bucket = getattr(getattr(client, 'rate_limiter', None), 'request_bucket', None)
+        return bucket.rate * 60 if bucket else None
+    
+    def _report_provider_mix(self, results: List[Dict]):
+        """Print how a scheduled batch was spread across providers."""
+        if not self.scheduler or not results:
+            return
+        counts = {}
+        for article in results:
+            counts[article['provider']] = counts.get(article['provider'], 0) + 1
+        mix = ", ".join(f"{name} {count}" for name, count in sorted(counts.items()))
+        console.print(f"⚖️ Provider mix ({self.scheduler.strategy}): {mix}", style="cyan")
+    
+    def _seed_concurrency(self, provider: Optional[str], concurrency: int):
+        """Start the adaptive in-flight limit of the providers a batch uses at its --concurrency."""
+        if concurrency <= 1:
+            return
+        if provider in self.clients and not self.scheduler and self.dispatch == 'single':
+            names = [provider]
+        else:
+            names = list(self.clients)
+        
+        for name in names:
+            limiter = getattr(self.clients[name], 'rate_limiter', None)
+            if limiter is None:
+                continue
+            limit = limiter.concurrency.seed(concurrency)
+            if limit < concurrency and name not in self._concurrency_capped:
+                self._concurrency_capped.add(name)
+                console.print(
+                    f"⚠️ {name}: at most {limit} requests in flight for --concurrency {concurrency} "
+                    f"(raise {name.upper()}_MAX_CONCURRENCY to allow more)", style="yellow"
+                )
+    
+    def _resolve_provider(self, provider: Optional[str]) -> str:
+        """Pick the requested provider, falling back to the first available one."""
+        if not provider:
+            provider = os.getenv('DEFAULT_AI_PROVIDER', 'gemini')
+        
+        if provider not in self.clients:
+            available = list(self.clients.keys())
+            console.print(f"❌ Provider '{provider}' not available. Using '{available[0]}'", style="yellow")
+            provider = available[0]
+        
+        return provider
+    
+    def _finalize_article(self, article_data: Dict, provider: str, content_html: Optional[str] = None,
+                          journal_key: Optional[str] = None) -> Dict:
+        """Add metadata, render HTML (unless already rendered) and save a freshly generated article.
+        
+        The journal entry (journal_key) becomes 'done' only once the files are on disk.
+        """
+        # Add metadata
+        article_data.update({
+            'generated_at': datetime.now().isoformat(),
+            'provider': provider,
+            'author': os.getenv('BLOG_AUTHOR', 'AI Blog Generator'),
+            'website': os.getenv('BLOG_WEBSITE', 'https://yourblog.com')
+        })
+        if self.scheduler:
+            article_data['scheduler'] = self.scheduler.strategy
+        
+        # Convert markdown to HTML
+        if content_html is None:
+            # Waiting on the render pool releases the GIL for the other workers
+            content_html = self.renderer.submit_markdown(article_data['content']).result()
+        article_data['content_html'] = content_html
+        
+        # Save article
+        article_data['output_file'] = str(self._save_article(article_data, journal_key))
+        
+        console.print(f"✅ Generated: {article_data['title']}", style="green")
+        return article_data
+    
+    def generate_batch_articles(self, article_list: List[Dict], provider: str = None,
+                                concurrency: int = 1) -> List[Dict]:
+        """
+        Generate multiple articles from a list.
+        
+        Args:
+            article_list: Dicts with 'title' and optional 'description'
+            provider: AI provider to use for every article
+            concurrency: Number of articles generated at once (1 = sequential)
+        
+        Returns:
+            Successfully generated articles, in input order
+        """
+        if self.dispatch != 'single':
+            # Hedging and racing need cancellable requests, so they run on the async clients
+            return self.run_async(self.agenerate_batch_articles(article_list, provider, concurrency))
+        
+        article_list = self._dedupe_batch(self._journal_batch(article_list))
+        self._seed_concurrency(provider, concurrency)
+        console.print(f"\n🚀 Generating {len(article_list)} articles...", style="blue bold")
+        
+        cache_stats = dict(self.cache.stats)
+        results = [None] * len(article_list)
         
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console
         ) as progress:
+        
+            task = progress.add_task("Generating articles...", total=len(article_list))
             
+            if concurrency <= 1:
+                for i, article_info in enumerate(article_list):
+                    title = article_info.get('title', '')
+                    description = article_info.get('description', '')
+                    
+                    progress.update(task, description=f"[{i + 1}/{len(article_list)}] {title[:50]}...")
+                    
+                    results[i] = self._generate_article(title, description, provider,
+                                                        journal_key=self._journal_key(article_info))
+                    progress.advance(task)
+            else:
+                # Provider calls are network-bound, so a bounded thread pool
+                # overlaps the round-trips without changing the output order.
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    futures = {
+                        executor.submit(
+                            self._generate_article,
+                            article_info.get('title', ''),
+                            article_info.get('description', ''),
+                            provider,
+                            journal_key=self._journal_key(article_info)
+                        ): i
+                        for i, article_info in enumerate(article_list)
+                    }
+                    
+                    for done, future in enumerate(as_completed(futures), 1):
+                        i = futures[future]
+                        title = article_list[i].get('title', '')
+                        results[i] = future.result()
+                        
+                        progress.update(task, description=f"[{done}/{len(article_list)}] {title[:50]}...")
+                        progress.advance(task)
+        
+        results = self._settle_saves(results)
+        console.print(f"\n✅ Successfully generated {len(results)}/{len(article_list)} articles!", style="green bold")
+        self._report_cache_stats(cache_stats)
+        self._report_provider_mix(results)
+        self._report_metrics()
+        return results
+    
+    async def agenerate_batch_articles(self, article_list: List[Dict], provider: str = None,
+                                       concurrency: int = 1) -> List[Dict]:
+        """
+        Generate multiple articles from a single asyncio event loop.
+        
+        Unlike the thread pool used by generate_batch_articles, every in-flight
+        request is a coroutine, so hundreds can be driven from one thread.
+        
+        Args:
+            article_list: Dicts with 'title' and optional 'description'
+            provider: AI provider to use for every article
+            concurrency: Maximum number of in-flight requests
+        
+        Returns:
+            Successfully generated articles, in input order
+        """
+        article_list = self._dedupe_batch(self._journal_batch(article_list))
+        self._seed_concurrency(provider, concurrency)
+        console.print(f"\n🚀 Generating {len(article_list)} articles (async)...", style="blue bold")
+        
+        cache_stats = dict(self.cache.stats)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run_one(i: int, article_info: Dict):
+            async with semaphore:
+                result = await self._agenerate_article(
+                    article_info.get('title', ''),
+                    article_info.get('description', ''),
+                    provider,
+                    journal_key=self._journal_key(article_info)
+                )
+            return i, result
+        
+        results = [None] * len(article_list)
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        ) as progress:
+        
             task = progress.add_task("Generating articles...", total=len(article_list))
             
-            for i, article_info in enumerate(article_list, 1):
-                title = article_info.get('title', '')
-                description = article_info.get('description', '')
-                
-                progress.update(task, description=f"[{i}/{len(article_list)}] {title[:50]}...")
-                
-                result = self.generate_single_article(title, description, provider)
-                if result:
-                    results.append(result)
-                
-                progress.advance(task)
+            tasks = [asyncio.ensure_future(run_one(i, info)) for i, info in enumerate(article_list)]
+            try:
+                for done, next_result in enumerate(asyncio.as_completed(tasks), 1):
+                    i, result = await next_result
+                    results[i] = result
+                    
+                    title = article_list[i].get('title', '')
+                    progress.update(task, description=f"[{done}/{len(article_list)}] {title[:50]}...")
+                    progress.advance(task)
+            finally:
+                # Cancel whatever is still in flight (e.g. on Ctrl-C or timeout)
+                for pending in tasks:
+                    pending.cancel()
         
+        results = await self._asettle_saves(results)
         console.print(f"\n✅ Successfully generated {len(results)}/{len(article_list)} articles!", style="green bold")
+        self._report_cache_stats(cache_stats)
+        self._report_provider_mix(results)
+        self._report_metrics()
         return results
     
-    def _save_article(self, article_data: Dict):
-        """Save article to files."""
+    def generate_from_file(self, input_path: str, provider: str = None, concurrency: int = 1,
+                           offset: int = 0, use_async: bool = False, chunk_size: Optional[int] = None) -> int:
+        """
+        Generate articles listed in a JSON, JSONL or CSV file.
+        
+        The file is streamed in chunks through the batch pipeline, so only one
+        chunk of requests is in memory at a time.
+        
+        Args:
+            input_path: Input file
+            provider: AI provider to use for every article
+            concurrency: Number of articles generated at once
+            offset: Number of records to skip (to resume an interrupted run)
+            use_async: Drive requests from one asyncio event loop
+            chunk_size: Records per batch (default: 10x concurrency, at least 100)
+        
+        Returns:
+            Number of articles generated
+        """
+        if use_async or self.dispatch != 'single':
+            return self.run_async(self.agenerate_from_file(input_path, provider, concurrency, offset, chunk_size))
+        
+        position = offset
+        total = 0
+        try:
+            for chunk in chunked(read_articles(input_path, offset), chunk_size or max(100, concurrency * 10)):
+                console.print(f"\n📥 Records from {chunk[0][0]} of {Path(input_path).name}", style="cyan")
+                articles = [article for _, article in chunk]
+                total += len(self.generate_batch_articles(articles, provider, concurrency))
+                position = chunk[-1][0] + 1
+        except KeyboardInterrupt:
+            self._report_input_resume(input_path, position)
+            raise
+        return total
+    
+    async def agenerate_from_file(self, input_path: str, provider: str = None, concurrency: int = 1,
+                                  offset: int = 0, chunk_size: Optional[int] = None) -> int:
+        """Async variant of generate_from_file; all chunks share one event loop."""
+        position = offset
+        total = 0
+        try:
+            for chunk in chunked(read_articles(input_path, offset), chunk_size or max(100, concurrency * 10)):
+                console.print(f"\n📥 Records from {chunk[0][0]} of {Path(input_path).name}", style="cyan")
+                articles = [article for _, article in chunk]
+                total += len(await self.agenerate_batch_articles(articles, provider, concurrency))
+                position = chunk[-1][0] + 1
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self._report_input_resume(input_path, position)
+            raise
+        return total
+    
+    def _report_input_resume(self, input_path: str, position: int):
+        console.print(
+            f"\n⏸️ Interrupted. Resume with: --input {input_path} --offset {position} "
+            f"(articles already saved from that chunk are skipped as duplicates)",
+            style="yellow"
+        )
+    
+    def _save_article(self, article_data: Dict, journal_key: Optional[str] = None) -> Path:
+        """Queue the article's JSON, Markdown and HTML files for the background writer.
+        
+        The article is added to the catalogue and journaled as 'done' once all
+        three files are on disk. If any of them fails, the others are removed
+        so the article is either saved completely or not at all, and the
+        journal records it as 'failed' for --resume; _settle_saves reports it.
+        
+        Returns:
+            Path of the article's JSON file
+        """
         # Create safe filename
-        safe_title = "".join(c for c in article_data['title'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        safe_title = safe_title.replace(' ', '_').lower()
+        safe_title = self._safe_title(article_data['title'])
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{safe_title}"
-        
-        # Save as JSON
-        json_file = self.output_dir / f"{filename}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(article_data, f, indent=2, ensure_ascii=False)
-        
-        # Save as Markdown
-        md_file = self.output_dir / f"{filename}.md"
-        with open(md_file, 'w', encoding='utf-8') as f:
-            f.write(f"# {article_data['title']}\n\n")
-            f.write(f"**Generated:** {article_data['generated_at']}\n")
-            f.write(f"**Provider:** {article_data['provider'].title()}\n")
-            f.write(f"**Tags:** {', '.join(article_data.get('tags', []))}\n\n")
-            if article_data.get('summary'):
-                f.write(f"**Summary:** {article_data['summary']}\n\n")
-            f.write("---\n\n")
-            f.write(article_data['content'])
-        
-        # Save as HTML using template
-        try:
-            template = self.jinja_env.get_template('blog_template.html')
-            html_content = template.render(
-                title=article_data['title'],
-                content_html=article_data['content_html'],
-                summary=article_data.get('summary', ''),
-                tags=article_data.get('tags', []),
-                meta_description=article_data.get('meta_description', ''),
-                author=article_data.get('author', 'AI Blog Generator'),
-                provider=article_data.get('provider', 'AI'),
-                date=datetime.now().strftime("%B %d, %Y"),
-                current_year=datetime.now().year,
-                url=f"#{safe_title}"
-            )
+        
+        # Snapshot so later changes by the caller cannot race the writer threads
+        article = dict(article_data)
+        files = {}
+        
+        def on_complete(error: Optional[BaseException]):
+            if error is not None:
+                for path in files:
+                    path.unlink(missing_ok=True)
+                self.logger.error(f"Error saving article '{article['title']}': {error}")
+                console.print(f"❌ Failed to save '{article['title']}': {error}", style="red")
+                self._journal_record(journal_key, 'failed', error=str(error))
+                return
+            try:
+                self.catalog.upsert(article, json_file, safe_title)
+            except sqlite3.Error as e:
+                self.logger.warning(f"Could not add '{article['title']}' to the catalogue: {e}")
+            with self._title_index_lock:
+                if self._title_index is not None:
+                    self._title_index.add(article['title'], json_file.stem)
+            self._journal_record(journal_key, 'done', provider=article['provider'], output_file=str(json_file))
+        
+        # Reserve the path and queue the files together, so an article with the
+        # same title saved in the same second cannot take (or overwrite) it
+        with self._saves_lock:
+            json_file = self._unique_json_path(f"{timestamp}_{safe_title}")
+            files.update({
+                json_file: lambda: json.dumps(article, indent=2, ensure_ascii=False),
+                json_file.with_suffix('.md'): lambda: self.renderer.markdown_page(article),
+                json_file.with_suffix('.html'): lambda: self.renderer.html_page(article, safe_title)
+            })
+            self._saves[str(json_file)] = self.writer.submit(files, on_complete)
+        return json_file
+    
+    def _unique_json_path(self, stem: str) -> Path:
+        """JSON path for stem, suffixed _2, _3, ... while it is queued or on disk (call with _saves_lock)."""
+        json_file = self.output_dir / f"{stem}.json"
+        count = 1
+        while str(json_file) in self._saves or any(
+                json_file.with_suffix(suffix).exists() for suffix in ('.json', '.md', '.html')):
+            count += 1
+            json_file = self.output_dir / f"{stem}_{count}.json"
+        return json_file
+    
+    def _settle_save(self, article_data: Optional[Dict]) -> Optional[Dict]:
+        """Wait for a generated article's files; returns None unless all of them were saved."""
+        if not article_data:
+            return None
+        path = article_data.get('output_file')
+        with self._saves_lock:
+            future = self._saves.get(path)
+        if future is None:
+            return article_data
+        # Keep the path reserved until its files are on disk (or removed)
+        failed = future.exception() is not None
+        with self._saves_lock:
+            self._saves.pop(path, None)
+        return None if failed else article_data
+    
+    def _settle_saves(self, results: List[Optional[Dict]]) -> List[Dict]:
+        """_settle_save for a batch; keeps the input order."""
+        return [result for result in map(self._settle_save, results) if result]
+    
+    async def _asettle_saves(self, results: List[Optional[Dict]]) -> List[Dict]:
+        """Async variant of _settle_saves that waits without blocking the event loop."""
+        pending = [self._saves[result['output_file']] for result in results
+                   if result and result.get('output_file') in self._saves]
+        if pending:
+            await asyncio.wait([asyncio.wrap_future(future) for future in pending])
+        return self._settle_saves(results)
+    
+    @staticmethod
+    def _safe_title(title: str) -> str:
+        """Filesystem- and URL-safe slug of an article title."""
+        safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        return safe_title.replace(' ', '_').lower()
+    
+    def rerender_articles(self, incremental: bool = False) -> int:
+        """Re-render the HTML and Markdown of stored articles from their JSON.
+        
+        Args:
+            incremental: Only re-render articles whose content, metadata, template or
+                renderer changed since the last build (tracked in a manifest)
+        
+        Returns:
+            Number of articles re-rendered
+        """
+        manifest = BuildManifest(self.output_dir / '.build_manifest')
+        markdown_fingerprint = self.renderer.markdown_fingerprint()
+        template_fingerprint = self.renderer.template_fingerprint()
+        fingerprints_match = (manifest.markdown_fingerprint == markdown_fingerprint and
+                              manifest.template_fingerprint == template_fingerprint)
+        
+        json_files = sorted(self.output_dir.glob('*.json'))
+        items, builds = [], []
+        for json_file in json_files:
+            outputs_exist = json_file.with_suffix('.md').exists() and json_file.with_suffix('.html').exists()
+            if (incremental and fingerprints_match and outputs_exist and
+                    manifest.unchanged_on_disk(json_file, json_file.stat())):
+                continue
+            
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    article = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Skipping unreadable article {json_file.name}: {e}")
+                continue
+            if not isinstance(article, dict):
+                self.logger.warning(f"Skipping unreadable article {json_file.name}: not a JSON object")
+                continue
+            missing = self.renderer.missing_fields(article)
+            if missing:
+                self.logger.warning(f"Skipping unreadable article {json_file.name}: missing {', '.join(missing)}")
+                continue
+            
+            content_hash = manifest.content_hash(article, markdown_fingerprint)
+            page_hash = manifest.page_hash(article, template_fingerprint)
+            entry = manifest.entry(json_file)
+            convert = not incremental or not entry or entry['content'] != content_hash
+            if incremental and outputs_exist and not convert and entry['page'] == page_hash:
+                # Touched but not changed: just refresh the recorded size/mtime
+                manifest.record(json_file, content_hash, page_hash)
+                continue
+            
+            items.append((article, self._safe_title(article['title']), convert))
+            builds.append((json_file, content_hash, page_hash))
+        
+        manifest.prune({json_file.name for json_file in json_files})
+        manifest.markdown_fingerprint = markdown_fingerprint
+        manifest.template_fingerprint = template_fingerprint
+        
+        if not items:
+            manifest.save()
+            if incremental and json_files:
+                console.print(f"✅ All {len(json_files)} articles are up to date", style="green")
+            else:
+                console.print("⚠️ No stored articles to re-render", style="yellow")
+            return 0
+        
+        processes = max(1, self.renderer.processes)
+        console.print(f"🔁 Re-rendering {len(items)}/{len(json_files)} articles with {processes} process(es)...",
+                      style="blue")
+        started = time.perf_counter()
+        failed_before = self.writer.stats['failed']
+        failed_builds = set()
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console
+        ) as progress:
+        
+            task = progress.add_task("Re-rendering articles...", total=len(items))
             
-            html_file = self.output_dir / f"{filename}.html"
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            rendered = self.renderer.render_articles(items)
+            for done, ((json_file, _, _), result) in enumerate(zip(builds, rendered), 1):
+                progress.advance(task)
+                if isinstance(result, Exception):
+                    # One bad article must not abort a full-site rebuild
+                    self.logger.warning(f"Skipping unrenderable article {json_file.name}: {result!r}")
+                    failed_builds.add(json_file)
+                    continue
                 
-        except Exception as e:
-            self.logger.warning(f"Could not generate HTML: {e}")
+                article, html, md = result
+                self.writer.submit({
+                    json_file: lambda article=article: json.dumps(article, indent=2, ensure_ascii=False),
+                    json_file.with_suffix('.md'): lambda md=md: md,
+                    json_file.with_suffix('.html'): lambda html=html: html
+                })
+                progress.update(task, description=f"[{done}/{len(items)}] {article['title'][:50]}...")
+        
+        self.writer.flush()
+        
+        # Only trust the manifest if every file was written; otherwise retry them next time
+        if self.writer.stats['failed'] == failed_before:
+            for json_file, content_hash, page_hash in builds:
+                if json_file not in failed_builds:
+                    manifest.record(json_file, content_hash, page_hash)
+        manifest.save()
+        
+        rendered_count = len(items) - len(failed_builds)
+        console.print(f"✅ Re-rendered {rendered_count} articles in {time.perf_counter() - started:.1f}s", style="green bold")
+        if failed_builds:
+            console.print(f"⚠️ {len(failed_builds)} articles could not be rendered; see the log", style="yellow")
+        return rendered_count
+    
+    def reindex_catalog(self):
+        """Bring the catalogue in line with the stored article files."""
+        counts = self.catalog.sync(self.output_dir, self._safe_title)
+        with self._title_index_lock:
+            self._title_index = None
+        console.print(f"🗂️ Catalogue updated: {counts['added']} added, {counts['removed']} removed", style="green")
+    
+    def list_articles(self, tag: Optional[str] = None, provider: Optional[str] = None,
+                      title: Optional[str] = None, since: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """Print catalogued articles matching the filters, newest first."""
+        rows = self.catalog.query(tag=tag, provider=provider, title=title, since=since, limit=limit)
+        
+        table = Table(title=f"📚 Articles ({len(rows)})")
+        table.add_column("Generated", style="dim")
+        table.add_column("Title", style="bold")
+        table.add_column("Provider")
+        table.add_column("Tags", style="cyan")
+        table.add_column("Words", justify="right")
+        table.add_column("File", style="dim")
+        for row in rows:
+            table.add_row((row['generated_at'] or '')[:16], row['title'], row['provider'] or '',
+                          row['tags'] or '', str(row['word_count']), Path(row['json_path']).stem)
+        console.print(table)
+        return rows
+    
+    def search_articles(self, text: str, limit: int = 20) -> List[Dict]:
+        """Print the best full-text matches for text."""
+        rows = self.catalog.search(text, limit)
+        
+        table = Table(title=f"🔍 '{text}' ({len(rows)} matches)")
+        table.add_column("Title", style="bold")
+        table.add_column("Provider")
+        table.add_column("Match")
+        table.add_column("File", style="dim")
+        for row in rows:
+            match = " ".join((row.get('snippet') or row['summary'] or '').split())
+            table.add_row(row['title'], row['provider'] or '', match, Path(row['json_path']).stem)
+        console.print(table)
+        return rows
     
-    def interactive_mode(self):
+    def interactive_mode(self, concurrency: int = 1):
         """Interactive mode for article generation."""
         console.print("\n🎯 Interactive Article Generation Mode", style="blue bold")
         
@@ -252,7 +1441,7 @@ class BlogGenerator:
             title = Prompt.ask("Article title")
             if not title:
                 break
-                
+            
             description = Prompt.ask("Description/requirements (optional)", default="")
             
             articles.append({
@@ -273,7 +1462,7 @@ class BlogGenerator:
                 provider = available_providers[0]
             
             # Generate articles
-            self.generate_batch_articles(articles, provider)
+            self.generate_batch_articles(articles, provider, concurrency)
         else:
             console.print("No articles to generate.", style="yellow")
 
@@ -322,51 +1511,204 @@ def load_sample_articles():
         }
     ]
 
+def print_usage_hint():
+    """Default output when no action was requested."""
+    console.print("\n🎯 Choose an option:", style="yellow bold")
+    console.print("1. Run with --interactive for step-by-step article creation")
+    console.print("2. Run with --sample to generate 10 sample programming articles")
+    console.print("3. Run with --test to test API connections")
+    console.print("4. Run with --title 'Your Title' for single article generation")
+    console.print("\nExample: python blog_generator.py --sample --provider gemini")
+
 @click.command()
-@click.option('--provider', type=click.Choice(['gemini', 'perplexity', 'chatgpt']), help='AI provider to use')
+@click.option('--provider', help='AI provider to use: gemini, perplexity, chatgpt or a PROVIDER_PLUGINS provider')
 @click.option('--interactive', '-i', is_flag=True, help='Interactive mode')
 @click.option('--sample', is_flag=True, help='Generate sample articles')
-@click.option('--test', is_flag=True, help='Test API connections')
+@click.option('--test', is_flag=True,
+              help='Probe every provider concurrently; exits 1 if any is unhealthy')
+@click.option('--test-timeout', type=click.FloatRange(min=0, min_open=True),
+              help='Seconds per --test probe (default: HEALTH_CHECK_TIMEOUT or 10)')
+@click.option('--health-out', type=click.Path(dir_okay=False),
+              help='With --test: also write the results to this JSON file')
 @click.option('--title', help='Single article title')
 @click.option('--description', help='Single article description')
-def main(provider, interactive, sample, test, title, description):
+@click.option('--input', 'input_file', type=click.Path(exists=True, dir_okay=False),
+              help=f"Generate the articles listed in a file ({', '.join(SUPPORTED_SUFFIXES)})")
+@click.option('--offset', type=click.IntRange(min=0), default=0,
+              help='Skip this many records of --input (resume an interrupted run)')
+@click.option('--batch-api', is_flag=True,
+              help='Generate --sample/--input articles offline through the OpenAI Batch API (cheaper, up to 24h)')
+@click.option('--no-wait', is_flag=True, help='With --batch-api: submit and exit instead of polling')
+@click.option('--collect-batch', 'collect_batch_id', metavar='BATCH_ID',
+              help='Wait for a submitted Batch API job and save its articles')
+@click.option('--resume', 'resume_run_id', metavar='RUN_ID',
+              help='Resume a batch run: skip completed articles, retry failed ones')
+@click.option('--concurrency', type=click.IntRange(min=1), default=1, show_default=True,
+              help='Number of articles to generate at once in batch modes')
+@click.option('--async', 'use_async', is_flag=True,
+              help='Drive batch requests from a single asyncio event loop')
+@click.option('--stream', is_flag=True, help='Stream a single article and render it live')
+@click.option('--long-form', is_flag=True,
+              help='Generate an outline, then write all of its sections concurrently (longer articles)')
+@click.option('--hedge', 'dispatch', flag_value='hedge',
+              help='Re-send slow requests (past the p95 latency) to a second provider; first answer wins')
+@click.option('--race', 'dispatch', flag_value='race',
+              help='Send every article to all available providers; first answer wins')
+@click.option('--schedule', type=click.Choice(ProviderScheduler.STRATEGIES),
+              help='Spread articles across all available providers (overrides --provider)')
+@click.option('--rerender', is_flag=True, help='Re-render HTML/Markdown of every stored article (no API calls)')
+@click.option('--rebuild', is_flag=True,
+              help='Re-render only stored articles whose content, metadata or template changed')
+@click.option('--render-processes', type=click.IntRange(min=0),
+              help='Render Markdown in this many processes (default: RENDER_PROCESSES; all cores for --rerender)')
+@click.option('--dedup', type=click.Choice(BlogGenerator.DEDUP_MODES),
+              help='Near-duplicate titles in batches: skip (default), flag, or off')
+@click.option('--dedup-threshold', type=click.FloatRange(0, 1),
+              help='Title similarity (0-1) at which a topic counts as a duplicate (default: DEDUP_THRESHOLD or 0.7)')
+@click.option('--search', help='Full-text search of stored articles (FTS5 syntax: "exact phrase", AND, OR, prefix*)')
+@click.option('--list', 'list_articles', is_flag=True,
+              help='List stored articles (filter with --tag, --provider, --since, --title)')
+@click.option('--tag', help='Only list articles with this tag')
+@click.option('--since', help='Only list articles generated on or after this date (YYYY-MM-DD)')
+@click.option('--reindex', is_flag=True, help='Sync the article catalogue with generated_articles/')
+@click.option('--metrics-out', type=click.Path(dir_okay=False),
+              help='Write per-provider metrics on exit: FILE.json for JSON, anything else for Prometheus text')
+@click.option('--no-cache', is_flag=True, help='Disable the response cache')
+@click.option('--refresh', is_flag=True, help='Ignore cached responses but store the fresh ones')
+def main(provider, interactive, sample, test, test_timeout, health_out, title, description, input_file, offset, batch_api, no_wait,
+         collect_batch_id, resume_run_id, concurrency,
+         use_async, stream, long_form, dispatch, schedule, rerender, rebuild, render_processes, dedup, dedup_threshold, search, list_articles,
+         tag, since, reindex, metrics_out, no_cache, refresh):
     """AI Blog Generator - Create programming articles with AI."""
     
     console.print("🤖 AI Blog Generator", style="blue bold")
     console.print("=" * 50, style="blue")
     
-    # Initialize generator
-    generator = BlogGenerator()
-    
-    # Test connections if requested
-    if test:
-        generator.test_connections()
+    if not any((test, reindex, search, list_articles, rerender, rebuild, interactive, collect_batch_id,
+                resume_run_id, input_file, sample, title)):
+        print_usage_hint()
         return
     
-    # Interactive mode
-    if interactive:
-        generator.interactive_mode()
+    if batch_api and not (sample or input_file):
+        console.print("❌ --batch-api only applies to --sample or --input; "
+                      "generate single articles without it", style="red")
         return
-    
-    # Generate sample articles
-    if sample:
-        console.print("📚 Generating sample programming articles...", style="green")
-        articles = load_sample_articles()
-        generator.generate_batch_articles(articles, provider)
+    if long_form and (batch_api or collect_batch_id):
+        console.print("❌ --long-form cannot be combined with the Batch API", style="red")
         return
+    if long_form and stream:
+        console.print("⚠️ --stream is not available with --long-form; generating without streaming", style="yellow")
+        stream = False
     
-    # Single article mode
-    if title:
-        generator.generate_single_article(title, description or "", provider)
-        return
+    if (rerender or rebuild) and render_processes is None:
+        render_processes = os.cpu_count() or 1
     
-    # Default: show help and options
-    console.print("\n🎯 Choose an option:", style="yellow bold")
-    console.print("1. Run with --interactive for step-by-step article creation")
-    console.print("2. Run with --sample to generate 10 sample programming articles")
-    console.print("3. Run with --test to test API connections")
-    console.print("4. Run with --title 'Your Title' for single article generation")
-    console.print("\nExample: python blog_generator.py --sample --provider gemini")
+    # Construct only the clients this command can use
+    if reindex or search or list_articles or rerender or rebuild:
+        providers = []
+    elif batch_api or collect_batch_id:
+        providers = ['chatgpt']
+    elif provider and not (schedule or dispatch or interactive):
+        providers = [provider]
+    else:
+        providers = None
+    
+    # Initialize generator
+    generator = BlogGenerator(use_cache=not no_cache, refresh_cache=refresh, dispatch=dispatch or 'single',
+                              schedule=schedule, render_processes=render_processes, dedup=dedup,
+                              dedup_threshold=dedup_threshold, metrics_out=metrics_out, providers=providers,
+                              long_form=long_form)
+    
+    try:
+        # Test connections if requested
+        if test:
+            results = generator.test_connections(test_timeout)
+            healthy = bool(results) and all(result['ok'] for result in results.values())
+            if health_out:
+                Path(health_out).parent.mkdir(parents=True, exist_ok=True)
+                atomic_write(Path(health_out), json.dumps({
+                    'checked_at': datetime.now().isoformat(),
+                    'healthy': healthy,
+                    'providers': results
+                }, indent=2))
+            if not healthy:
+                sys.exit(1)
+            return
+        
+        # Catalogue queries
+        if reindex:
+            generator.reindex_catalog()
+        if search:
+            generator.search_articles(search)
+            return
+        if list_articles:
+            generator.list_articles(tag=tag, provider=provider, title=title, since=since)
+            return
+        if reindex:
+            return
+        
+        # Re-render stored articles
+        if rerender or rebuild:
+            generator.rerender_articles(incremental=rebuild)
+            return
+        
+        # Interactive mode
+        if interactive:
+            generator.start_run({'mode': 'interactive', 'provider': provider})
+            generator.interactive_mode(concurrency)
+            return
+        
+        # Collect an offline Batch API job
+        if collect_batch_id:
+            generator.collect_offline_batch(collect_batch_id)
+            return
+        
+        # Resume a journaled batch run
+        if resume_run_id:
+            generator.resume_run(resume_run_id, provider, concurrency, use_async)
+            return
+        
+        # Generate articles listed in a file
+        if input_file:
+            generator.start_run({'mode': 'input', 'input': str(Path(input_file).resolve()),
+                                 'offset': offset, 'provider': provider})
+            if batch_api:
+                try:
+                    articles = [article for _, article in read_articles(input_file, offset)]
+                except ValueError as e:
+                    console.print(f"❌ {e}", style="red")
+                    return
+                generator.generate_offline_batch(articles, wait=not no_wait)
+                return
+            try:
+                generator.generate_from_file(input_file, provider, concurrency, offset, use_async)
+            except ValueError as e:
+                console.print(f"❌ {e}", style="red")
+            return
+        
+        # Generate sample articles
+        if sample:
+            console.print("📚 Generating sample programming articles...", style="green")
+            articles = load_sample_articles()
+            generator.start_run({'mode': 'sample', 'provider': provider})
+            if batch_api:
+                generator.generate_offline_batch(articles, wait=not no_wait)
+                return
+            if use_async:
+                generator.run_async(generator.agenerate_batch_articles(articles, provider, concurrency))
+            else:
+                generator.generate_batch_articles(articles, provider, concurrency)
+            return
+        
+        # Single article mode
+        if title:
+            if stream:
+                generator.stream_single_article(title, description or "", provider)
+            else:
+                generator.generate_single_article(title, description or "", provider)
+            return
+    finally:
+        generator.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+AI Blog Generator Pipeline Package
+
+This package contains the building blocks BlogGenerator uses around the
+API clients:
+- ResponseCache: content-addressed on-disk cache of generated articles
+- LatencyTracker: rolling per-provider latency and error statistics
+- MetricsCollector: per-provider tokens, retries, cache hits, cost and latency histograms
+- ProviderScheduler: load balancing of articles across providers
+- ArticleWriter: background, crash-safe writer for generated articles
+- ArticleRenderer: cached Markdown and template rendering
+- BuildManifest: input hashes for incremental --rebuild
+- LongFormWriter: outline-then-sections generation for --long-form
+
+Usage:
+    from pipeline.response_cache import ResponseCache
+
+Like api_clients, names are loaded from their submodule on first access.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    'ResponseCache': '.response_cache',
+    'LatencyTracker': '.provider_stats',
+    'MetricsCollector': '.metrics',
+    'ProviderScheduler': '.scheduler',
+    'ArticleWriter': '.article_writer',
+    'atomic_write': '.article_writer',
+    'ArticleRenderer': '.renderer',
+    'BuildManifest': '.build_manifest',
+    'LongFormWriter': '.long_form',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
+
+
+__all__ = [
+    'ResponseCache',
+    'LatencyTracker',
+    'MetricsCollector',
+    'ProviderScheduler',
+    'ArticleWriter',
+    'atomic_write',
+    'ArticleRenderer',
+    'BuildManifest',
+    'LongFormWriter'
+]
@@ -0,0 +1,177 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def atomic_write(path: Path, text: str, fsync: bool = True):
+    """Write text to path so readers only ever see the old or the complete new file.
+    
+    The data goes to a hidden temp file in the same directory, is fsynced,
+    and is then renamed over the target with os.replace.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    
+    if fsync and hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself (POSIX only)
+        try:
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class _FileGroup:
+    """Files submitted together; completes once every one of them is written or has failed."""
+    
+    def __init__(self, paths: List[Path], on_complete: Optional[Callable[[Optional[BaseException]], None]]):
+        self.paths = paths
+        self.on_complete = on_complete
+        self.future: Future = Future()
+        self.remaining = len(paths)
+        self.error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        if not paths:
+            self._complete()
+    
+    def file_done(self, error: Optional[BaseException] = None):
+        with self._lock:
+            self.remaining -= 1
+            if error is not None and self.error is None:
+                self.error = error
+            if self.remaining:
+                return
+        self._complete()
+    
+    def _complete(self):
+        # The callback runs before the future resolves, so waiters see its effects
+        if self.on_complete:
+            try:
+                self.on_complete(self.error)
+            except Exception as e:
+                logging.warning(f"⚠️ Write completion callback failed: {e}")
+        if self.error is None:
+            self.future.set_result(self.paths)
+        else:
+            self.future.set_exception(self.error)
+
+
+class ArticleWriter:
+    """Background stage that writes finished articles to disk.
+    
+    Every output file is a separate job on a bounded queue, so the JSON,
+    Markdown and HTML of an article are rendered and written concurrently
+    by the worker threads. When the disk falls behind and the queue is
+    full, submit() blocks, slowing generation down instead of buffering
+    without limit.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 fsync: Optional[bool] = None):
+        self.workers = workers or int(os.getenv('WRITER_THREADS', 3))
+        self.fsync = fsync if fsync is not None else os.getenv('WRITER_FSYNC', 'true').lower() != 'false'
+        self.stats = {'files': 0, 'failed': 0, 'blocked_seconds': 0.0}
+        
+        self._queue: "queue.Queue[Optional[Tuple[Path, Callable[[], str], _FileGroup]]]" = queue.Queue(
+            maxsize=queue_size or int(os.getenv('WRITER_QUEUE_SIZE', 32))
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"article-writer-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        
+        # Drain pending writes even if the owner never calls close()
+        atexit.register(self.close)
+    
+    def submit(self, files: Dict[Path, Callable[[], str]],
+               on_complete: Optional[Callable[[Optional[BaseException]], None]] = None) -> Future:
+        """Queue files for writing; each value renders the file's text.
+        
+        Blocks while the queue is full (backpressure).
+        
+        Args:
+            files: Target path -> function returning the file's text
+            on_complete: Called from a writer thread with the first write error
+                (None if every file landed), before the returned future resolves
+        
+        Returns:
+            Future resolving to the written paths once all of them are on disk,
+            or raising the first write error
+        """
+        if self._closed:
+            raise RuntimeError("ArticleWriter is closed")
+        
+        group = _FileGroup(list(files), on_complete)
+        for path, render in files.items():
+            try:
+                self._queue.put_nowait((path, render, group))
+            except queue.Full:
+                started = time.monotonic()
+                self._queue.put((path, render, group))
+                with self._lock:
+                    self.stats['blocked_seconds'] += time.monotonic() - started
+        return group.future
+    
+    def flush(self):
+        """Wait until every queued file has been written."""
+        self._queue.join()
+    
+    def close(self):
+        """Flush pending writes and stop the worker threads."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        atexit.unregister(self.close)
+    
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._write(*job)
+            finally:
+                self._queue.task_done()
+    
+    def _write(self, path: Path, render: Callable[[], str], group: _FileGroup):
+        try:
+            atomic_write(path, render(), fsync=self.fsync)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not write {Path(path).name}: {e}")
+            with self._lock:
+                self.stats['failed'] += 1
+            group.file_done(e)
+            return
+        
+        with self._lock:
+            self.stats['files'] += 1
+        group.file_done()
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from .article_writer import atomic_write
+
+
+class BuildManifest:
+    """Record of the inputs each stored article's outputs were rendered from.
+    
+    Per article it keeps two hashes: the Markdown content (which decides
+    whether content_html must be converted again) and the full page inputs
+    (metadata plus template), together with the JSON file's size and mtime
+    so unchanged articles are skipped without being read.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.markdown_fingerprint = None
+        self.template_fingerprint = None
+        self.articles: Dict[str, Dict] = {}
+        self._load()
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ Ignoring unreadable build manifest {self.path}: {e}")
+            return
+        
+        if data.get('version') != self.VERSION:
+            return
+        self.markdown_fingerprint = data.get('markdown')
+        self.template_fingerprint = data.get('template')
+        self.articles = data.get('articles', {})
+    
+    def save(self):
+        data = {
+            'version': self.VERSION,
+            'markdown': self.markdown_fingerprint,
+            'template': self.template_fingerprint,
+            'articles': self.articles
+        }
+        atomic_write(self.path, json.dumps(data, sort_keys=True))
+    
+    @staticmethod
+    def content_hash(article_data: Dict, markdown_fingerprint: str) -> str:
+        """Hash of the inputs of content_html."""
+        digest = hashlib.sha256(markdown_fingerprint.encode('utf-8'))
+        digest.update(article_data.get('content', '').encode('utf-8'))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def page_hash(article_data: Dict, template_fingerprint: str) -> str:
+        """Hash of the inputs of the HTML and Markdown pages (everything but content_html)."""
+        inputs = {key: value for key, value in article_data.items() if key != 'content_html'}
+        digest = hashlib.sha256(template_fingerprint.encode('utf-8'))
+        digest.update(json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def unchanged_on_disk(self, json_file: Path, stat: os.stat_result) -> bool:
+        """True if the JSON file is exactly the one recorded at the last build."""
+        entry = self.articles.get(json_file.name)
+        return bool(entry) and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns
+    
+    def entry(self, json_file: Path) -> Optional[Dict]:
+        return self.articles.get(json_file.name)
+    
+    def record(self, json_file: Path, content_hash: str, page_hash: str):
+        """Store the hashes and current size/mtime of a freshly built article."""
+        stat = json_file.stat()
+        self.articles[json_file.name] = {
+            'content': content_hash,
+            'page': page_hash,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        }
+    
+    def prune(self, existing: set):
+        """Forget articles whose JSON no longer exists."""
+        for name in list(self.articles):
+            if name not in existing:
+                del self.articles[name]
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class ArticleCatalog:
+    """Indexed SQLite catalogue of the articles in the output directory.
+    
+    One row per saved article (title, slug, provider, tags, date, word
+    count, output paths, content hash), a tag table for indexed tag lookups
+    and, when SQLite has FTS5, a full-text index over title, summary, tags
+    and content.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY,
+            json_path TEXT NOT NULL UNIQUE,
+            md_path TEXT,
+            html_path TEXT,
+            title TEXT NOT NULL,
+            slug TEXT,
+            provider TEXT,
+            tags TEXT,
+            summary TEXT,
+            generated_at TEXT,
+            word_count INTEGER,
+            content_hash TEXT
+        );
+        CREATE INDEX IF NOT EXISTS articles_provider ON articles (provider);
+        CREATE INDEX IF NOT EXISTS articles_generated_at ON articles (generated_at);
+        CREATE INDEX IF NOT EXISTS articles_slug ON articles (slug);
+        CREATE INDEX IF NOT EXISTS articles_content_hash ON articles (content_hash);
+        CREATE TABLE IF NOT EXISTS article_tags (
+            article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+            tag TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS article_tags_tag ON article_tags (tag, article_id);
+    """
+    
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts
+        USING fts5(title, summary, tags, content, tokenize = 'porter unicode61')
+    """
+    
+    # Title matches weigh most, then summary and tags, then body text
+    FTS_SEARCH = """
+        SELECT articles.*, snippet(articles_fts, 3, '[', ']', '…', 12) AS snippet
+        FROM articles_fts JOIN articles ON articles.id = articles_fts.rowid
+        WHERE articles_fts MATCH ? ORDER BY bm25(articles_fts, 10.0, 5.0, 5.0, 1.0) LIMIT ?
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.created = not self.db_path.exists()
+        
+        # Shared by generation and writer threads; the lock serializes access
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(self.SCHEMA)
+            try:
+                self._conn.execute(self.FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                logging.warning("⚠️ SQLite was built without FTS5; search falls back to substring matching")
+                self.has_fts = False
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+    
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def upsert(self, article_data: Dict, json_path: Path, slug: Optional[str] = None):
+        """Add or replace the catalogue entry for the article stored at json_path."""
+        json_path = Path(json_path)
+        content = article_data.get('content', '')
+        tags = [tag for tag in article_data.get('tags', []) if tag]
+        row = {
+            'json_path': str(json_path),
+            'md_path': str(json_path.with_suffix('.md')),
+            'html_path': str(json_path.with_suffix('.html')),
+            'title': article_data.get('title', ''),
+            'slug': slug,
+            'provider': article_data.get('provider'),
+            'tags': ", ".join(tags),
+            'summary': article_data.get('summary', ''),
+            'generated_at': article_data.get('generated_at'),
+            'word_count': len(content.split()),
+            'content_hash': self.content_hash(content)
+        }
+        
+        with self._lock, self._conn:
+            existing = self._conn.execute(
+                "SELECT id FROM articles WHERE json_path = ?", (row['json_path'],)
+            ).fetchone()
+            if existing:
+                article_id = existing['id']
+                assignments = ", ".join(f"{column} = :{column}" for column in row)
+                self._conn.execute(f"UPDATE articles SET {assignments} WHERE id = :id", dict(row, id=article_id))
+                self._conn.execute("DELETE FROM article_tags WHERE article_id = ?", (article_id,))
+                if self.has_fts:
+                    self._conn.execute("DELETE FROM articles_fts WHERE rowid = ?", (article_id,))
+            else:
+                columns = ", ".join(row)
+                placeholders = ", ".join(f":{column}" for column in row)
+                article_id = self._conn.execute(
+                    f"INSERT INTO articles ({columns}) VALUES ({placeholders})", row
+                ).lastrowid
+            
+            self._conn.executemany(
+                "INSERT INTO article_tags (article_id, tag) VALUES (?, ?)",
+                [(article_id, tag.lower()) for tag in tags]
+            )
+            if self.has_fts:
+                self._conn.execute(
+                    "INSERT INTO articles_fts (rowid, title, summary, tags, content) VALUES (?, ?, ?, ?, ?)",
+                    (article_id, row['title'], row['summary'], row['tags'], content)
+                )
+    
+    def remove(self, json_path: Path):
+        with self._lock, self._conn:
+            self._remove(str(json_path))
+    
+    def _remove(self, json_path: str):
+        row = self._conn.execute("SELECT id FROM articles WHERE json_path = ?", (json_path,)).fetchone()
+        if not row:
+            return
+        if self.has_fts:
+            self._conn.execute("DELETE FROM articles_fts WHERE rowid = ?", (row['id'],))
+        self._conn.execute("DELETE FROM articles WHERE id = ?", (row['id'],))
+    
+    def sync(self, output_dir: Path, slugify=None) -> Dict[str, int]:
+        """Index stored articles missing from the catalogue and drop entries whose JSON is gone.
+        
+        Returns:
+            Counts of 'added' and 'removed' entries
+        """
+        on_disk = {str(path): path for path in Path(output_dir).glob('*.json')}
+        with self._lock:
+            indexed = {row['json_path'] for row in self._conn.execute("SELECT json_path FROM articles")}
+        
+        added = 0
+        for json_path in sorted(set(on_disk) - indexed):
+            try:
+                with open(on_disk[json_path], 'r', encoding='utf-8') as f:
+                    article = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"⚠️ Not indexing unreadable article {json_path}: {e}")
+                continue
+            if not isinstance(article, dict) or 'title' not in article:
+                continue
+            self.upsert(article, on_disk[json_path], slugify(article['title']) if slugify else None)
+            added += 1
+        
+        removed = indexed - set(on_disk)
+        with self._lock, self._conn:
+            for json_path in removed:
+                self._remove(json_path)
+        
+        return {'added': added, 'removed': len(removed)}
+    
+    def titles(self) -> List[Tuple[str, str]]:
+        """(title, json_path) of every catalogued article."""
+        with self._lock:
+            return [(row['title'], row['json_path']) for row in self._conn.execute("SELECT title, json_path FROM articles")]
+    
+    def query(self, tag: Optional[str] = None, provider: Optional[str] = None, title: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """List articles matching all given filters, newest first.
+        
+        Args:
+            tag: Exact tag (case-insensitive)
+            provider: Provider name
+            title: Substring of the title
+            since: ISO date/time lower bound for generated_at
+            until: ISO date/time upper bound for generated_at
+            limit: Maximum number of rows
+        """
+        clauses, params = [], []
+        if tag:
+            clauses.append("id IN (SELECT article_id FROM article_tags WHERE tag = ?)")
+            params.append(tag.lower())
+        if provider:
+            clauses.append("provider = ?")
+            params.append(provider)
+        if title:
+            clauses.append("title LIKE ?")
+            params.append(f"%{title}%")
+        if since:
+            clauses.append("generated_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("generated_at <= ?")
+            params.append(until)
+        
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT * FROM articles {where} ORDER BY generated_at DESC LIMIT ?"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params + [limit])]
+    
+    def search(self, text: str, limit: int = 20) -> List[Dict]:
+        """Full-text search over title, summary, tags and content, best matches first.
+        
+        With FTS5 the query supports its syntax (phrases, AND/OR/NOT, prefix*).
+        """
+        with self._lock:
+            if self.has_fts:
+                try:
+                    rows = self._conn.execute(self.FTS_SEARCH, (text, limit)).fetchall()
+                except sqlite3.OperationalError:
+                    # Not valid FTS5 syntax: search for the words as a literal phrase
+                    phrase = '"' + text.replace('"', '""') + '"'
+                    rows = self._conn.execute(self.FTS_SEARCH, (phrase, limit)).fetchall()
+            else:
+                pattern = f"%{text}%"
+                rows = self._conn.execute(
+                    "SELECT * FROM articles WHERE title LIKE ? OR summary LIKE ? OR tags LIKE ? LIMIT ?",
+                    (pattern, pattern, pattern, limit)
+                ).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,152 @@
+import copy
+import os
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+class TitleDeduplicator:
+    """Near-duplicate title detection with MinHash over character shingles and words.
+    
+    Titles are normalized (case, punctuation, boilerplate phrases, function
+    words) and summarized by two MinHash signatures: one over overlapping
+    character shingles, one over lightly stemmed words. The fraction of
+    equal signature entries estimates the Jaccard similarity of the two
+    sets, and a title pair's similarity is the lower of the two estimates,
+    so an extra topic word ("Deep Learning with Python" vs "Learning
+    Python") is not outweighed by the shared characters. Lookups compare a
+    signature against every indexed title at once with NumPy.
+    """
+    
+    # Function words that change a title's wording but not its topic
+    STOPWORDS = frozenset("a an and the of to for in on with by vs versus your".split())
+    
+    # Whole phrases that wrap a topic without naming it, removed from the start
+    # ("A Complete Guide to Docker") or end ("Docker: A Complete Guide") of a title.
+    # Single words such as "deep", "introduction" or "essentials" are kept.
+    LEADING_PHRASES = (
+        "a complete guide to", "the complete guide to", "complete guide to",
+        "a comprehensive guide to", "the ultimate guide to", "a practical guide to",
+        "a beginners guide to", "the beginners guide to", "beginners guide to",
+        "a step by step guide to", "step by step guide to",
+        "an introduction to", "introduction to", "a deep dive into", "deep dive into",
+        "getting started with", "everything you need to know about", "how to",
+    )
+    TRAILING_PHRASES = (
+        "a complete guide", "the complete guide", "a comprehensive guide", "the ultimate guide",
+        "a practical guide", "a step by step guide", "a deep dive", "for beginners",
+    )
+    
+    _PRIME = (1 << 31) - 1  # Mersenne prime; keeps a * x inside uint64
+    
+    def __init__(self, threshold: Optional[float] = None, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.threshold = threshold if threshold is not None else float(os.getenv('DEDUP_THRESHOLD', 0.7))
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, self._PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, self._PRIME, size=num_perm).astype(np.uint64)
+        
+        self._refs: List[str] = []
+        self._rows: List[np.ndarray] = []
+        self._matrix = np.empty((0, 2 * num_perm), dtype=np.uint64)
+        
+        phrases = lambda options: "|".join(re.escape(phrase) for phrase in sorted(options, key=len, reverse=True))
+        self._leading = re.compile(rf"^(?:{phrases(self.LEADING_PHRASES)}) ")
+        self._trailing = re.compile(rf" (?:{phrases(self.TRAILING_PHRASES)})$")
+    
+    def __len__(self) -> int:
+        return len(self._refs)
+    
+    def normalize(self, title: str) -> str:
+        text = " ".join(re.findall(r"[a-z0-9+#]+", re.sub(r"['’]", "", title.lower())))
+        stripped = self._trailing.sub("", self._leading.sub("", text))
+        words = stripped.split()
+        kept = [word for word in words if word not in self.STOPWORDS]
+        return " ".join(kept or words or text.split())
+    
+    @staticmethod
+    def _stem(word: str) -> str:
+        # Plurals only: "containers" and "container" are the same topic
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            return word[:-1]
+        return word
+    
+    def _minhash(self, features: set) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(feature.encode('utf-8')) for feature in features),
+                             dtype=np.uint64, count=len(features)) % self._PRIME
+        # One universal hash per permutation, applied to every feature at once
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % self._PRIME
+        return permuted.min(axis=1)
+    
+    def signature(self, title: str) -> np.ndarray:
+        """MinHash signature of a title: num_perm values over character shingles, then num_perm over words."""
+        text = self.normalize(title)
+        size = self.shingle_size
+        shingles = {text[i:i + size] for i in range(max(1, len(text) - size + 1))}
+        words = {self._stem(word) for word in text.split()} or {text}
+        return np.concatenate([self._minhash(shingles), self._minhash(words)])
+    
+    def similarity(self, first: str, second: str) -> float:
+        """Estimated similarity of two titles (the lower of the shingle and word Jaccard estimates)."""
+        equal = self.signature(first) == self.signature(second)
+        return float(min(equal[:self.num_perm].mean(), equal[self.num_perm:].mean()))
+    
+    def add(self, title: str, ref: str):
+        """Index a title; ref identifies it in match results (e.g. a file name or batch position)."""
+        self._refs.append(ref)
+        self._rows.append(self.signature(title))
+    
+    def add_many(self, items: Iterable[Tuple[str, str]]):
+        for title, ref in items:
+            self.add(title, ref)
+    
+    def copy(self) -> "TitleDeduplicator":
+        """Independent index with the same entries, without re-signing them."""
+        self._flush()
+        clone = copy.copy(self)
+        clone._refs = list(self._refs)
+        clone._rows = []
+        # _flush replaces the matrix rather than growing it in place, so it can be shared
+        return clone
+    
+    def _flush(self):
+        """Stack signatures added since the last lookup onto the matrix."""
+        if self._rows:
+            self._matrix = np.vstack([self._matrix] + self._rows)
+            self._rows = []
+    
+    def find(self, title: str) -> Optional[Tuple[str, float]]:
+        """Most similar indexed title at or above the threshold, as (ref, similarity)."""
+        if not self._refs:
+            return None
+        
+        self._flush()
+        
+        # Identical normalized titles score 1.0 here too; nothing bypasses the threshold
+        equal = self._matrix == self.signature(title)
+        similarities = np.minimum(equal[:, :self.num_perm].mean(axis=1), equal[:, self.num_perm:].mean(axis=1))
+        best = int(similarities.argmax())
+        if similarities[best] >= self.threshold:
+            return self._refs[best], float(similarities[best])
+        return None
+    
+    def partition(self, article_list: List[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, str, float]]]:
+        """Split a batch into unique articles and duplicates of the index or of earlier batch entries.
+        
+        Returns:
+            (unique articles, [(duplicate article, matching ref, similarity)])
+        """
+        unique, duplicates = [], []
+        for article in article_list:
+            title = article.get('title', '')
+            match = self.find(title)
+            if match:
+                duplicates.append((article, match[0], match[1]))
+                continue
+            unique.append(article)
+            self.add(title, f"batch: {title}")
+        return unique, duplicates
@@ -0,0 +1,87 @@
+import csv
+import itertools
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+SUPPORTED_SUFFIXES = ('.json', '.jsonl', '.ndjson', '.csv')
+
+
+def read_articles(path: str, offset: int = 0) -> Iterator[Tuple[int, Dict]]:
+    """Yield (record position, article request) pairs from a JSON, JSONL or CSV file.
+    
+    JSONL and CSV are read one record at a time, so arbitrarily large
+    backlogs are never loaded into memory; a JSON file is a single document
+    and is parsed whole. Records without a title are skipped with a warning.
+    
+    Args:
+        path: Input file; the format is taken from its suffix
+        offset: Number of records to skip from the start (for resuming)
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.json':
+        records = _read_json(path)
+    elif suffix in ('.jsonl', '.ndjson'):
+        records = _read_jsonl(path)
+    elif suffix == '.csv':
+        records = _read_csv(path)
+    else:
+        raise ValueError(f"Unsupported input format '{path.suffix}' (use {', '.join(SUPPORTED_SUFFIXES)})")
+    
+    for position, record in enumerate(records):
+        if position < offset:
+            continue
+        article = _normalize(record)
+        if article is None:
+            logging.warning(f"⚠️ Skipping record {position} of {path.name}: no title")
+            continue
+        yield position, article
+
+
+def chunked(items: Iterator, size: int) -> Iterator[List]:
+    """Group a stream into lists of at most `size` items."""
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _read_json(path: Path) -> Iterator:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get('articles', [data])
+    return iter(data)
+
+
+def _read_jsonl(path: Path) -> Iterator:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                logging.warning(f"⚠️ Invalid JSON on line {line_number} of {path.name}: {e}")
+                yield None
+
+
+def _read_csv(path: Path) -> Iterator:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            yield {key.strip().lower(): value for key, value in row.items() if key}
+
+
+def _normalize(record) -> Optional[Dict]:
+    if isinstance(record, str):
+        record = {'title': record}
+    if not isinstance(record, dict):
+        return None
+    title = (record.get('title') or '').strip()
+    if not title:
+        return None
+    return dict(record, title=title, description=(record.get('description') or '').strip())
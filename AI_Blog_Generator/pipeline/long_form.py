@@ -0,0 +1,260 @@
+import asyncio
+import logging
+import os
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from api_clients.content_parser import parse_generated_content
+from api_clients.prompts import LONG_FORM_OUTLINE_PROMPT, LONG_FORM_SECTION_PROMPT
+
+# [(section heading, [key points])]
+Outline = List[Tuple[str, List[str]]]
+
+_HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t#]*$')
+_OUTLINE_HEADING_RE = re.compile(r'^#{2,3}[ \t]+(?:\d+[.)][ \t]*)?(.+?)[ \t#]*$')
+_POINT_RE = re.compile(r'^[ \t]*[-*+][ \t]+(.+)$')
+
+
+def template_sections(template: str) -> Outline:
+    """The '## Heading' / '- point' structure under the '# {title}' line of an article prompt."""
+    sections: Outline = []
+    in_structure = False
+    for line in template.splitlines():
+        stripped = line.strip()
+        if stripped == '# {title}':
+            in_structure = True
+        elif not in_structure:
+            continue
+        elif stripped.startswith('## '):
+            sections.append((stripped[3:].strip(), []))
+        elif stripped.startswith('- ') and sections:
+            sections[-1][1].append(stripped[2:].strip())
+        elif stripped.startswith('**'):
+            # The structure ends where the guidelines start
+            break
+    return sections
+
+
+def parse_outline(text: str) -> Outline:
+    """Sections of a generated outline: '## Heading' lines, each followed by '- point' lines."""
+    sections: Outline = []
+    for line in text.splitlines():
+        heading = _OUTLINE_HEADING_RE.match(line.strip())
+        if heading:
+            sections.append((heading.group(1).strip('* ').strip(), []))
+            continue
+        point = _POINT_RE.match(line)
+        if point and sections:
+            sections[-1][1].append(point.group(1).strip())
+    return [(heading, points) for heading, points in sections if heading]
+
+
+def format_outline(outline: Outline) -> str:
+    return "\n".join(
+        f"## {heading}" + "".join(f"\n- {point}" for point in points)
+        for heading, points in outline
+    )
+
+
+def heading_id(text: str) -> str:
+    """The anchor the Markdown 'toc' extension gives a heading (its default slugify)."""
+    value = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    value = re.sub(r'[^\w\s-]', '', value).strip().lower()
+    return re.sub(r'[-\s]+', '-', value)
+
+
+class LongFormWriter:
+    """
+    Long-form articles: one request for an outline, then one request per
+    section, all in flight at once, stitched back together under a table of
+    contents.
+    
+    Wall-clock time is about outline + slowest section rather than the sum of
+    all sections, and the article is no longer capped by a single response's
+    max_tokens. Every request goes through the provider's rate limiter and
+    retry policy like a normal article request.
+    """
+    
+    def __init__(self, section_tokens: Optional[int] = None, section_words: Optional[int] = None,
+                 outline_tokens: Optional[int] = None, max_sections: Optional[int] = None,
+                 concurrency: Optional[int] = None):
+        self.section_tokens = section_tokens or int(os.getenv('LONG_FORM_SECTION_TOKENS', 2000))
+        self.section_words = section_words or int(os.getenv('LONG_FORM_SECTION_WORDS', 450))
+        self.outline_tokens = outline_tokens or int(os.getenv('LONG_FORM_OUTLINE_TOKENS', 1000))
+        self.max_sections = max_sections or int(os.getenv('LONG_FORM_MAX_SECTIONS', 12))
+        # Sections written at once per article (0 = all of them)
+        self.concurrency = concurrency if concurrency is not None else int(os.getenv('LONG_FORM_CONCURRENCY', 0))
+    
+    def settings(self) -> Dict:
+        """Everything besides the provider request that shapes the article, for the cache key."""
+        return {
+            'section_tokens': self.section_tokens,
+            'section_words': self.section_words,
+            'outline_tokens': self.outline_tokens,
+            'max_sections': self.max_sections
+        }
+    
+    def outline_prompt(self, client, title: str, description: str = "") -> str:
+        structure = template_sections(client.PROMPT.template)
+        return LONG_FORM_OUTLINE_PROMPT.render(title, description or "", structure=format_outline(structure))
+    
+    def plan(self, client, title: str, text: str) -> Tuple[Dict, Outline]:
+        """
+        Metadata sections and outline from the outline response.
+        
+        Falls back to the structure of the provider's article prompt when the
+        response has fewer than two usable sections.
+        """
+        sections = parse_generated_content(text)
+        outline = parse_outline(sections.get('content', text))[:self.max_sections]
+        if len(outline) < 2:
+            logging.warning(f"⚠️ No usable outline for '{title}'; using the standard article structure")
+            outline = template_sections(client.PROMPT.template)[:self.max_sections]
+        return sections, outline
+    
+    def section_prompts(self, title: str, description: str, outline: Outline) -> List[str]:
+        full_outline = format_outline(outline)
+        return [
+            LONG_FORM_SECTION_PROMPT.render(
+                title, description or "", outline=full_outline, section=heading,
+                points="\n".join(f"- {point}" for point in points) or "- Whatever this section needs",
+                words=str(self.section_words)
+            )
+            for heading, points in outline
+        ]
+    
+    def write(self, client, title: str, description: str = "") -> Dict:
+        """
+        Generate a long-form article with a provider client (BaseProvider).
+        
+        Returns:
+            Article dict like client.generate_article, whose 'usage' adds up
+            every request ('requests' counts them)
+        """
+        calls = []
+        text, usage = client.complete(self.outline_prompt(client, title, description), max_tokens=self.outline_tokens)
+        calls.append(usage)
+        meta, outline = self.plan(client, title, text)
+        
+        prompts = self.section_prompts(title, description, outline)
+        workers = min(len(prompts), self.concurrency or len(prompts))
+        executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        futures = [executor.submit(client.complete, prompt, max_tokens=self.section_tokens) for prompt in prompts]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            # One failed section fails the article, so stop paying for the others:
+            # queued sections never start (requests already sent still finish)
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        results = [future.result() for future in futures]
+        
+        calls.extend(usage for _, usage in results)
+        return self._article(client, title, meta, outline, [text for text, _ in results], calls)
+    
+    async def awrite(self, client, title: str, description: str = "") -> Dict:
+        """Async variant of write; sections run as concurrent coroutines."""
+        calls = []
+        text, usage = await client.acomplete(
+            self.outline_prompt(client, title, description), max_tokens=self.outline_tokens
+        )
+        calls.append(usage)
+        meta, outline = self.plan(client, title, text)
+        
+        semaphore = asyncio.Semaphore(self.concurrency or len(outline) or 1)
+        
+        async def write_section(prompt: str) -> Tuple[str, Dict]:
+            async with semaphore:
+                return await client.acomplete(prompt, max_tokens=self.section_tokens)
+        
+        tasks = [asyncio.ensure_future(write_section(prompt)) for prompt in self.section_prompts(title, description, outline)]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            # One failed section fails the article, so stop paying for the others
+            for task in tasks:
+                task.cancel()
+        
+        calls.extend(usage for _, usage in results)
+        return self._article(client, title, meta, outline, [text for text, _ in results], calls)
+    
+    def _article(self, client, title: str, meta: Dict, outline: Outline, texts: List[str], calls: List[Dict]) -> Dict:
+        content = self.stitch(title, [heading for heading, _ in outline], texts)
+        article = client.build_article(title, content, sections=dict(meta, content=content))
+        article['usage'] = {
+            'model': calls[0].get('model'),
+            'prompt_tokens': sum(call.get('prompt_tokens') or 0 for call in calls),
+            'completion_tokens': sum(call.get('completion_tokens') or 0 for call in calls),
+            'retries': sum(call.get('retries') or 0 for call in calls),
+            'requests': len(calls)
+        }
+        article['long_form'] = {'sections': len(outline)}
+        return article
+    
+    def stitch(self, title: str, headings: List[str], texts: List[str]) -> str:
+        """Join the sections under the article title and a table of contents linking to each."""
+        bodies = [self._section_markdown(heading, text) for heading, text in zip(headings, texts)]
+        
+        # Anchors are assigned in document order and de-duplicated like the 'toc' extension does,
+        # so the links match the rendered HTML even when a sub-heading repeats a section name
+        used = set()
+        
+        def unique_id(text: str) -> str:
+            anchor = base = heading_id(text)
+            count = 0
+            while anchor in used:
+                count += 1
+                anchor = f"{base}_{count}"
+            used.add(anchor)
+            return anchor
+        
+        unique_id(title)
+        unique_id('Table of Contents')
+        toc = []
+        for heading, body in zip(headings, bodies):
+            for index, line_heading in enumerate(self._headings(body)):
+                anchor = unique_id(line_heading)
+                if index == 0:
+                    toc.append(f"{len(toc) + 1}. [{heading}](#{anchor})")
+        
+        return f"# {title}\n\n## Table of Contents\n\n" + "\n".join(toc) + "\n\n" + "\n\n".join(bodies) + "\n"
+    
+    @staticmethod
+    def _section_markdown(heading: str, text: str) -> str:
+        """A section under exactly the outline's heading, its own headings demoted below it."""
+        # Models sometimes echo the section markers; keep what follows ---CONTENT---
+        text = parse_generated_content(text).get('content', text).strip()
+        lines = text.splitlines()
+        if lines and _HEADING_RE.match(lines[0]):
+            # Replaced by the outline heading, so the table of contents matches
+            lines = lines[1:]
+        
+        body = []
+        in_code = False
+        for line in lines:
+            if line.lstrip().startswith('```'):
+                in_code = not in_code
+            elif not in_code:
+                match = _HEADING_RE.match(line)
+                if match and len(match.group(1)) <= 2:
+                    line = f"### {match.group(2)}"
+            body.append(line)
+        return f"## {heading}\n\n" + "\n".join(body).strip()
+    
+    @staticmethod
+    def _headings(markdown_text: str) -> List[str]:
+        """ATX heading texts outside code blocks, in order."""
+        headings = []
+        in_code = False
+        for line in markdown_text.splitlines():
+            if line.lstrip().startswith('```'):
+                in_code = not in_code
+            elif not in_code:
+                match = _HEADING_RE.match(line)
+                if match:
+                    headings.append(match.group(2))
+        return headings
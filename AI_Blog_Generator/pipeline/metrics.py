@@ -0,0 +1,235 @@
+import json
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# USD per 1M (input, output) tokens; override with <PROVIDER>_PRICE_INPUT_PER_1M /
+# <PROVIDER>_PRICE_OUTPUT_PER_1M when a model or price list changes
+MODEL_PRICES = {
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-pro': (0.50, 1.50),
+    'llama-3.1-sonar-large-128k-online': (1.00, 1.00),
+}
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def model_price(provider: str, model: Optional[str]) -> Tuple[float, float]:
+    """(input, output) USD per 1M tokens for a provider's model; (0, 0) when unknown."""
+    name = (model or '').split('/')[-1]
+    default_in, default_out = MODEL_PRICES.get(name, (0.0, 0.0))
+    prefix = provider.upper()
+    return (
+        float(os.getenv(f'{prefix}_PRICE_INPUT_PER_1M', default_in)),
+        float(os.getenv(f'{prefix}_PRICE_OUTPUT_PER_1M', default_out))
+    )
+
+
+def estimate_cost(provider: str, model: Optional[str], tokens_in: int, tokens_out: int,
+                  discount: float = 1.0) -> float:
+    """Estimated USD cost of one request at list prices (times `discount`, e.g. 0.5 for batch jobs)."""
+    price_in, price_out = model_price(provider, model)
+    return (tokens_in * price_in + tokens_out * price_out) / 1_000_000 * discount
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style, plus recent raw samples for percentiles."""
+    
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS, window: int = 10000):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.samples: Deque[float] = deque(maxlen=window)
+    
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+    
+    def percentile(self, q: float) -> Optional[float]:
+        """q-th percentile (0-100) of the recent samples, or None without data."""
+        values = sorted(self.samples)
+        if not values:
+            return None
+        index = min(len(values) - 1, max(0, int(round(q / 100.0 * len(values))) - 1))
+        return values[index]
+    
+    def to_dict(self) -> Dict:
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 6) if value is not None else None
+        
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'buckets': {str(bound): count for bound, count in zip(self.buckets, self.counts)},
+            'p50': rounded(self.percentile(50)),
+            'p95': rounded(self.percentile(95)),
+            'p99': rounded(self.percentile(99))
+        }
+
+
+class MetricsCollector:
+    """Per-provider request, token, retry, cache and cost accounting for one process."""
+    
+    COUNTERS = ('requests', 'failures', 'cancelled', 'cache_hits', 'tokens_in', 'tokens_out', 'retries')
+    
+    def __init__(self):
+        self._providers: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def _provider(self, provider: str) -> Dict:
+        entry = self._providers.get(provider)
+        if entry is None:
+            entry = {name: 0 for name in self.COUNTERS}
+            entry.update(cost_usd=0.0, latency=Histogram(), ttfb=Histogram())
+            self._providers[provider] = entry
+        return entry
+    
+    def record(self, provider: str, latency: Optional[float] = None, ttfb: Optional[float] = None,
+               usage: Optional[Dict] = None, success: bool = True, discount: float = 1.0,
+               cancelled: bool = False) -> Dict:
+        """
+        Account for one provider request.
+        
+        Args:
+            provider: Provider name
+            latency: Total seconds for the request, including retries
+            ttfb: Seconds until the first response byte, when the transport exposes it
+            usage: Client usage report (model, prompt_tokens, completion_tokens, retries;
+                'requests' when one article took several requests, as in long-form mode)
+            success: False for a request that ultimately failed
+            discount: Price multiplier (0.5 for Batch API jobs)
+            cancelled: The request was abandoned (a hedge or race loser); its
+                latency is not observed, but its usage and cost are counted
+        
+        Returns:
+            The per-request metrics stored in the article's metadata
+        """
+        usage = usage or {}
+        tokens_in = int(usage.get('prompt_tokens') or 0)
+        tokens_out = int(usage.get('completion_tokens') or 0)
+        retries = int(usage.get('retries') or 0)
+        requests = int(usage.get('requests') or 1)
+        cost = estimate_cost(provider, usage.get('model'), tokens_in, tokens_out, discount)
+        
+        with self._lock:
+            entry = self._provider(provider)
+            entry['requests'] += requests
+            if not success:
+                entry['failures'] += 1
+            if cancelled:
+                entry['cancelled'] += 1
+            entry['tokens_in'] += tokens_in
+            entry['tokens_out'] += tokens_out
+            entry['retries'] += retries
+            entry['cost_usd'] += cost
+            if latency is not None and success and not cancelled:
+                entry['latency'].observe(latency)
+            if ttfb is not None and success and not cancelled:
+                entry['ttfb'].observe(ttfb)
+        
+        metrics = {
+            'model': usage.get('model'),
+            'latency_s': round(latency, 3) if latency is not None else None,
+            'ttfb_s': round(ttfb, 3) if ttfb is not None else None,
+            'tokens_in': tokens_in,
+            'tokens_out': tokens_out,
+            'retries': retries,
+            'cached': False,
+            'cost_usd': round(cost, 6)
+        }
+        if usage.get('estimated'):
+            metrics['tokens_estimated'] = True
+        if requests > 1:
+            metrics['requests'] = requests
+        return metrics
+    
+    def record_cache_hit(self, provider: str) -> Dict:
+        """Account for an article served from the response cache (no request, no cost)."""
+        with self._lock:
+            self._provider(provider)['cache_hits'] += 1
+        return {'cached': True, 'cost_usd': 0.0}
+    
+    @property
+    def empty(self) -> bool:
+        with self._lock:
+            return not self._providers
+    
+    def summary(self) -> List[Dict]:
+        """One row per provider: counters, cost and latency percentiles."""
+        rows = []
+        with self._lock:
+            for provider, entry in sorted(self._providers.items()):
+                row = {name: entry[name] for name in self.COUNTERS}
+                row.update(
+                    provider=provider,
+                    cost_usd=entry['cost_usd'],
+                    latency_p50=entry['latency'].percentile(50),
+                    latency_p95=entry['latency'].percentile(95),
+                    ttfb_p50=entry['ttfb'].percentile(50)
+                )
+                rows.append(row)
+        return rows
+    
+    def to_json(self) -> str:
+        """Full metrics, histograms included, as a JSON document."""
+        with self._lock:
+            data = {
+                provider: dict(
+                    {name: entry[name] for name in self.COUNTERS},
+                    cost_usd=round(entry['cost_usd'], 6),
+                    latency_seconds=entry['latency'].to_dict(),
+                    ttfb_seconds=entry['ttfb'].to_dict()
+                )
+                for provider, entry in sorted(self._providers.items())
+            }
+        return json.dumps({'providers': data}, indent=2)
+    
+    def to_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format (e.g. for the node_exporter textfile collector)."""
+        counters = [
+            ('requests', 'blog_generator_requests_total', 'Provider requests, including failures'),
+            ('failures', 'blog_generator_request_failures_total', 'Provider requests that failed after retries'),
+            ('cancelled', 'blog_generator_requests_cancelled_total', 'Hedged or raced requests cancelled after another provider won'),
+            ('cache_hits', 'blog_generator_cache_hits_total', 'Articles served from the response cache'),
+            ('retries', 'blog_generator_retries_total', 'Retried provider attempts'),
+            ('cost_usd', 'blog_generator_cost_usd_total', 'Estimated spend at list prices'),
+        ]
+        lines = []
+        with self._lock:
+            providers = sorted(self._providers.items())
+            
+            for key, name, help_text in counters:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for provider, entry in providers:
+                    lines.append(f'{name}{{provider="{provider}"}} {entry[key]:g}')
+            
+            name = 'blog_generator_tokens_total'
+            lines += [f"# HELP {name} Tokens reported by the provider", f"# TYPE {name} counter"]
+            for provider, entry in providers:
+                lines.append(f'{name}{{provider="{provider}",direction="input"}} {entry["tokens_in"]}')
+                lines.append(f'{name}{{provider="{provider}",direction="output"}} {entry["tokens_out"]}')
+            
+            for key, name, help_text in (
+                ('latency', 'blog_generator_request_duration_seconds', 'Total request latency'),
+                ('ttfb', 'blog_generator_ttfb_seconds', 'Time to first response byte'),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for provider, entry in providers:
+                    histogram = entry[key]
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{name}_bucket{{provider="{provider}",le="{bound:g}"}} {count}')
+                    lines.append(f'{name}_bucket{{provider="{provider}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{provider="{provider}"}} {histogram.sum:.6f}')
+                    lines.append(f'{name}_count{{provider="{provider}"}} {histogram.count}')
+        
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,70 @@
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+
+class LatencyTracker:
+    """Rolling window of request latencies and outcomes per provider.
+    
+    Requests cancelled before they finished (hedge and race losers) are kept
+    as censored samples: their latency is only a lower bound. Percentiles use
+    the Kaplan-Meier estimate, so a slow tail that keeps getting cancelled
+    still counts instead of dragging the percentiles down.
+    """
+    
+    def __init__(self, window: int = 200):
+        self.window = window
+        # (latency, success, censored)
+        self._samples: Dict[str, Deque[Tuple[float, bool, bool]]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, provider: str, latency: float, success: bool = True, censored: bool = False):
+        """
+        Args:
+            provider: Provider name
+            latency: Seconds the request took (or ran before it was cancelled)
+            success: False for a failed request (excluded from the percentiles)
+            censored: The request was cancelled, so latency is a lower bound
+        """
+        with self._lock:
+            samples = self._samples.setdefault(provider, deque(maxlen=self.window))
+            samples.append((latency, success or censored, censored))
+    
+    def count(self, provider: str) -> int:
+        """Successful and censored requests currently in the window."""
+        with self._lock:
+            return sum(1 for _, success, _ in self._samples.get(provider, ()) if success)
+    
+    def percentile(self, provider: str, q: float) -> Optional[float]:
+        """q-th percentile (0-100) latency of successful requests, or None without data.
+        
+        When censored samples hide the answer (the tail was always cancelled),
+        the largest latency seen is returned as a lower bound.
+        """
+        with self._lock:
+            samples = sorted(
+                (latency, censored) for latency, success, censored in self._samples.get(provider, ()) if success
+            )
+        if not samples:
+            return None
+        
+        # Kaplan-Meier: each finished request lowers the survival curve, each
+        # censored one only leaves the set of requests still at risk
+        target = 1.0 - q / 100.0
+        survival = 1.0
+        at_risk = len(samples)
+        for latency, censored in samples:
+            if not censored:
+                survival *= (at_risk - 1) / at_risk
+                if survival <= target + 1e-9:
+                    return latency
+            at_risk -= 1
+        return samples[-1][0]
+    
+    def error_rate(self, provider: str) -> float:
+        """Fraction of failed requests in the window."""
+        with self._lock:
+            samples = self._samples.get(provider, ())
+            if not samples:
+                return 0.0
+            return sum(1 for _, success, _ in samples if not success) / len(samples)
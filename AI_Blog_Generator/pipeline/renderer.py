@@ -0,0 +1,227 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# markdown, pygments and jinja2 are imported on first use, so commands that
+# never render (--list, --search, --help) do not pay for them
+
+
+class ArticleRenderer:
+    """Markdown and HTML rendering with all setup done once.
+    
+    The page template is compiled once per renderer (and, with a bytecode
+    cache directory, once per machine), and each thread keeps one Markdown
+    instance with the extensions registered, reset between documents.
+    
+    With `processes` > 1, the CPU-bound Markdown/Pygments work can be
+    offloaded to a process pool whose workers hold their own renderer.
+    """
+    
+    MARKDOWN_EXTENSIONS = ['codehilite', 'fenced_code', 'tables', 'toc']
+    # Bump when a code change alters the rendered output, to invalidate --rebuild manifests
+    RENDERER_VERSION = 1
+    # Stored article fields the pages are built from without a default
+    REQUIRED_FIELDS = ('title', 'content', 'generated_at', 'provider')
+    
+    def __init__(self, templates_dir: str = "templates", template_name: str = 'blog_template.html',
+                 bytecode_cache_dir: Optional[str] = None, processes: Optional[int] = None):
+        self.templates_dir = Path(templates_dir)
+        self.template_name = template_name
+        self.processes = processes if processes is not None else int(os.getenv('RENDER_PROCESSES', 0))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        
+        cache_dir = bytecode_cache_dir if bytecode_cache_dir is not None else os.getenv('TEMPLATE_CACHE_DIR', '.cache/templates')
+        self.bytecode_cache_dir = cache_dir
+        
+        self._env = None
+        self._template = None
+        self._template_lock = threading.Lock()
+        self._local = threading.local()
+    
+    @property
+    def env(self):
+        """The Jinja environment, with the bytecode cache when one is configured (created on first use)."""
+        if self._env is None:
+            with self._template_lock:
+                if self._env is None:
+                    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+                    
+                    bytecode_cache = None
+                    if self.bytecode_cache_dir:
+                        try:
+                            Path(self.bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+                            bytecode_cache = FileSystemBytecodeCache(self.bytecode_cache_dir)
+                        except OSError as e:
+                            logging.warning(f"⚠️ Template bytecode cache disabled: {e}")
+                    self._env = Environment(loader=FileSystemLoader(self.templates_dir), bytecode_cache=bytecode_cache)
+        return self._env
+    
+    @property
+    def template(self):
+        """The compiled page template (loaded on first use)."""
+        if self._template is None:
+            env = self.env
+            with self._template_lock:
+                if self._template is None:
+                    self._template = env.get_template(self.template_name)
+        return self._template
+    
+    @property
+    def pool(self) -> Optional[ProcessPoolExecutor]:
+        """Process pool for rendering, started on first use; None when rendering in-process."""
+        if self.processes <= 1:
+            return None
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # spawn: forking a process that runs writer/HTTP threads is unsafe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_worker,
+                        initargs=(str(self.templates_dir), self.template_name, self.bytecode_cache_dir)
+                    )
+        return self._pool
+    
+    def close(self):
+        """Shut down the render process pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def submit_markdown(self, text: str) -> Future:
+        """Convert Markdown to HTML in the process pool (or inline without one)."""
+        pool = self.pool
+        if pool is not None:
+            return pool.submit(_worker_markdown, text)
+        
+        future = Future()
+        try:
+            future.set_result(self.markdown_to_html(text))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def render_article(self, article_data: Dict, slug: str, convert: bool = True) -> Tuple[Dict, str, str]:
+        """Re-render a stored article: (article with content_html, HTML page, Markdown page).
+        
+        Args:
+            article_data: Stored article
+            slug: URL slug for the page
+            convert: Re-run Markdown conversion; False reuses the stored content_html
+        """
+        if convert or 'content_html' not in article_data:
+            article_data = dict(article_data, content_html=self.markdown_to_html(article_data['content']))
+        return article_data, self.html_page(article_data, slug), self.markdown_page(article_data)
+    
+    def try_render_article(self, article_data: Dict, slug: str,
+                           convert: bool = True) -> Union[Tuple[Dict, str, str], Exception]:
+        """render_article, returning the exception instead of raising it."""
+        try:
+            return self.render_article(article_data, slug, convert)
+        except Exception as e:
+            return e
+    
+    def render_articles(self, items: Iterable[Tuple[Dict, str, bool]]) -> Iterator[Union[Tuple[Dict, str, str], Exception]]:
+        """
+        render_article over (article, slug, convert) items, in order, spread over the process pool.
+        
+        An article that fails to render yields its exception in place of the
+        result, so one bad article does not abort the rest.
+        """
+        items = list(items)
+        pool = self.pool
+        if pool is None:
+            return (self.try_render_article(*item) for item in items)
+        
+        chunksize = max(1, min(16, len(items) // (self.processes * 4)))
+        return pool.map(_worker_article, *zip(*items), chunksize=chunksize)
+    
+    @classmethod
+    def missing_fields(cls, article_data: Dict) -> List[str]:
+        """REQUIRED_FIELDS that a stored article lacks (or holds as a non-string)."""
+        return [field for field in cls.REQUIRED_FIELDS if not isinstance(article_data.get(field), str)]
+    
+    def markdown_fingerprint(self) -> str:
+        """Hash of everything besides the text that determines content_html."""
+        import markdown
+        import pygments
+        
+        parts = [str(self.RENDERER_VERSION), markdown.__version__, pygments.__version__] + self.MARKDOWN_EXTENSIONS
+        return hashlib.sha256("\0".join(parts).encode('utf-8')).hexdigest()
+    
+    def template_fingerprint(self) -> str:
+        """Hash of the template files (including any they extend or include) and renderer version."""
+        digest = hashlib.sha256(str(self.RENDERER_VERSION).encode('utf-8'))
+        for path in sorted(self.templates_dir.rglob('*')):
+            if path.is_file():
+                digest.update(str(path.relative_to(self.templates_dir)).encode('utf-8'))
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
+    
+    def markdown_to_html(self, text: str) -> str:
+        """Convert article Markdown to HTML with this thread's Markdown instance."""
+        md = getattr(self._local, 'markdown', None)
+        if md is None:
+            import markdown
+            md = self._local.markdown = markdown.Markdown(extensions=self.MARKDOWN_EXTENSIONS)
+        return md.reset().convert(text)
+    
+    def html_page(self, article_data: Dict, slug: str) -> str:
+        """Full HTML page for an article, rendered with the blog template."""
+        try:
+            published = datetime.fromisoformat(article_data['generated_at'])
+        except (KeyError, TypeError, ValueError):
+            published = datetime.now()
+        
+        return self.template.render(
+            title=article_data['title'],
+            content_html=article_data['content_html'],
+            summary=article_data.get('summary', ''),
+            tags=article_data.get('tags', []),
+            meta_description=article_data.get('meta_description', ''),
+            author=article_data.get('author', 'AI Blog Generator'),
+            provider=article_data.get('provider', 'AI'),
+            date=published.strftime("%B %d, %Y"),
+            current_year=published.year,
+            url=f"#{slug}"
+        )
+    
+    @staticmethod
+    def markdown_page(article_data: Dict) -> str:
+        """Markdown file contents for an article."""
+        parts = [
+            f"# {article_data['title']}\n\n",
+            f"**Generated:** {article_data['generated_at']}\n",
+            f"**Provider:** {article_data['provider'].title()}\n",
+            f"**Tags:** {', '.join(article_data.get('tags', []))}\n\n"
+        ]
+        if article_data.get('summary'):
+            parts.append(f"**Summary:** {article_data['summary']}\n\n")
+        parts.append("---\n\n")
+        parts.append(article_data['content'])
+        return "".join(parts)
+
+
+# Per-process renderer used by pool workers
+_worker_renderer: Optional[ArticleRenderer] = None
+
+
+def _init_worker(templates_dir: str, template_name: str, bytecode_cache_dir: str):
+    global _worker_renderer
+    _worker_renderer = ArticleRenderer(templates_dir, template_name, bytecode_cache_dir, processes=0)
+
+
+def _worker_markdown(text: str) -> str:
+    return _worker_renderer.markdown_to_html(text)
+
+
+def _worker_article(article_data: Dict, slug: str, convert: bool = True) -> Union[Tuple[Dict, str, str], Exception]:
+    return _worker_renderer.try_render_article(article_data, slug, convert)
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of generated articles.
+    
+    Entries are keyed by a hash of everything that determines the output
+    (provider, model, full prompt and generation parameters), expire after
+    a TTL and are evicted least-recently-used first once the cache grows
+    past its size budget.
+    """
+    
+    def __init__(self, cache_dir: str = ".cache/responses", ttl_seconds: Optional[float] = None,
+                 max_bytes: Optional[int] = None, enabled: bool = True, refresh: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('CACHE_TTL_HOURS', 168)) * 3600
+        self.max_bytes = max_bytes if max_bytes is not None else int(float(os.getenv('CACHE_MAX_MB', 200)) * 1024 * 1024)
+        self.enabled = enabled
+        # Refresh mode skips lookups but still stores fresh responses
+        self.refresh = refresh
+        
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def make_key(fingerprint: Dict) -> str:
+        """Hash a request fingerprint into a stable cache key."""
+        canonical = json.dumps(fingerprint, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached article for key, or None on a miss."""
+        if not self.enabled or self.refresh:
+            self._count('misses')
+            return None
+        
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._count('misses')
+            return None
+        
+        if time.time() - entry.get('cached_at', 0) > self.ttl_seconds:
+            self._remove(path)
+            self._count('misses')
+            return None
+        
+        # Bump the mtime so eviction treats this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        
+        self._count('hits')
+        return entry['article']
+    
+    def put(self, key: str, article: Dict):
+        """Store an article under key and evict old entries if over budget."""
+        if not self.enabled:
+            return
+        
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        data = json.dumps({'cached_at': time.time(), 'article': article}, ensure_ascii=False).encode('utf-8')
+        
+        try:
+            old_size = path.stat().st_size if path.exists() else 0
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning(f"⚠️ Could not write cache entry: {e}")
+            self._remove(tmp_path)
+            return
+        
+        with self._lock:
+            self.stats['writes'] += 1
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - old_size
+            over_budget = self._total_bytes > self.max_bytes
+        
+        if over_budget:
+            self.evict()
+    
+    def evict(self):
+        """Drop expired entries, then least-recently-used ones until under budget."""
+        with self._lock:
+            now = time.time()
+            entries = []
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            
+            for mtime, size, path in entries:
+                # mtime is refreshed on every hit, so it doubles as the last-use time
+                expired = now - mtime > self.ttl_seconds
+                if not expired and total <= self.max_bytes:
+                    continue
+                if self._remove(path):
+                    total -= size
+                    self.stats['evictions'] += 1
+            
+            self._total_bytes = total
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+    
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return total
+    
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+    
+    @staticmethod
+    def _remove(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except OSError:
+            return False
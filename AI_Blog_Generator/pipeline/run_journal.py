@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class RunJournal:
+    """Append-only JSONL record of a batch run, for resuming it later.
+    
+    The first line describes the run (mode, input file, provider, ...);
+    every following line is a state change of one item, keyed by a hash of
+    its title and description:
+        pending -> in_flight -> done (with the output file) | failed (with the error)
+    or skipped (duplicate of an existing article). Replaying the file gives
+    the latest state of every item.
+    """
+    
+    STATES = ('pending', 'in_flight', 'done', 'failed', 'skipped')
+    
+    def __init__(self, path: Path, meta: Dict, items: Optional[Dict[str, Dict]] = None):
+        self.path = Path(path)
+        self.run_id = self.path.stem
+        self.meta = meta
+        self.items: Dict[str, Dict] = items or {}
+        self._lock = threading.RLock()
+        self._file = open(self.path, 'a', encoding='utf-8')
+    
+    @classmethod
+    def create(cls, meta: Dict, runs_dir: Optional[str] = None) -> 'RunJournal':
+        """Start a new run and write its description."""
+        runs_dir = Path(runs_dir or os.getenv('RUNS_DIR', '.cache/runs'))
+        runs_dir.mkdir(parents=True, exist_ok=True)
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(3)}"
+        
+        meta = dict(meta, run_id=run_id, created_at=datetime.now().isoformat())
+        journal = cls(runs_dir / f"{run_id}.jsonl", meta)
+        journal._append({'event': 'run', **meta})
+        return journal
+    
+    @classmethod
+    def open(cls, run_id: str, runs_dir: Optional[str] = None) -> 'RunJournal':
+        """Load an existing run; raises FileNotFoundError for an unknown run id."""
+        path = Path(runs_dir or os.getenv('RUNS_DIR', '.cache/runs')) / f"{run_id}.jsonl"
+        meta, items = {}, {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash; everything before it is intact
+                    continue
+                if entry.get('event') == 'run':
+                    meta = {key: value for key, value in entry.items() if key != 'event'}
+                elif entry.get('key'):
+                    item = items.setdefault(entry['key'], {})
+                    item.update({key: value for key, value in entry.items() if key not in ('event', 'key')})
+        
+        journal = cls(path, meta, items)
+        journal._append({'event': 'resume', 'at': datetime.now().isoformat()})
+        return journal
+    
+    @staticmethod
+    def item_key(article: Dict) -> str:
+        text = f"{article.get('title', '')}\0{article.get('description', '')}"
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+    
+    def state(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self.items.get(key, {}).get('state')
+    
+    def record(self, key: str, state: str, **fields):
+        """Append a state change for one item."""
+        entry = {'key': key, 'state': state, 'at': time.time(), **fields}
+        with self._lock:
+            self.items.setdefault(key, {}).update({name: value for name, value in entry.items() if name != 'key'})
+            self._append(entry)
+    
+    def add(self, article: Dict, position: Optional[int] = None) -> str:
+        """Register an item as pending unless the journal already knows it; returns its key."""
+        key = self.item_key(article)
+        if self.state(key) is None:
+            fields = {'title': article.get('title', ''), 'description': article.get('description', '')}
+            if position is not None:
+                fields['position'] = position
+            self.record(key, 'pending', **fields)
+        return key
+    
+    def unfinished(self) -> List[Dict]:
+        """Items not done or skipped, as article requests in registration order."""
+        with self._lock:
+            return [
+                {'title': item.get('title', ''), 'description': item.get('description', '')}
+                for item in self.items.values() if item.get('state') not in ('done', 'skipped')
+            ]
+    
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {state: 0 for state in self.STATES}
+            for item in self.items.values():
+                counts[item.get('state', 'pending')] += 1
+            return counts
+    
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+    
+    def _append(self, entry: Dict):
+        with self._lock:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            # Flushed per line so a crash loses at most the state change in progress
+            self._file.flush()
@@ -0,0 +1,87 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from .provider_stats import LatencyTracker
+
+
+class ProviderScheduler:
+    """Spread articles across providers, weighted by latency, errors and quota.
+    
+    A provider's weight is its quota share (requests/min, when configured)
+    divided by its median latency and scaled down by its recent error rate,
+    so fast, healthy, high-quota providers take proportionally more work.
+    
+    Strategies:
+        round-robin:       smooth weighted round-robin over the weights
+        least-outstanding: provider with the fewest in-flight requests per unit weight
+    """
+    
+    STRATEGIES = ('round-robin', 'least-outstanding')
+    
+    def __init__(self, providers: List[str], latency: LatencyTracker, strategy: str = 'round-robin',
+                 quotas: Optional[Dict[str, Optional[float]]] = None):
+        if not providers:
+            raise ValueError("ProviderScheduler needs at least one provider")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown scheduling strategy '{strategy}'")
+        
+        self.providers = list(providers)
+        self.latency = latency
+        self.strategy = strategy
+        self.quotas = quotas or {}
+        self.outstanding = {name: 0 for name in self.providers}
+        self.assigned = {name: 0 for name in self.providers}
+        self._current = {name: 0.0 for name in self.providers}
+        self._lock = threading.Lock()
+    
+    def weights(self) -> Dict[str, float]:
+        """Current weight of every provider."""
+        known_quotas = [quota for quota in self.quotas.values() if quota]
+        default_quota = sum(known_quotas) / len(known_quotas) if known_quotas else 1.0
+        
+        medians = {name: self.latency.percentile(name, 50) for name in self.providers}
+        known_medians = [median for median in medians.values() if median]
+        # Providers without latency data yet are assumed average so they get tried
+        default_median = sum(known_medians) / len(known_medians) if known_medians else 1.0
+        
+        weights = {}
+        for name in self.providers:
+            quota = self.quotas.get(name) or default_quota
+            median = medians[name] or default_median
+            # Keep a small floor so a failing provider still gets probe traffic and can recover
+            health = max(0.05, (1.0 - self.latency.error_rate(name)) ** 2)
+            weights[name] = quota / median * health
+        return weights
+    
+    def acquire(self) -> str:
+        """Choose a provider for the next article and count it as in flight."""
+        with self._lock:
+            weights = self.weights()
+            
+            if self.strategy == 'least-outstanding':
+                provider = min(self.providers, key=lambda name: (self.outstanding[name] + 1) / weights[name])
+            else:
+                # Smooth weighted round-robin (as in nginx): no bursts to one provider
+                total = sum(weights.values())
+                for name in self.providers:
+                    self._current[name] += weights[name]
+                provider = max(self.providers, key=lambda name: self._current[name])
+                self._current[provider] -= total
+            
+            self.outstanding[provider] += 1
+            self.assigned[provider] += 1
+            return provider
+    
+    def release(self, provider: str):
+        with self._lock:
+            self.outstanding[provider] -= 1
+    
+    @contextmanager
+    def assign(self) -> Iterator[str]:
+        """Context manager form of acquire/release."""
+        provider = self.acquire()
+        try:
+            yield provider
+        finally:
+            self.release(provider)
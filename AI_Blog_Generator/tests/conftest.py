@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+class FakeClient:
+    """Provider client stand-in that answers instantly with a fixed article."""
+    
+    name = 'fake'
+    label = 'Fake'
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def request_fingerprint(self, title, description=""):
+        return {'provider': self.name, 'model': 'fake-1', 'prompt': f"{title}\n{description}"}
+    
+    def generate_article(self, title, description=""):
+        self.calls += 1
+        return {
+            'title': title,
+            'content': f"# {title}\n\nBody about {title}.",
+            'summary': 'Summary',
+            'tags': ['test'],
+            'meta_description': 'Meta',
+            'provider': self.name,
+            'usage': {'model': 'fake-1', 'prompt_tokens': 10, 'completion_tokens': 20}
+        }
+    
+    async def agenerate_article(self, title, description=""):
+        return self.generate_article(title, description)
+    
+    def close(self):
+        pass
+    
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """BlogGenerator working in a temporary directory with one fake provider."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "templates").symlink_to(ROOT / "templates")
+    for name in ('CATALOG_DB', 'CACHE_DIR', 'RUNS_DIR', 'METRICS_OUT', 'PROVIDER_PLUGINS'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv('WRITER_FSYNC', 'false')
+    
+    import blog_generator
+    monkeypatch.setattr(blog_generator.console, 'quiet', True)
+    gen = blog_generator.BlogGenerator(providers=[], use_cache=False, dedup='off')
+    gen.clients['fake'] = FakeClient()
+    yield gen
+    gen.close()
@@ -0,0 +1,126 @@
+import errno
+import threading
+from pathlib import Path
+
+import pytest
+
+from pipeline import article_writer
+from pipeline.article_writer import ArticleWriter
+
+
+def fail_html(monkeypatch):
+    """Make every .html write fail as if the disk were full."""
+    real_write = article_writer.atomic_write
+    
+    def atomic_write(path, text, fsync=True):
+        if str(path).endswith('.html'):
+            raise OSError(errno.ENOSPC, "No space left on device")
+        real_write(path, text, fsync)
+    
+    monkeypatch.setattr(article_writer, 'atomic_write', atomic_write)
+
+
+def test_submit_future_resolves_after_every_file(tmp_path):
+    writer = ArticleWriter(workers=2, fsync=False)
+    completed = []
+    files = {tmp_path / f"{name}.txt": (lambda name=name: name) for name in ('a', 'b', 'c')}
+    
+    future = writer.submit(files, on_complete=completed.append)
+    
+    assert sorted(future.result(timeout=5)) == sorted(files)
+    assert completed == [None]
+    assert all(path.read_text() == path.stem for path in files)
+    writer.close()
+
+
+def test_submit_future_raises_first_write_error(tmp_path, monkeypatch):
+    fail_html(monkeypatch)
+    writer = ArticleWriter(workers=2, fsync=False)
+    completed = []
+    
+    future = writer.submit({
+        tmp_path / "a.json": lambda: "{}",
+        tmp_path / "a.html": lambda: "<p></p>"
+    }, on_complete=completed.append)
+    
+    with pytest.raises(OSError):
+        future.result(timeout=5)
+    assert isinstance(completed[0], OSError)
+    assert writer.stats['failed'] == 1
+    writer.close()
+
+
+def test_submit_without_files_completes_immediately():
+    writer = ArticleWriter(workers=1, fsync=False)
+    assert writer.submit({}).result(timeout=1) == []
+    writer.close()
+
+
+def test_failed_write_fails_article_and_skips_catalogue(generator, monkeypatch):
+    fail_html(monkeypatch)
+    
+    results = generator.generate_batch_articles([{'title': 'Disk Full Article'}], 'fake')
+    
+    assert results == []
+    assert generator.catalog.query() == []
+    assert list(generator.output_dir.glob('*disk_full_article*')) == []
+
+
+def test_saved_article_is_catalogued(generator):
+    results = generator.generate_batch_articles([{'title': 'Saved Article'}], 'fake')
+    
+    assert [result['title'] for result in results] == ['Saved Article']
+    assert [row['title'] for row in generator.catalog.query()] == ['Saved Article']
+    assert {path.suffix for path in generator.output_dir.glob('*saved_article*')} == {'.json', '.md', '.html'}
+
+
+def test_async_batch_saves_off_the_event_loop(generator, monkeypatch):
+    save_threads = []
+    save_article = generator._save_article
+    
+    def recording_save(*args, **kwargs):
+        save_threads.append(threading.current_thread())
+        return save_article(*args, **kwargs)
+    
+    monkeypatch.setattr(generator, '_save_article', recording_save)
+    results = generator.run_async(generator.agenerate_batch_articles([{'title': 'Async Saved'}], 'fake'))
+    
+    assert [result['title'] for result in results] == ['Async Saved']
+    assert save_threads and threading.main_thread() not in save_threads
+    assert [row['title'] for row in generator.catalog.query()] == ['Async Saved']
+
+
+def test_same_title_saved_concurrently_gets_separate_files(generator):
+    articles = [{'title': 'Same Title', 'description': f"Take {i}"} for i in range(6)]
+    results = generator.generate_batch_articles(articles, 'fake', concurrency=6)
+    
+    assert len(results) == 6
+    json_files = sorted(generator.output_dir.glob('*same_title*.json'))
+    assert len(json_files) == 6
+    assert sorted(str(path) for path in json_files) == sorted(result['output_file'] for result in results)
+    assert len(list(generator.output_dir.glob('*same_title*.html'))) == 6
+    assert len(generator.catalog.query()) == 6
+    assert generator._saves == {}
+
+
+def test_failed_save_keeps_same_title_sibling(generator, monkeypatch):
+    real_write = article_writer.atomic_write
+    
+    def atomic_write(path, text, fsync=True):
+        # Fail only the second article's HTML
+        if str(path).endswith('_2.html'):
+            raise OSError(errno.ENOSPC, "No space left on device")
+        real_write(path, text, fsync)
+    
+    monkeypatch.setattr(article_writer, 'atomic_write', atomic_write)
+    client = generator.clients['fake']
+    first = generator._finalize_article(client.generate_article('Same Title'), 'fake')
+    second = generator._finalize_article(client.generate_article('Same Title'), 'fake')
+    
+    assert second['output_file'] == first['output_file'][:-len('.json')] + '_2.json'
+    assert generator._settle_save(first) is first
+    assert generator._settle_save(second) is None
+    first = Path(first['output_file'])
+    second = Path(second['output_file'])
+    assert {path.suffix for path in generator.output_dir.glob(f"{first.stem}.*")} == {'.json', '.md', '.html'}
+    assert list(generator.output_dir.glob(f"{second.stem}.*")) == []
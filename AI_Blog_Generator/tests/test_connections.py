@@ -0,0 +1,49 @@
+import threading
+import time
+
+
+class HungProbe:
+    """Client whose probe ignores its timeout."""
+    
+    def __init__(self):
+        self.release = threading.Event()
+    
+    def probe(self, timeout):
+        self.release.wait(60)
+        return {'ok': True}
+
+
+class QuickProbe:
+    def probe(self, timeout):
+        return {'ok': True, 'latency': 0.01}
+
+
+def test_hung_probe_times_out_on_a_daemon_thread(generator):
+    hung = HungProbe()
+    generator.clients = {'hung': hung, 'quick': QuickProbe()}
+    reported = {}
+    generator._report_probes = reported.update
+    
+    started = time.monotonic()
+    generator.test_connections(timeout=0.2)
+    assert time.monotonic() - started < 3
+    
+    assert reported['quick'] == {'ok': True, 'latency': 0.01}
+    assert reported['hung']['ok'] is False
+    assert 'timed out' in reported['hung']['error']
+    
+    probes = [thread for thread in threading.enumerate() if thread.name == 'probe-hung']
+    assert probes and all(thread.daemon for thread in probes)
+    hung.release.set()
+
+
+def test_probe_exception_is_reported(generator):
+    class Broken:
+        def probe(self, timeout):
+            raise RuntimeError("no route to host")
+    
+    generator.clients = {'broken': Broken()}
+    reported = {}
+    generator._report_probes = reported.update
+    generator.test_connections(timeout=1.0)
+    assert reported['broken'] == {'ok': False, 'error': 'no route to host'}
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from api_clients.content_parser import StreamingContentParser, parse_generated_content
+
+RESPONSE = (
+    "---SUMMARY---\nA short summary.\n\n"
+    "---META_DESCRIPTION---\nAn SEO description.\n\n"
+    "---TAGS---\npython, httpx, , performance\n\n"
+    "---CONTENT---\n# Title\n\nBody with a rule\n\n-----\n\nand --flags and a -- dash.\n"
+)
+
+EXPECTED = {
+    'summary': 'A short summary.',
+    'meta_description': 'An SEO description.',
+    'tags': ['python', 'httpx', 'performance'],
+    'content': "# Title\n\nBody with a rule\n\n-----\n\nand --flags and a -- dash.",
+}
+
+
+def stream(text, chunk_sizes):
+    parser = StreamingContentParser()
+    position = 0
+    for size in chunk_sizes:
+        parser.feed(text[position:position + size])
+        position += size
+    parser.feed(text[position:])
+    parser.close()
+    return parser
+
+
+def test_canonical_markers():
+    assert parse_generated_content(RESPONSE) == EXPECTED
+
+
+@pytest.mark.parametrize('variant', [
+    "## ---SUMMARY---",
+    "**---SUMMARY---**",
+    "--- summary ---",
+    "----Summary----",
+])
+def test_marker_variants(variant):
+    text = RESPONSE.replace("---SUMMARY---", variant)
+    assert parse_generated_content(text) == EXPECTED
+
+
+@pytest.mark.parametrize('spelling', ["---META DESCRIPTION---", "---META-DESCRIPTION---", "---metadescription---"])
+def test_meta_description_spellings(spelling):
+    text = RESPONSE.replace("---META_DESCRIPTION---", spelling)
+    assert parse_generated_content(text)['meta_description'] == 'An SEO description.'
+
+
+def test_without_markers_everything_is_content():
+    text = "# Just an article\n\nNo markers -- at all.\n"
+    assert parse_generated_content(text) == {'content': text}
+
+
+def test_missing_content_marker_falls_back_to_whole_text():
+    text = "---SUMMARY---\nOnly a summary.\n"
+    sections = parse_generated_content(text)
+    assert sections['summary'] == 'Only a summary.'
+    assert sections['content'] == text
+
+
+def test_later_repeated_marker_does_not_cut_a_section():
+    text = RESPONSE + "\nQuoting the format: ---SUMMARY--- goes first.\n"
+    assert parse_generated_content(text)['content'].endswith("---SUMMARY--- goes first.")
+
+
+def test_out_of_order_markers():
+    text = "---CONTENT---\nBody\n---TAGS---\na, b\n"
+    assert parse_generated_content(text) == {'content': 'Body', 'tags': ['a', 'b']}
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_streaming_matches_one_shot_for_any_chunking(seed):
+    rng = random.Random(seed)
+    chunks = [rng.randint(1, 12) for _ in range(len(RESPONSE) // 4)]
+    assert stream(RESPONSE, chunks).sections() == EXPECTED
+
+
+def test_streaming_waits_for_a_marker_that_may_still_grow():
+    parser = StreamingContentParser()
+    assert parser.feed("---SUMMARY--") is None
+    assert parser.feed("-") is None
+    assert parser.feed("\nText") == 'summary'
+    assert parser.current_section == 'summary'
+
+
+def test_streaming_accepts_marker_at_end_on_close():
+    parser = StreamingContentParser()
+    parser.feed("---SUMMARY---\nS\n---CONTENT---")
+    assert parser.close() == 'content'
+    assert parser.section_text('summary') == 'S'
@@ -0,0 +1,93 @@
+import pytest
+
+from pipeline.dedup import TitleDeduplicator
+
+
+@pytest.fixture
+def dedup():
+    return TitleDeduplicator(threshold=0.7)
+
+
+@pytest.mark.parametrize('first, second', [
+    ("Deep Learning with Python", "Learning Python"),
+    ("Introduction to Rust", "Rust Essentials"),
+    ("Python Decorators", "Python Generators"),
+    ("React Hooks Tutorial", "React Hooks"),
+])
+def test_distinct_topics_are_not_duplicates(dedup, first, second):
+    dedup.add(first, 'existing')
+    assert dedup.find(second) is None
+
+
+@pytest.mark.parametrize('first, second', [
+    ("A Complete Guide to Docker", "Docker: A Complete Guide"),
+    ("Introduction to Rust", "Rust"),
+    ("Docker Containers", "Docker Container"),
+    ("Getting Started with Kubernetes", "kubernetes"),
+])
+def test_reworded_titles_are_duplicates(dedup, first, second):
+    dedup.add(first, 'existing')
+    ref, similarity = dedup.find(second)
+    assert ref == 'existing'
+    assert similarity >= 0.7
+
+
+def test_normalize_keeps_meaningful_single_words(dedup):
+    assert dedup.normalize("Deep Learning with Python") == "deep learning python"
+    assert dedup.normalize("Rust Essentials") == "rust essentials"
+    assert dedup.normalize("A Deep Dive into Rust") == "rust"
+    assert dedup.normalize("The") == "the"
+
+
+def test_exact_normalized_match_still_respects_threshold():
+    strict = TitleDeduplicator(threshold=1.01)
+    strict.add("A Complete Guide to Docker", 'existing')
+    assert strict.find("Docker") is None
+
+
+def test_partition_drops_batch_duplicates(dedup):
+    unique, duplicates = dedup.partition([
+        {'title': 'Docker Containers'},
+        {'title': 'Deep Learning with Python'},
+        {'title': 'Docker Container'},
+        {'title': 'Learning Python'},
+    ])
+    
+    assert [article['title'] for article in unique] == ['Docker Containers', 'Deep Learning with Python', 'Learning Python']
+    assert [(article['title'], ref) for article, ref, _ in duplicates] == [('Docker Container', 'batch: Docker Containers')]
+
+
+def test_copy_is_independent(dedup):
+    dedup.add("Docker Containers", 'existing')
+    clone = dedup.copy()
+    clone.add("Kubernetes Operators", 'batch')
+    
+    assert clone.find("Kubernetes Operators") == ('batch', 1.0)
+    assert dedup.find("Kubernetes Operators") is None
+    assert clone.find("Docker Container")[0] == 'existing'
+
+
+def test_archive_is_signed_once_per_session(generator, monkeypatch):
+    generator.dedup_mode = 'skip'
+    signed = []
+    real_titles = generator.catalog.titles
+    monkeypatch.setattr(generator.catalog, 'titles', lambda: signed.append(1) or real_titles())
+    
+    generator.generate_batch_articles([{'title': 'Docker Containers'}], 'fake')
+    results = generator.generate_batch_articles([{'title': 'Docker Container'}, {'title': 'Rust Ownership'}], 'fake')
+    
+    assert len(signed) == 1
+    # The first batch's saved article is in the index for the next one
+    assert [article['title'] for article in results] == ['Rust Ownership']
+
+
+def test_failed_title_can_be_retried_in_a_later_batch(generator, monkeypatch):
+    from test_article_writer import fail_html
+    
+    generator.dedup_mode = 'skip'
+    with monkeypatch.context() as patch:
+        fail_html(patch)
+        assert generator.generate_batch_articles([{'title': 'Docker Containers'}], 'fake') == []
+    
+    results = generator.generate_batch_articles([{'title': 'Docker Containers'}], 'fake')
+    assert [article['title'] for article in results] == ['Docker Containers']
@@ -0,0 +1,57 @@
+import re
+import threading
+import time
+
+import pytest
+
+from api_clients.prompts import PromptTemplate
+from pipeline.long_form import LongFormWriter
+
+OUTLINE = "---CONTENT---\n## One\n- a\n## Two\n- b\n## Three\n- c\n## Four\n- d\n"
+
+
+class SectionClient:
+    """Client answering the outline request and one request per section."""
+    
+    PROMPT = PromptTemplate("# {title}\n\n## Intro\n- hook\n## Body\n- detail\n")
+    
+    def __init__(self, failing=None, delays=None):
+        self.failing = failing
+        self.delays = delays or {}
+        self.sections = []
+        self._lock = threading.Lock()
+    
+    def complete(self, prompt, max_tokens=None):
+        section = re.search(r"\*\*YOUR SECTION:\*\* (\w+)", prompt)
+        if section is None:
+            return OUTLINE, {'model': 'fake-1', 'prompt_tokens': 5}
+        section = section.group(1)
+        with self._lock:
+            self.sections.append(section)
+        time.sleep(self.delays.get(section, 0))
+        if section == self.failing:
+            raise RuntimeError("section failed")
+        return f"Body of {section}.", {'model': 'fake-1', 'prompt_tokens': 5}
+    
+    def build_article(self, title, content, sections=None):
+        return {'title': title, 'content': content}
+
+
+def test_failed_section_does_not_wait_for_earlier_sections():
+    # 'Two' fails while 'One' is still running; 'Four' would start when 'Three' frees its worker
+    client = SectionClient(failing='Two', delays={'One': 0.3, 'Three': 0.1})
+    
+    with pytest.raises(RuntimeError, match="section failed"):
+        LongFormWriter(concurrency=2).write(client, 'Rust Essentials')
+    time.sleep(0.4)
+    assert 'Four' not in client.sections
+
+
+def test_sections_are_stitched_in_outline_order():
+    client = SectionClient()
+    article = LongFormWriter(concurrency=2).write(client, 'Rust Essentials')
+    
+    bodies = [article['content'].index(f"Body of {name}.") for name in ('One', 'Two', 'Three', 'Four')]
+    assert bodies == sorted(bodies)
+    assert article['usage']['requests'] == 5
+    assert article['usage']['prompt_tokens'] == 25
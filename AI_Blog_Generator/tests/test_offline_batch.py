@@ -0,0 +1,72 @@
+import json
+
+from click.testing import CliRunner
+
+from conftest import FakeClient
+
+
+class FakeBatchClient(FakeClient):
+    """ChatGPT client stand-in whose batch stopped part of the way through."""
+    
+    name = 'chatgpt'
+    BATCH_PRICE_DISCOUNT = 0.5
+    
+    def __init__(self, status):
+        super().__init__()
+        self.status = status
+    
+    def batch_status(self, batch_id):
+        return dict(self.status, id=batch_id)
+    
+    def batch_results(self, status):
+        if not status.get('output_file_id'):
+            return {}
+        return {'article-0': {'content': "---CONTENT---\n# First\n\nBody.", 'usage': {'model': 'fake-1'}}}
+    
+    def build_article(self, title, content, sections=None):
+        article = self.generate_article(title)
+        article['content'] = content
+        return article
+
+
+def submit_state(tmp_path, monkeypatch, count):
+    monkeypatch.setenv('BATCH_DIR', str(tmp_path / 'batches'))
+    (tmp_path / 'batches').mkdir()
+    items = {f"article-{i}": {'title': f"Article {i}", 'description': ''} for i in range(count)}
+    (tmp_path / 'batches' / 'batch_1.json').write_text(json.dumps({'items': items}))
+
+
+def test_cancelled_batch_keeps_its_partial_results(generator, tmp_path, monkeypatch):
+    submit_state(tmp_path, monkeypatch, 2)
+    generator.clients['chatgpt'] = FakeBatchClient({
+        'status': 'cancelled', 'total': 2, 'completed': 1, 'failed': 0,
+        'output_file_id': 'file-partial', 'error_file_id': None
+    })
+    
+    results = generator.collect_offline_batch('batch_1')
+    
+    assert [article['title'] for article in results] == ['Article 0']
+    assert (tmp_path / 'generated_articles').exists()
+    assert not (tmp_path / 'batches' / 'batch_1.json').exists()
+
+
+def test_batch_without_output_file_saves_nothing(generator, tmp_path, monkeypatch):
+    submit_state(tmp_path, monkeypatch, 1)
+    generator.clients['chatgpt'] = FakeBatchClient({
+        'status': 'expired', 'total': 1, 'completed': 0, 'failed': 0,
+        'output_file_id': None, 'error_file_id': None
+    })
+    
+    assert generator.collect_offline_batch('batch_1') == []
+
+
+def test_batch_api_is_rejected_for_a_single_title(monkeypatch):
+    import blog_generator
+    
+    def unexpected(*args, **kwargs):
+        raise AssertionError("no generator should be built")
+    
+    monkeypatch.setattr(blog_generator, 'BlogGenerator', unexpected)
+    result = CliRunner().invoke(blog_generator.main, ['--title', 'Rust Essentials', '--batch-api'])
+    assert result.exit_code == 0
+    assert '--batch-api only applies' in result.output
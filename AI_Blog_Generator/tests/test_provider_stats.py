@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from pipeline.provider_stats import LatencyTracker
+
+
+def test_percentile_matches_plain_samples():
+    tracker = LatencyTracker()
+    for latency in range(1, 101):
+        tracker.record('p', float(latency))
+    
+    assert tracker.percentile('p', 50) == 50.0
+    assert tracker.percentile('p', 95) == 95.0
+    assert tracker.percentile('unknown', 95) is None
+
+
+def test_failures_are_excluded_from_percentiles():
+    tracker = LatencyTracker()
+    tracker.record('p', 1.0)
+    tracker.record('p', 100.0, success=False)
+    
+    assert tracker.percentile('p', 95) == 1.0
+    assert tracker.error_rate('p') == 0.5
+
+
+def test_censored_tail_keeps_percentile_high():
+    tracker = LatencyTracker()
+    for _ in range(90):
+        tracker.record('p', 1.0)
+    # Hedge losers cancelled at 5s: all that is known is that they took longer
+    for _ in range(10):
+        tracker.record('p', 5.0, censored=True)
+    
+    assert tracker.percentile('p', 50) == 1.0
+    assert tracker.percentile('p', 95) == 5.0
+    assert tracker.count('p') == 100
+    assert tracker.error_rate('p') == 0.0
+
+
+class SlowClient:
+    def __init__(self, name, seconds):
+        self.name = name
+        self.seconds = seconds
+    
+    def request_fingerprint(self, title, description=""):
+        return {'provider': self.name, 'model': 'm', 'prompt': 'x' * 400}
+    
+    async def agenerate_article(self, title, description=""):
+        await asyncio.sleep(self.seconds)
+        return {'title': title, 'content': 'body', 'summary': '', 'tags': [], 'meta_description': '',
+                'provider': self.name, 'usage': {'model': 'm', 'prompt_tokens': 100, 'completion_tokens': 10}}
+
+
+def test_hedge_loser_is_recorded_as_censored(generator):
+    generator.clients = {'slow': SlowClient('slow', 5.0), 'fast': SlowClient('fast', 0.01)}
+    
+    provider, _ = generator.run_async(generator._afetch_first('t', '', ['slow', 'fast'], 0.05))
+    
+    assert provider == 'fast'
+    assert generator.latency.count('slow') == 1
+    assert generator.latency.percentile('slow', 95) == pytest.approx(0.05, abs=0.05)
+    slow = {row['provider']: row for row in generator.metrics.summary()}['slow']
+    assert slow['cancelled'] == 1
+    assert slow['tokens_in'] == 100
+
+
+def test_hedge_delay_needs_at_least_one_sample(generator, monkeypatch):
+    monkeypatch.setenv('HEDGE_MIN_SAMPLES', '0')
+    monkeypatch.setenv('HEDGE_DELAY', '7')
+    
+    assert generator._hedge_delay('fake') == 7.0
+    generator.latency.record('fake', 2.0)
+    assert generator._hedge_delay('fake') == 2.0
@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+
+from api_clients.rate_limiter import AdaptiveConcurrency, ProviderRateLimiter
+
+
+def test_async_waiters_are_served_in_arrival_order():
+    limiter = AdaptiveConcurrency(initial=1, maximum=1)
+    order = []
+    
+    async def worker(index):
+        await limiter.aacquire()
+        order.append(index)
+        await asyncio.sleep(0.001)
+        limiter.release()
+    
+    async def main():
+        await asyncio.gather(*(worker(index) for index in range(20)))
+    
+    asyncio.run(main())
+    assert order == list(range(20))
+    assert limiter.in_flight == 0
+
+
+def test_release_wakes_waiter_without_polling_delay():
+    limiter = AdaptiveConcurrency(initial=1, maximum=1)
+    
+    async def main():
+        await limiter.aacquire()
+        waiter = asyncio.ensure_future(limiter.aacquire())
+        await asyncio.sleep(0)
+        started = time.monotonic()
+        limiter.release()
+        await waiter
+        return time.monotonic() - started
+    
+    assert asyncio.run(main()) < 0.01
+    assert limiter.in_flight == 1
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    limiter = AdaptiveConcurrency(initial=1, maximum=1)
+    
+    async def main():
+        await limiter.aacquire()
+        cancelled = asyncio.ensure_future(limiter.aacquire())
+        second = asyncio.ensure_future(limiter.aacquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        limiter.release()
+        await second
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        limiter.release()
+    
+    asyncio.run(main())
+    assert limiter.in_flight == 0
+
+
+def test_limit_increase_wakes_waiters():
+    limiter = AdaptiveConcurrency(initial=1, maximum=4)
+    
+    async def main():
+        await limiter.aacquire()
+        waiter = asyncio.ensure_future(limiter.aacquire())
+        await asyncio.sleep(0)
+        limiter.on_success()  # 1 -> 2
+        await asyncio.wait_for(waiter, 1)
+    
+    asyncio.run(main())
+    assert limiter.in_flight == 2
+
+
+class Throttled(Exception):
+    status_code = 429
+
+
+class FlakyStreamTransport:
+    def __init__(self, failures):
+        self.failures = failures
+    
+    def open_stream(self, request):
+        if self.failures:
+            self.failures -= 1
+            raise Throttled("rate limited")
+        return iter(["chunk-1", "chunk-2"])
+
+
+def test_seed_raises_the_starting_limit_up_to_the_maximum():
+    limiter = AdaptiveConcurrency(initial=8, maximum=24)
+    assert limiter.seed(16) == 16
+    assert limiter.seed(4) == 16
+    assert limiter.seed(32) == 24
+
+
+def test_seed_keeps_a_limit_lowered_by_throttling():
+    limiter = AdaptiveConcurrency(initial=8, maximum=64)
+    limiter.on_throttle()
+    assert limiter.seed(32) == 4
+
+
+def test_batch_concurrency_seeds_the_provider_limit(generator, monkeypatch):
+    import blog_generator
+    printed = []
+    monkeypatch.setattr(blog_generator.console, 'print', lambda text='', style=None, **kwargs: printed.append(str(text)))
+    client = generator.clients['fake']
+    client.rate_limiter = ProviderRateLimiter('fake', initial_concurrency=8, max_concurrency=24)
+    
+    generator.generate_batch_articles([{'title': 'Seeded'}], 'fake', concurrency=16)
+    assert int(client.rate_limiter.concurrency.limit) == 16
+    assert not [text for text in printed if 'requests in flight' in text]
+    
+    for _ in range(2):
+        generator.generate_batch_articles([{'title': 'Capped'}], 'fake', concurrency=32)
+    assert int(client.rate_limiter.concurrency.limit) == 24
+    capped = [text for text in printed if 'requests in flight' in text]
+    assert len(capped) == 1 and 'FAKE_MAX_CONCURRENCY' in capped[0]
+
+
+def test_stream_open_retries_report_throttling_and_release_slots():
+    from api_clients.base import BaseProvider
+    from api_clients.retry import RetryPolicy
+    
+    class StreamProvider(BaseProvider):
+        name = 'stream-test'
+    
+    provider = StreamProvider(FlakyStreamTransport(failures=2), 'model')
+    provider.rate_limiter = ProviderRateLimiter('stream-test', initial_concurrency=8)
+    provider.retry_policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+    
+    assert list(provider.stream_article('title')) == ["chunk-1", "chunk-2"]
+    assert provider.rate_limiter.stats['throttled'] == 2
+    assert provider.rate_limiter.stats['requests'] == 3
+    assert provider.rate_limiter.concurrency.limit < 8
+    assert provider.rate_limiter.concurrency.in_flight == 0
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+
+def write_article(generator, name, **fields):
+    article = {'title': name.replace('_', ' ').title(), 'content': f"# {name}\n\nBody.",
+               'generated_at': '2026-01-02T03:04:05', 'provider': 'fake'}
+    article.update(fields)
+    path = generator.output_dir / f"20260102_030405_{name}.json"
+    path.write_text(json.dumps(article))
+    return path
+
+
+@pytest.mark.parametrize('processes', [0, 2])
+def test_bad_articles_do_not_abort_rerender(generator, processes):
+    generator.renderer.processes = processes
+    valid = write_article(generator, 'valid_article')
+    write_article(generator, 'no_date', generated_at=None)
+    missing = write_article(generator, 'no_provider')
+    data = json.loads(missing.read_text())
+    del data['provider']
+    missing.write_text(json.dumps(data))
+    # Passes validation but fails inside the renderer
+    broken = write_article(generator, 'bad_tags', tags=5)
+    
+    assert generator.rerender_articles() == 1
+    
+    assert valid.with_suffix('.html').exists() and valid.with_suffix('.md').exists()
+    assert not broken.with_suffix('.html').exists()
+    assert not missing.with_suffix('.html').exists()
+
+
+def test_unrenderable_article_is_retried_by_rebuild(generator):
+    write_article(generator, 'valid_article')
+    broken = write_article(generator, 'bad_tags', tags=5)
+    assert generator.rerender_articles(incremental=True) == 1
+    
+    data = json.loads(broken.read_text())
+    data['tags'] = ['fixed']
+    broken.write_text(json.dumps(data))
+    assert generator.rerender_articles(incremental=True) == 1
+    assert broken.with_suffix('.html').exists()
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+from pipeline.response_cache import ResponseCache
+
+
+def make_cache(tmp_path, **kwargs):
+    kwargs.setdefault('ttl_seconds', 3600)
+    kwargs.setdefault('max_bytes', 10 ** 6)
+    return ResponseCache(str(tmp_path / 'responses'), **kwargs)
+
+
+def age(cache, key, seconds):
+    """Pretend an entry was last used `seconds` ago."""
+    path = cache._path(key)
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_hit_and_miss(tmp_path):
+    cache = make_cache(tmp_path)
+    key = ResponseCache.make_key({'provider': 'fake', 'prompt': 'Rust Essentials'})
+    assert cache.get(key) is None
+    cache.put(key, {'title': 'Rust Essentials'})
+    assert cache.get(key) == {'title': 'Rust Essentials'}
+    assert cache.stats == {'hits': 1, 'misses': 1, 'writes': 1, 'evictions': 0}
+
+
+def test_make_key_ignores_dict_order():
+    assert ResponseCache.make_key({'a': 1, 'b': 2}) == ResponseCache.make_key({'b': 2, 'a': 1})
+    assert ResponseCache.make_key({'a': 1}) != ResponseCache.make_key({'a': 2})
+
+
+def test_expired_entry_is_a_miss_and_removed(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.put('old', {'title': 'Old'})
+    
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert cache.get('old') is None
+    assert not cache._path('old').exists()
+
+
+def test_refresh_skips_lookups_but_stores(tmp_path):
+    cache = make_cache(tmp_path, refresh=True)
+    cache.put('key', {'title': 'Fresh'})
+    assert cache.get('key') is None
+    assert make_cache(tmp_path).get('key') == {'title': 'Fresh'}
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = make_cache(tmp_path, enabled=False)
+    cache.put('key', {'title': 'Nothing'})
+    assert cache.get('key') is None
+    assert not (tmp_path / 'responses').exists()
+
+
+def test_eviction_drops_least_recently_used_first(tmp_path):
+    article = {'content': 'x' * 1000}
+    cache = make_cache(tmp_path)
+    for key in ('first', 'second', 'third'):
+        cache.put(key, article)
+    entry_size = cache._path('first').stat().st_size
+    
+    age(cache, 'first', 300)
+    age(cache, 'second', 200)
+    age(cache, 'third', 100)
+    # A hit makes 'first' the most recently used entry
+    assert cache.get('first') == article
+    
+    # Room for three entries (sizes vary by a few bytes with the timestamp)
+    cache.max_bytes = entry_size * 3 + 100
+    cache.put('fourth', article)
+    
+    assert cache.stats['evictions'] == 1
+    assert not cache._path('second').exists()
+    for key in ('first', 'third', 'fourth'):
+        assert cache._path(key).exists()
+
+
+def test_eviction_drops_expired_entries_under_budget(tmp_path):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.put('stale', {'title': 'Stale'})
+    cache.put('live', {'title': 'Live'})
+    age(cache, 'stale', 120)
+    
+    cache.evict()
+    assert not cache._path('stale').exists()
+    assert cache.get('live') == {'title': 'Live'}
+
+
+def test_async_fetch_uses_the_cache_off_the_event_loop(generator, monkeypatch):
+    threads = {}
+    cache = generator.cache
+    real_get, real_put = cache.get, cache.put
+    
+    def get(key):
+        threads['get'] = threading.current_thread()
+        return real_get(key)
+    
+    def put(key, article):
+        threads['put'] = threading.current_thread()
+        assert 'metrics' not in article
+        return real_put(key, article)
+    
+    monkeypatch.setattr(cache, 'get', get)
+    monkeypatch.setattr(cache, 'put', put)
+    results = generator.run_async(generator.agenerate_batch_articles([{'title': 'Cached Async'}], 'fake'))
+    
+    assert [result['title'] for result in results] == ['Cached Async']
+    assert set(threads) == {'get', 'put'}
+    assert threading.main_thread() not in threads.values()
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from api_clients import retry
+from api_clients.errors import ProviderError, RateLimitError
+from api_clients.retry import RetryPolicy
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        if retry_after is not None:
+            self.retry_after = retry_after
+
+
+class APITimeoutError(Exception):
+    """Matched by class name, like the openai SDK's exception."""
+
+
+def flaky(errors, result='ok'):
+    """Callable raising each of errors in turn, then returning result."""
+    remaining = list(errors)
+    calls = []
+    
+    def fn():
+        calls.append(1)
+        if remaining:
+            raise remaining.pop(0)
+        return result
+    
+    fn.calls = calls
+    return fn
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(retry.time, 'sleep', slept.append)
+    return slept
+
+
+def test_retryable_errors():
+    policy = RetryPolicy()
+    assert policy.is_retryable(HTTPError(429))
+    assert policy.is_retryable(HTTPError(503))
+    assert policy.is_retryable(TimeoutError())
+    assert policy.is_retryable(ConnectionResetError())
+    assert policy.is_retryable(APITimeoutError())
+    assert not policy.is_retryable(HTTPError(400))
+    assert not policy.is_retryable(HTTPError(401))
+    assert not policy.is_retryable(ValueError("bad prompt"))
+
+
+def test_backoff_is_capped_and_honours_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0, max_elapsed=60.0)
+    for attempt in range(1, 10):
+        assert 0 <= policy.backoff(attempt, HTTPError(503)) <= min(4.0, 2 ** (attempt - 1))
+    assert policy.backoff(1, HTTPError(429, retry_after=12)) >= 12
+    # A Retry-After beyond the elapsed budget is clamped to it
+    assert policy.backoff(1, HTTPError(429, retry_after=600)) <= 60.0
+
+
+def test_call_retries_until_success(sleeps):
+    fn = flaky([HTTPError(503), APITimeoutError()])
+    stats = {}
+    assert RetryPolicy(max_attempts=3, base_delay=0.5).call('fake', fn, stats) == 'ok'
+    assert len(fn.calls) == 3
+    assert stats == {'retries': 2}
+    assert len(sleeps) == 2
+
+
+def test_call_gives_up_after_max_attempts(sleeps):
+    fn = flaky([HTTPError(429)] * 5)
+    with pytest.raises(RateLimitError, match="after 3 attempts") as error:
+        RetryPolicy(max_attempts=3, base_delay=0).call('fake', fn)
+    assert error.value.status_code == 429
+    assert len(fn.calls) == 3
+
+
+def test_call_does_not_retry_client_errors(sleeps):
+    fn = flaky([HTTPError(400)])
+    with pytest.raises(ProviderError) as error:
+        RetryPolicy(max_attempts=5).call('fake', fn)
+    assert not isinstance(error.value, RateLimitError)
+    assert error.value.status_code == 400
+    assert len(fn.calls) == 1
+    assert sleeps == []
+
+
+def test_call_stops_when_the_next_wait_exceeds_max_elapsed(sleeps):
+    fn = flaky([HTTPError(429, retry_after=30)] * 2)
+    with pytest.raises(RateLimitError):
+        RetryPolicy(max_attempts=5, max_elapsed=10).call('fake', fn)
+    assert len(fn.calls) == 1
+
+
+def test_acall_retries(monkeypatch):
+    async def no_sleep(delay):
+        pass
+    
+    monkeypatch.setattr(retry.asyncio, 'sleep', no_sleep)
+    attempts = []
+    
+    async def fn():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise HTTPError(502)
+        return 'ok'
+    
+    stats = {}
+    assert asyncio.run(RetryPolicy(max_attempts=3, base_delay=0).acall('fake', fn, stats)) == 'ok'
+    assert stats == {'retries': 1}
@@ -0,0 +1,69 @@
+from pipeline.run_journal import RunJournal
+
+from test_article_writer import fail_html
+
+
+def journal_states(generator):
+    journal = RunJournal.open(generator.journal.run_id)
+    journal.close()
+    return {item['title']: item['state'] for item in journal.items.values()}
+
+
+def test_done_is_recorded_once_files_are_written(generator):
+    generator.start_run({'mode': 'sample', 'provider': 'fake'})
+    generator.generate_batch_articles([{'title': 'First'}, {'title': 'Second'}], 'fake')
+    
+    assert journal_states(generator) == {'First': 'done', 'Second': 'done'}
+
+
+def test_failed_write_is_journaled_as_failed(generator, monkeypatch):
+    generator.start_run({'mode': 'sample', 'provider': 'fake'})
+    fail_html(monkeypatch)
+    generator.generate_batch_articles([{'title': 'Unwritten'}], 'fake')
+    
+    assert journal_states(generator) == {'Unwritten': 'failed'}
+
+
+def test_resume_retries_failed_writes_and_skips_done(generator, monkeypatch):
+    run = generator.start_run({'mode': 'sample', 'provider': 'fake'})
+    generator.generate_batch_articles([{'title': 'Kept'}], 'fake')
+    with monkeypatch.context() as patch:
+        fail_html(patch)
+        generator.generate_batch_articles([{'title': 'Retried'}], 'fake')
+    run.close()
+    
+    client = generator.clients['fake']
+    calls_before = client.calls
+    assert generator.resume_run(run.run_id, 'fake') == 1
+    assert client.calls == calls_before + 1
+    assert journal_states(generator) == {'Kept': 'done', 'Retried': 'done'}
+
+
+
+def resume_errors(generator, monkeypatch, run_id):
+    """resume_run's return value and the red messages it printed."""
+    import blog_generator
+    printed = []
+    monkeypatch.setattr(blog_generator.console, 'print', lambda text, style=None, **kwargs: printed.append(text))
+    return generator.resume_run(run_id, 'fake'), [text for text in printed if text.startswith('❌')]
+
+
+def test_resume_reports_a_missing_input_file(generator, tmp_path, monkeypatch):
+    input_file = tmp_path / 'moved.jsonl'
+    run = generator.start_run({'mode': 'input', 'input': str(input_file), 'offset': 0, 'provider': 'fake'})
+    run.close()
+    
+    count, errors = resume_errors(generator, monkeypatch, run.run_id)
+    assert count == 0
+    assert len(errors) == 1 and str(input_file) in errors[0]
+
+
+def test_resume_reports_a_malformed_input_file(generator, tmp_path, monkeypatch):
+    input_file = tmp_path / 'backlog.json'
+    input_file.write_text('{"articles": ')
+    run = generator.start_run({'mode': 'input', 'input': str(input_file), 'offset': 0, 'provider': 'fake'})
+    run.close()
+    
+    count, errors = resume_errors(generator, monkeypatch, run.run_id)
+    assert count == 0
+    assert len(errors) == 1 and str(input_file) in errors[0]